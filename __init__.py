@@ -16,6 +16,7 @@ from bpy.types import Menu, Operator, Panel, AddonPreferences, PropertyGroup
 
 from . import op_align
 from . import op_bake
+from . import op_bake_parallel
 from . import op_bake_explode
 from . import op_bake_organize_names
 from . import op_color_assign
@@ -73,6 +74,7 @@ from . import op_uv_fill
 from . import op_uv_resize
 from . import op_uv_size_get
 from . import op_uv_unwrap
+from . import op_uv_weld
 from . import settings
 from . import utilities_bake
 from . import utilities_color
@@ -175,6 +177,20 @@ class Panel_Preferences(AddonPreferences):
         name="Ignore other channels when baking Transmission",
         default=False
     )
+    bake_cache_dir: StringProperty(
+        name="Bake Cache Folder",
+        description="Folder keeping a copy of every baked image, keyed by the fingerprint of its bake inputs. "
+                    "Bakes of the same meshes, materials and settings are loaded from it instead of rendered, "
+                    "in any file. Leave empty to disable the cache",
+        subtype='DIR_PATH',
+        default=""
+    )
+    bake_cache_size: IntProperty(
+        name="Bake Cache Size (MB)",
+        description="Size of the bake cache folder above which the least recently used images are removed",
+        default=4096,
+        min=64
+    )
     bool_color_id_vertex_color_gamma: BoolProperty(
         name="Apply gamma to ID Colors in Vextex Color mode for visual consistency",
         default=False
@@ -250,6 +266,13 @@ class Panel_Preferences(AddonPreferences):
         if self.bool_bake_back_color == 'CUSTOM':
             col.prop(self, "bake_back_color_def", text="")
 
+        box.separator()
+        col = box.column(align=True)
+        col.prop(self, "bake_cache_dir", icon='FILE_CACHE')
+        row = col.row(align=True)
+        row.active = bool(self.bake_cache_dir)
+        row.prop(self, "bake_cache_size")
+
         box.separator()
         col = box.column(align=True)
         col.prop(self, "bool_modifier_auto_high", icon='MESH_MONKEY')
@@ -591,6 +614,45 @@ class TexToolsSettings(PropertyGroup):
                                'Force a texture bake for each selected Mesh Object by disabling automatic pairing by name')],
                              name="Force", default='None'
                              )
+    bake_isolate: BoolProperty(
+        name="Isolate",
+        description="Exclude the objects that are not part of the set being baked from rendering, so Cycles only syncs "
+                    "and builds its BVH for the set. Not used for modes where other objects shade the set (AO, Shadow, Combined)",
+        default=True
+    )
+    bake_skip_unchanged: BoolProperty(
+        name="Skip Unchanged",
+        description="Don't bake again the sets whose meshes, transforms, materials and bake settings did not change "
+                    "since their last bake in the same mode, as long as their baked image is still in the file",
+        default=False
+    )
+    bake_autosave: BoolProperty(
+        name="Save",
+        description="Save the baked images to files in the background once baking is finished",
+        default=False
+    )
+    bake_save_path: StringProperty(
+        name="Save Path",
+        description="Path of the saved images, where {set} is the set name, {mode} the bake mode and {image} "
+                    "the image name. .exr saves 32 bit float OpenEXR, any other extension PNG",
+        subtype='FILE_PATH',
+        default="//textures/{set}_{mode}.png"
+    )
+    bake_downsample_filter: EnumProperty(items=
+                                         [('LANCZOS', 'Lanczos', 'Sharp downsampling of supersampled bakes'),
+                                          ('BOX', 'Box', 'Average the supersamples of every pixel')],
+                                         name="Filter", description="Filter downsampling anti aliased bakes",
+                                         default='LANCZOS'
+                                         )
+    bake_tile_size: IntProperty(
+        name="Tile Size",
+        description="Bakes rendering more pixels on a side than this, anti aliasing included, are baked in tiles "
+                    "downsampled one at a time, so memory stays bounded by the tile size. 0 never tiles",
+        default=8192,
+        min=0,
+        soft_min=1024,
+        soft_max=16384
+    )
     bake_sampling: EnumProperty(items=
                                 [('1', 'None', 'No Anti Aliasing (Fast)'),
                                  ('2', '2x', 'Render 2x and downsample'),
@@ -993,6 +1055,7 @@ class UI_PT_Panel_Layout(Panel):
         col.separator()
         if settings.bversion >= 3.2:
             col.operator(op_stitch.op.bl_idname, text="Stitch", icon_value=icon_get("op_meshtex_trim_collapse"))
+        col.operator(op_uv_weld.op.bl_idname, text="Weld", icon='AUTOMERGE_ON')
         col.operator(op_unwrap_edge_peel.op.bl_idname, text="Edge Peel", icon_value=icon_get("op_unwrap_edge_peel"))
         row = col.row(align=True)
         row.scale_y = 1.5
@@ -1076,12 +1139,15 @@ class UI_PT_Panel_Bake(Panel):
         row = col.row(align=True)
         row.scale_y = 1.75
         row.operator(op_bake.op.bl_idname, text=f'Bake {count}x', icon_value=icon_get('op_bake'))
+        row.operator(op_bake_parallel.op.bl_idname, text="", icon='SORTTIME')
 
         bake_mode = utilities_ui.get_bake_mode()
 
         # Warning on material or Principled BSDF node need
         if settings.bake_error != "":
             col.label(text=settings.bake_error, icon='ERROR')
+        if settings.bake_save_status:
+            col.label(text=settings.bake_save_status, icon='FILE_TICK')
 
         col.separator()
         col_tr = col.column(align=True)
@@ -1098,6 +1164,8 @@ class UI_PT_Panel_Bake(Panel):
 
         # anti aliasing
         col.prop(tt_settings(), "bake_sampling", text="", icon_value=icon_get("bake_anti_alias"))
+        if tt_settings().bake_sampling != '1':
+            col.prop(tt_settings(), "bake_downsample_filter", text="")
 
         # Color Space selector
         col.prop(tt_settings(), "bake_color_space", text="", icon_value=icon_get("bake_color_space"))
@@ -1302,6 +1370,14 @@ class UI_PT_Panel_Bake(Panel):
             # Force single or multi texture baking
             col = box2.column(align=True)
             col.prop(tt_settings(), "bake_force", text="Force")
+            col.prop(tt_settings(), "bake_isolate")
+            col.prop(tt_settings(), "bake_skip_unchanged")
+            col.prop(tt_settings(), "bake_tile_size")
+            save_row = col.row(align=True)
+            save_row.prop(tt_settings(), "bake_autosave")
+            sub = save_row.row(align=True)
+            sub.active = tt_settings().bake_autosave
+            sub.prop(tt_settings(), "bake_save_path", text="")
             if tt_settings().bake_force == "Single" and len(settings.sets) > 0:
                 row.label(text=f"'{settings.sets[0].name}'")
 
@@ -1633,6 +1709,7 @@ def menu_VIEW3D_MT_object_context_menu(self, context):
 classes = (
     op_align.op,
     op_bake.op,
+    op_bake_parallel.op,
     op_bake_explode.op,
     op_bake_organize_names.op,
     op_texture_preview.op,
@@ -1690,6 +1767,7 @@ classes = (
     op_uv_resize.op,
     op_uv_size_get.op,
     op_uv_unwrap.op,
+    op_uv_weld.op,
     utilities_ui.op_popup,
     UV_OT_op_debug,
     UV_OT_op_select_bake_set,
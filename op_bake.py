@@ -1,4 +1,5 @@
 import bpy
+import numpy as np
 import os
 import time
 
@@ -8,6 +9,14 @@ from . import settings
 from . import utilities_bake as ub
 
 from .settings import tt_settings, prefs
+from .services import bake_cache_service
+from .services import bake_fingerprint_service
+from .services import bake_postprocess_service
+from .services import bake_tile_service
+from .services import bake_writer_service
+
+# Temporary UV map tiled bakes render through
+TILE_UV_LAYER = "TexTools_bake_tile"
 
 # Notes: https://docs.blender.org/manual/en/dev/render/blender_render/bake.html
 modes = {
@@ -72,6 +81,11 @@ class op(bpy.types.Operator):
     bl_label = "Bake"
     bl_description = "Bake selected objects"
 
+    bake_modes: bpy.props.StringProperty(
+        name="Modes", default="", options={'SKIP_SAVE'},
+        description="Comma separated bake modes, baked one after the other with a single scene and material setup. "
+                    "The selected bake mode when empty")
+
     @classmethod
     def poll(cls, context):
 
@@ -84,101 +98,28 @@ class op(bpy.types.Operator):
             settings.bake_error = ""
             return False
 
-        if bake_mode in {'ao', 'normal_tangent', 'normal_object', 'curvature', 'environment', 'uv', 'shadow'}:
-            settings.bake_error = ""
-            return True
-        bake_settings = bpy.context.scene.render.bake
-        if bake_mode == 'combined':
-            if not any((bake_settings.use_pass_direct, bake_settings.use_pass_indirect, bake_settings.use_pass_emit)):
-                settings.bake_error = "Lighting or Emit pass needed"
-                return False
-            settings.bake_error = ""
-            return True
-
-        if modes[bake_mode].setVColor or not modes[bake_mode].material:
-            def is_bakeable(obj):
-                if len(obj.data.materials) <= 0:  # There are no material slots
-                    settings.bake_error = "Materials needed"
-                    return False
-                elif not any(obj.data.materials):  # All material slots are empty
-                    settings.bake_error = "Materials needed"
-                    return False
-                else:
-                    for slot in obj.material_slots:
-                        if slot.material is not None:
-                            if not slot.material.use_nodes:
-                                settings.bake_error = "Nodal materials needed"
-                                return False
-                            bsdf_node = None
-                            for n in slot.material.node_tree.nodes:
-                                if n.bl_idname == "ShaderNodeBsdfPrincipled":
-                                    bsdf_node = n
-                                elif n.bl_idname == "ShaderNodeGroup":
-                                    for ng in n.node_tree.nodes:
-                                        if ng.bl_idname == "ShaderNodeBsdfPrincipled":
-                                            bsdf_node = ng
-                            if not bsdf_node:
-                                bool_alpha_ignore = prefs().bool_alpha_ignore
-                                bool_clean_transmission = prefs().bool_clean_transmission
-                                builtin_modes_material = {'diffuse', 'emission', 'roughness', 'glossiness',
-                                                          'transmission'}
-                                if modes[bake_mode].relink['needed'] or (
-                                        bool_clean_transmission and bake_mode == 'transmission') or \
-                                        (bool_alpha_ignore and bake_mode not in builtin_modes_material):
-                                    settings.bake_error = "BSDF nodes needed"
-                                    return False
-                    # else:
-                    # 	settings.bake_error = "Materials needed"
-                    # 	return False
-                settings.bake_error = ""
-                return True
-
-            def is_vc_ready(obj):
-                if len(obj.data.vertex_colors) > 7:
-                    settings.bake_error = "An empty VC layer needed"
-                    return False
-                settings.bake_error = ""
-                return True
-
-            for bset in settings.sets:
-                if (len(bset.objects_high) + len(bset.objects_float)) == 0:
-                    if not modes[bake_mode].material:
-                        for obj in bset.objects_low:
-                            if not is_bakeable(obj):
-                                return False
-                    if modes[bake_mode].setVColor:
-                        for obj in bset.objects_low:
-                            if not is_vc_ready(obj):
-                                return False
-                else:
-                    if not modes[bake_mode].material:
-                        for obj in (bset.objects_high + bset.objects_float):
-                            if not is_bakeable(obj):
-                                return False
-                    if modes[bake_mode].setVColor:
-                        for obj in (bset.objects_high + bset.objects_float):
-                            if not is_vc_ready(obj):
-                                return False
-
-        settings.bake_error = ""
-        return True
+        return is_mode_ready(bake_mode)
 
     def execute(self, context):
         startTime = time.perf_counter()
         circular_report = [False, ]
         color_report = [False, ]
-
-        if prefs().bool_clean_transmission:
-            modes['transmission'] = ub.BakeMode(type='ROUGHNESS', relink={'needed': True, 'b': 7, 'n': 15})
-        else:
-            modes['transmission'] = ub.BakeMode(type='TRANSMISSION')
-
-        bake_mode = utilities_ui.get_bake_mode()
-
-        if bake_mode not in modes:
-            self.report({'ERROR_INVALID_INPUT'},
-                        "Unknown mode '{}' only available: '{}'".format(bake_mode, ", ".join(modes.keys())))
-            return {'CANCELLED'}
+        skipped_report = [0, ]
+        cache_report = [0, 0]
+
+        update_transmission_mode()
+        bake_modes = [mode.strip() for mode in self.bake_modes.split(',') if mode.strip()]
+        if not bake_modes:
+            bake_modes = [utilities_ui.get_bake_mode()]
+
+        for bake_mode in bake_modes:
+            if bake_mode not in modes:
+                self.report({'ERROR_INVALID_INPUT'},
+                            "Unknown mode '{}' only available: '{}'".format(bake_mode, ", ".join(modes.keys())))
+                return {'CANCELLED'}
+            if not is_mode_ready(bake_mode):
+                self.report({'ERROR_INVALID_INPUT'}, f"Mode '{bake_mode}': {settings.bake_error}")
+                return {'CANCELLED'}
 
         # Store Selection
         active_object = bpy.context.view_layer.objects.active
@@ -186,26 +127,12 @@ class op(bpy.types.Operator):
         pre_selection_mode = None
         if active_object:
             pre_selection_mode = bpy.context.active_object.mode
-        ub.store_bake_settings()
-
-        if prefs().bake_device != 'DEFAULT':
-            bpy.context.scene.cycles.device = prefs().bake_device
-        bpy.context.scene.render.engine = modes[bake_mode].engine  # Switch render engine
-
-        # Avoid weird rendering problems when Progressive Refine is activated from Blender 2.90
-        if settings.bversion < 3:
-            bpy.context.scene.cycles.use_progressive_refine = False
-        # Make it sure that an Image, and not a Vertex Colors layer, is the target of the bake
-        if settings.bversion >= 2.92:
-            bpy.context.scene.render.bake.target = 'IMAGE_TEXTURES'
-        # Disable denoising until it is properly implemented for baking
-        if settings.bversion >= 3:
-            bpy.context.scene.cycles.use_denoising = False
+        setup_bake_scene()
 
         # Render sets
         bake(
             self=self,
-            mode=bake_mode,
+            bake_modes=bake_modes,
             size=tt_settings().size,
             bake_force=tt_settings().bake_force,
             sampling_scale=int(tt_settings().bake_sampling),
@@ -213,31 +140,153 @@ class op(bpy.types.Operator):
             color_report=color_report,
             selected=selected_objects,
             active=active_object,
-            pre_selection_mode=pre_selection_mode
+            pre_selection_mode=pre_selection_mode,
+            skipped_report=skipped_report,
+            cache_report=cache_report
         )
 
         elapsed = round(time.perf_counter() - startTime, 2)
+        finished = f"Baking finished in {elapsed}s"
+        if skipped_report[0]:
+            finished += f", {skipped_report[0]} unchanged set bakes skipped"
+        if prefs().bake_cache_dir:
+            finished += f", bake cache: {cache_report[0]} hits, {cache_report[1]} misses"
         if circular_report[0]:
             if color_report[0]:
                 self.report({'WARNING'},
                             f"Possible Circular Dependency: a previously baked image may have affected the new bake; "
-                            f"{color_report[0]} Baking finished in {elapsed}s")
+                            f"{color_report[0]} {finished}")
             else:
                 self.report({'WARNING'},
                             f"Possible Circular Dependency: a previously baked image may have affected the new bake. "
-                            f"Baking finished in {elapsed}s")
+                            f"{finished}")
         else:
             if color_report[0]:
-                self.report({'WARNING'}, f"{color_report[0]}. Baking finished in {elapsed}s.")
+                self.report({'WARNING'}, f"{color_report[0]}. {finished}.")
             else:
-                self.report({'INFO'}, f"Baking finished in {elapsed}s.")
+                # Skipped sets kept their previous image, make that visible
+                self.report({'WARNING'} if skipped_report[0] else {'INFO'}, f"{finished}.")
 
         return {'FINISHED'}
 
 
-def bake(self, mode, size, bake_force, sampling_scale, circular_report, color_report, selected, active,
-         pre_selection_mode):
-    print(f"Bake '{mode}'")
+def update_transmission_mode():
+    """Transmission is baked from the Principled BSDF channel when the preferences ask for clean transmission"""
+    if prefs().bool_clean_transmission:
+        modes['transmission'] = ub.BakeMode(type='ROUGHNESS', relink={'needed': True, 'b': 7, 'n': 15})
+    else:
+        modes['transmission'] = ub.BakeMode(type='TRANSMISSION')
+
+
+def setup_bake_scene():
+    """Stores the bake settings, restored by bake once finished, and sets the scene up for baking"""
+    ub.store_bake_settings()
+
+    if prefs().bake_device != 'DEFAULT':
+        bpy.context.scene.cycles.device = prefs().bake_device
+
+    # Avoid weird rendering problems when Progressive Refine is activated from Blender 2.90
+    if settings.bversion < 3:
+        bpy.context.scene.cycles.use_progressive_refine = False
+    # Make it sure that an Image, and not a Vertex Colors layer, is the target of the bake
+    if settings.bversion >= 2.92:
+        bpy.context.scene.render.bake.target = 'IMAGE_TEXTURES'
+    # Disable denoising until it is properly implemented for baking
+    if settings.bversion >= 3:
+        bpy.context.scene.cycles.use_denoising = False
+
+
+def is_mode_ready(bake_mode):
+    """Whether the bake sets can be baked in a mode, otherwise the reason is left in settings.bake_error"""
+    if bake_mode in {'ao', 'normal_tangent', 'normal_object', 'curvature', 'environment', 'uv', 'shadow'}:
+        settings.bake_error = ""
+        return True
+    bake_settings = bpy.context.scene.render.bake
+    if bake_mode == 'combined':
+        if not any((bake_settings.use_pass_direct, bake_settings.use_pass_indirect, bake_settings.use_pass_emit)):
+            settings.bake_error = "Lighting or Emit pass needed"
+            return False
+        settings.bake_error = ""
+        return True
+
+    if modes[bake_mode].setVColor or not modes[bake_mode].material:
+        def is_bakeable(obj):
+            if len(obj.data.materials) <= 0:  # There are no material slots
+                settings.bake_error = "Materials needed"
+                return False
+            elif not any(obj.data.materials):  # All material slots are empty
+                settings.bake_error = "Materials needed"
+                return False
+            else:
+                for slot in obj.material_slots:
+                    if slot.material is not None:
+                        if not slot.material.use_nodes:
+                            settings.bake_error = "Nodal materials needed"
+                            return False
+                        bsdf_node = None
+                        for n in slot.material.node_tree.nodes:
+                            if n.bl_idname == "ShaderNodeBsdfPrincipled":
+                                bsdf_node = n
+                            elif n.bl_idname == "ShaderNodeGroup":
+                                for ng in n.node_tree.nodes:
+                                    if ng.bl_idname == "ShaderNodeBsdfPrincipled":
+                                        bsdf_node = ng
+                        if not bsdf_node:
+                            bool_alpha_ignore = prefs().bool_alpha_ignore
+                            bool_clean_transmission = prefs().bool_clean_transmission
+                            builtin_modes_material = {'diffuse', 'emission', 'roughness', 'glossiness',
+                                                      'transmission'}
+                            if modes[bake_mode].relink['needed'] or (
+                                    bool_clean_transmission and bake_mode == 'transmission') or \
+                                    (bool_alpha_ignore and bake_mode not in builtin_modes_material):
+                                settings.bake_error = "BSDF nodes needed"
+                                return False
+                # else:
+                # 	settings.bake_error = "Materials needed"
+                # 	return False
+            settings.bake_error = ""
+            return True
+
+        def is_vc_ready(obj):
+            if len(obj.data.vertex_colors) > 7:
+                settings.bake_error = "An empty VC layer needed"
+                return False
+            settings.bake_error = ""
+            return True
+
+        for bset in settings.sets:
+            if (len(bset.objects_high) + len(bset.objects_float)) == 0:
+                if not modes[bake_mode].material:
+                    for obj in bset.objects_low:
+                        if not is_bakeable(obj):
+                            return False
+                if modes[bake_mode].setVColor:
+                    for obj in bset.objects_low:
+                        if not is_vc_ready(obj):
+                            return False
+            else:
+                if not modes[bake_mode].material:
+                    for obj in (bset.objects_high + bset.objects_float):
+                        if not is_bakeable(obj):
+                            return False
+                if modes[bake_mode].setVColor:
+                    for obj in (bset.objects_high + bset.objects_float):
+                        if not is_vc_ready(obj):
+                            return False
+
+    settings.bake_error = ""
+    return True
+
+
+def bake(self, bake_modes, size, bake_force, sampling_scale, circular_report, color_report, selected, active,
+         pre_selection_mode, skipped_report=None, cache_report=None):
+    """
+    Bakes every set in each of the modes, one pass per mode. The scene settings are stored, the materials
+    copied and the cage objects hidden once for all passes, and everything is restored once at the end.
+    Sets whose inputs did not change since their last bake in a mode are skipped, and counted in skipped_report.
+    Sets found in the disk bake cache are loaded instead of baked, cache_report counts the hits and misses.
+    """
+    print(f"Bake '{', '.join(bake_modes)}'")
 
     # Get the baking sets / pairs
     sets = settings.sets
@@ -271,33 +320,19 @@ def bake(self, mode, size, bake_force, sampling_scale, circular_report, color_re
     render_width = sampling_scale * size[0]
     render_height = sampling_scale * size[1]
 
-    # Get custom materials
-    material_loaded = get_material(mode)
-
-    # Setup properties of the custom material_loaded
-    if material_loaded:
-        setup_material_loaded(mode, material_loaded)
-
-    # If baking Material ID, make sure the color for each material is consistent between bakes
-    if mode == 'id_material':
-        # Try to redirect deleted materials which were recovered with undo
-        if len(ub.allMaterials) > 0:
-            for i, mtl in enumerate(ub.allMaterials):
-                try:
-                    mtl.name
-                except:
-                    ub.allMaterials[i] = bpy.data.materials.get(ub.allMaterialsNames[i])
-        else:  # Store a persistent ordered list of all originally used materials in the scene
-            ub.allMaterials = [mtl for mtl in bpy.data.materials if (mtl is not None and mtl.users != 0)]
-            ub.allMaterialsNames = [mtl.name for mtl in ub.allMaterials]
-
-    # If baking Element ID, make sure the color for each element is consistent between bakes
-    if mode == 'id_element':
-        ub.elementsCount = 0
+    # Sets to bake in each mode, with the fingerprint of their inputs, taken before the materials are copied
+    changed = {mode: changed_sets(sets, mode, size, sampling_scale, bake_force) for mode in bake_modes}
+    if skipped_report is not None:
+        skipped_report[0] = sum(len(sets) - len(changed[mode]) for mode in bake_modes)
+    cache_loaded, misses = load_cached(sets, changed, bake_force)
+    if cache_report is not None:
+        cache_report[0], cache_report[1] = len(cache_loaded), misses
+    baked = []  # (set name, mode, fingerprint, image name) of the finished bakes
 
     # Create dictionaries to remember original and temporary -copied- materials used in the baked objects
     previous_materials = {}
     copied_materials = {}
+    copies = {}  # object -> names of its copied materials, by slot
     # Container to save existing UDIM tile names of each set
     tiles = []
 
@@ -326,6 +361,12 @@ def bake(self, mode, size, bake_force, sampling_scale, circular_report, color_re
                 else:
                     obj.data.materials[i] = copied_materials[mtl.name]
 
+    def use_copies(obj):
+        # Back from a material loaded by a previous pass, slots without a copy are left empty
+        for i in range(len(obj.data.materials)):
+            names = copies[obj]
+            obj.data.materials[i] = bpy.data.materials[names[i]] if i < len(names) and names[i] else None
+
     def use_material_loaded(obj):
         if len(obj.data.materials) > 0:
             for i in range(len(obj.data.materials)):
@@ -333,6 +374,8 @@ def bake(self, mode, size, bake_force, sampling_scale, circular_report, color_re
         else:
             obj.data.materials.append(bpy.data.materials[material_loaded])
 
+    # Copy the materials once for all passes, the copies are tuned and restored between passes
+    valid_objects = []
     for bset in settings.sets:
         valid_low = []
         for obj in bset.objects_low:
@@ -347,32 +390,25 @@ def bake(self, mode, size, bake_force, sampling_scale, circular_report, color_re
                 if obj.name in bpy.data.objects: valid_high_float.append(obj)
             except ReferenceError:
                 continue
+        valid_objects.append((valid_low, valid_high_float))
+
         if (len(bset.objects_high) + len(bset.objects_float)) == 0:
             tiles.append(utilities_uv.get_UDIM_tiles(valid_low))
-            for obj in valid_low:
-                if material_loaded:
-                    use_material_loaded(obj)
-                else:
-                    use_copied_mtls(obj)
         else:
             tiles.append(utilities_uv.get_UDIM_tiles(valid_high_float))
-            if material_loaded:
-                for obj in bset.objects_low:
-                    use_copied_mtls(obj)
-                for obj in (bset.objects_high + bset.objects_float):
-                    use_material_loaded(obj)
-            else:
-                for obj in (valid_low + valid_high_float):
-                    use_copied_mtls(obj)
-
-    relinkedMaterials = []
-    EmissionIgnoredMaterials = []
-    AlphaIgnoredMaterials = []
-
-    bakeReadyMaterials = []  # Store references of materials where the baking image node is ready and an Avoid Circular Dependency action has been taken
-    image = previous_image = imagecopy = None  # Store image references globally just in case they have to be used to bake all sets
+        for obj in (valid_low + valid_high_float):
+            if obj not in copies:
+                use_copied_mtls(obj)
+                copies[obj] = [mtl.name if mtl else None for mtl in obj.data.materials]
+
+    tuning = MaterialTuning()
+    loaded_materials = set()
+    vertex_colors_set = False
     stored_images = []  # [image, previous_image, imagecopy] list of lists
 
+    # Names of the objects hidden from rendering while a set is isolated
+    isolated = []
+
     # Hide all cage objects in render
     render_state = {}
     for bset in sets:
@@ -382,125 +418,201 @@ def bake(self, mode, size, bake_force, sampling_scale, circular_report, color_re
             obj_cage.hide_render = True
 
     try:
-        for s, bset in enumerate(sets):
-            name_texture = f"{bset.name}_{mode}"
-            if bake_force == "Single":
-                name_texture = f"{sets[0].name}_{mode}"  # In Single mode, bake into the same texture
-            # path = bpy.path.abspath("//{}.tga".format(name_texture))
-
-            is_clear = (not bake_force == "Single") or (bake_force == "Single" and s == 0)
-
-            # Setup "image" to bake on and retrieve "previous_image": an image that exists in the blend file with the same name
-            # than "image", maybe used in materials involved in the bake
-            if is_clear:
-                bakeReadyMaterials = []
-                loaded = True
-                if not material_loaded:
-                    loaded = False
-
-                image, previous_image = setup_image(color_report, mode, name_texture, render_width, render_height,
-                                                    tiles[s], material_load=loaded)
-
-                # Avoid Circular Dependency method A: Create image copy to use in existing nodes that may be affected
-                # if baking directly in a "previous_image" whose source is an external file
-                imagecopy = image.copy() if image == previous_image else None
-                image_name = image.name
-                previous_image_name = previous_image.name if previous_image else None
-                imagecopy_name = imagecopy.name if imagecopy else None
-
-                stored_images.append([image_name, previous_image_name, imagecopy_name, name_texture])
-
-            def assign_tune_materials(obj, setup_bake_nodes=False):
-
-                if material_loaded:
-                    # If baking ID Materials, update the persistent ordered list of all materials in the scene
-                    if mode == 'id_material':
-                        for mtlname in previous_materials[obj]:
-                            if mtlname and bpy.data.materials[mtlname] not in ub.allMaterials:
-                                ub.allMaterials.append(bpy.data.materials[mtlname])
-                                ub.allMaterialsNames.append(mtlname)
-                    if modes[mode].setVColor:
-                        ub.assign_vertex_color(obj)
-                        if mode == 'id_material':
-                            modes[mode].setVColor(obj, previous_materials)
+        for mode in bake_modes:
+            if not changed[mode]:
+                print(f"Bake '{mode}': all sets unchanged")
+                continue
+            bpy.context.scene.render.engine = modes[mode].engine  # Switch render engine
+
+            # Get custom materials
+            material_loaded = get_material(mode)
+
+            # Setup properties of the custom material_loaded
+            if material_loaded:
+                setup_material_loaded(mode, material_loaded)
+
+            # If baking Material ID, make sure the color for each material is consistent between bakes
+            if mode == 'id_material':
+                # Try to redirect deleted materials which were recovered with undo
+                if len(ub.allMaterials) > 0:
+                    for i, mtl in enumerate(ub.allMaterials):
+                        try:
+                            mtl.name
+                        except:
+                            ub.allMaterials[i] = bpy.data.materials.get(ub.allMaterialsNames[i])
+                else:  # Store a persistent ordered list of all originally used materials in the scene
+                    ub.allMaterials = [mtl for mtl in bpy.data.materials if (mtl is not None and mtl.users != 0)]
+                    ub.allMaterialsNames = [mtl.name for mtl in ub.allMaterials]
+
+            # If baking Element ID, make sure the color for each element is consistent between bakes
+            if mode == 'id_element':
+                ub.elementsCount = 0
+
+            if material_loaded:
+                loaded_materials.add(material_loaded)
+                vertex_colors_set |= bool(modes[mode].setVColor)
+
+            # Assign the loaded material of this mode, or the material copies
+            for bset, (valid_low, valid_high_float) in zip(sets, valid_objects):
+                if (len(bset.objects_high) + len(bset.objects_float)) == 0:
+                    for obj in valid_low:
+                        if material_loaded:
+                            use_material_loaded(obj)
                         else:
-                            modes[mode].setVColor(obj)
-
-                elif modes[mode].relink['needed']:
-                    for slot in obj.material_slots:
-                        if slot.material:
-                            if slot.material not in relinkedMaterials:
-                                relink_nodes(mode, slot.material)
-                                relinkedMaterials.append(slot.material)
-                            if modes[mode].type == 'EMIT' and settings.bversion >= 2.91:
-                                if slot.material not in EmissionIgnoredMaterials:
-                                    channel_ignore(modes['emission_strength'].relink['n'], slot.material)
-                                    EmissionIgnoredMaterials.append(slot.material)
-                            if (bool_alpha_ignore and mode != 'ao' and mode != 'diffuse') or mode == 'alpha':
-                                if slot.material not in AlphaIgnoredMaterials:
-                                    channel_ignore(modes['alpha'].relink['n'], slot.material)
-                                    AlphaIgnoredMaterials.append(slot.material)
-                    if setup_bake_nodes:
-                        setup_image_bake_node(obj, bakeReadyMaterials, image_name, previous_image_name, imagecopy_name)
+                            use_copies(obj)
+                else:
+                    for obj in valid_low:
+                        use_copies(obj)
+                    for obj in valid_high_float:
+                        if material_loaded:
+                            use_material_loaded(obj)
+                        else:
+                            use_copies(obj)
+
+            relinkedMaterials = []
+            EmissionIgnoredMaterials = []
+            AlphaIgnoredMaterials = []
+
+            # Supersampled bakes too large to render at once are baked tile by tile, see bake_tiles
+            grid = None
+            if bake_force != "Single":
+                grid = bake_tile_service.tile_grid(size[0], size[1], sampling_scale, tt_settings().bake_tile_size,
+                                                   max(tt_settings().padding, bake_postprocess_service.LANCZOS_LOBES) + 1)
+
+            bakeReadyMaterials = []  # Store references of materials where the baking image node is ready and an Avoid Circular Dependency action has been taken
+            image = previous_image = imagecopy = None  # Store image references globally just in case they have to be used to bake all sets
+
+            for s, bset in enumerate(sets):
+                if s not in changed[mode]:
+                    print("Unchanged", bset.name)
+                    continue
+                name_texture = f"{bset.name}_{mode}"
+                if bake_force == "Single":
+                    name_texture = f"{sets[0].name}_{mode}"  # In Single mode, bake into the same texture
+                # path = bpy.path.abspath("//{}.tga".format(name_texture))
+
+                is_clear = (not bake_force == "Single") or (bake_force == "Single" and s == 0)
+
+                # Setup "image" to bake on and retrieve "previous_image": an image that exists in the blend file with the same name
+                # than "image", maybe used in materials involved in the bake
+                if is_clear:
+                    bakeReadyMaterials = []
+                    material_load = True
+                    if not material_loaded:
+                        material_load = False
+
+                    # A tiled bake renders into the image at tile size, and assembles it at the final size
+                    tiled = grid is not None and not tiles[s] and can_tile(bset)
+                    bake_width, bake_height = (size[0], size[1]) if tiled else (render_width, render_height)
+                    image, previous_image = setup_image(color_report, mode, name_texture, bake_width, bake_height,
+                                                        tiles[s], material_load=material_load)
+
+                    # Avoid Circular Dependency method A: Create image copy to use in existing nodes that may be affected
+                    # if baking directly in a "previous_image" whose source is an external file
+                    imagecopy = image.copy() if image == previous_image else None
+                    image_name = image.name
+                    previous_image_name = previous_image.name if previous_image else None
+                    imagecopy_name = imagecopy.name if imagecopy else None
+
+                    stored_images.append([image_name, previous_image_name, imagecopy_name, name_texture])
+
+                def assign_tune_materials(obj, setup_bake_nodes=False):
+
+                    if material_loaded:
+                        # If baking ID Materials, update the persistent ordered list of all materials in the scene
+                        if mode == 'id_material':
+                            for mtlname in previous_materials[obj]:
+                                if mtlname and bpy.data.materials[mtlname] not in ub.allMaterials:
+                                    ub.allMaterials.append(bpy.data.materials[mtlname])
+                                    ub.allMaterialsNames.append(mtlname)
+                        if modes[mode].setVColor:
+                            ub.assign_vertex_color(obj)
+                            if mode == 'id_material':
+                                modes[mode].setVColor(obj, previous_materials)
+                            else:
+                                modes[mode].setVColor(obj)
 
-                elif bool_emission_strength_ignore and settings.bversion >= 2.91 and mode == 'emission':
-                    for slot in obj.material_slots:
-                        if slot.material and slot.material.use_nodes:
-                            bsdf_node = None
-                            for n in slot.material.node_tree.nodes:
-                                if n.bl_idname == "ShaderNodeBsdfPrincipled":
-                                    bsdf_node = n
-                                elif n.bl_idname == "ShaderNodeGroup":
-                                    for ng in n.node_tree.nodes:
-                                        if ng.bl_idname == "ShaderNodeBsdfPrincipled":
-                                            bsdf_node = ng
-                            if bsdf_node:
-                                if slot.material not in EmissionIgnoredMaterials:
-                                    channel_ignore(modes['emission_strength'].relink['n'], slot.material)
-                                    EmissionIgnoredMaterials.append(slot.material)
+                    elif modes[mode].relink['needed']:
+                        for slot in obj.material_slots:
+                            if slot.material:
+                                if slot.material not in relinkedMaterials:
+                                    relink_nodes(mode, slot.material, tuning)
+                                    relinkedMaterials.append(slot.material)
+                                if modes[mode].type == 'EMIT' and settings.bversion >= 2.91:
+                                    if slot.material not in EmissionIgnoredMaterials:
+                                        channel_ignore(modes['emission_strength'].relink['n'], slot.material, tuning)
+                                        EmissionIgnoredMaterials.append(slot.material)
                                 if (bool_alpha_ignore and mode != 'ao' and mode != 'diffuse') or mode == 'alpha':
                                     if slot.material not in AlphaIgnoredMaterials:
-                                        channel_ignore(modes['alpha'].relink['n'], slot.material)
+                                        channel_ignore(modes['alpha'].relink['n'], slot.material, tuning)
                                         AlphaIgnoredMaterials.append(slot.material)
-                    if setup_bake_nodes:
-                        setup_image_bake_node(obj, bakeReadyMaterials, image_name, previous_image_name, imagecopy_name)
+                        if setup_bake_nodes:
+                            setup_image_bake_node(obj, bakeReadyMaterials, image_name, previous_image_name, imagecopy_name)
 
-                else:
-                    if (bool_alpha_ignore and mode != 'ao' and mode != 'diffuse') or mode == 'alpha':
+                    elif bool_emission_strength_ignore and settings.bversion >= 2.91 and mode == 'emission':
                         for slot in obj.material_slots:
-                            if slot.material:
-                                if slot.material.use_nodes:
-                                    bsdf_node = None
-                                    for n in slot.material.node_tree.nodes:
-                                        if n.bl_idname == "ShaderNodeBsdfPrincipled":
-                                            bsdf_node = n
-                                        elif n.bl_idname == "ShaderNodeGroup":
-                                            for ng in n.node_tree.nodes:
-                                                if ng.bl_idname == "ShaderNodeBsdfPrincipled":
-                                                    bsdf_node = ng
-                                    if bsdf_node:
+                            if slot.material and slot.material.use_nodes:
+                                _, bsdf_node = tuning.principled(slot.material)
+                                if bsdf_node:
+                                    if slot.material not in EmissionIgnoredMaterials:
+                                        channel_ignore(modes['emission_strength'].relink['n'], slot.material, tuning)
+                                        EmissionIgnoredMaterials.append(slot.material)
+                                    if (bool_alpha_ignore and mode != 'ao' and mode != 'diffuse') or mode == 'alpha':
                                         if slot.material not in AlphaIgnoredMaterials:
-                                            channel_ignore(modes['alpha'].relink['n'], slot.material)
+                                            channel_ignore(modes['alpha'].relink['n'], slot.material, tuning)
                                             AlphaIgnoredMaterials.append(slot.material)
-                    if setup_bake_nodes:
-                        setup_image_bake_node(obj, bakeReadyMaterials, image_name, previous_image_name, imagecopy_name)
+                        if setup_bake_nodes:
+                            setup_image_bake_node(obj, bakeReadyMaterials, image_name, previous_image_name, imagecopy_name)
 
-            # Assign Materials to Objects / tune the existing materials, and distribute temp bake image nodes
-            if (len(bset.objects_high) + len(bset.objects_float)) == 0:
-                # Low poly bake: Assign material to lowpoly or tune the existing material/s
-                for obj in bset.objects_low:
-                    try:
-                        if obj.name not in bpy.data.objects: raise ReferenceError
-                    except ReferenceError:
-                        continue
-                    if mode in {'ao', 'normal_tangent', 'normal_object', 'curvature', 'environment', 'uv', 'shadow',
-                                'combined'}:
-                        # Clean unused material slots?
-                        # if len(obj.data.materials) > 0:
-                        # 	if not any(obj.data.materials):	# All material slots are empty
-                        # 		obj.active_material_index = 0
-                        # 		for i in range(len(obj.material_slots)):
-                        # 			bpy.ops.object.material_slot_remove({'object': obj})
+                    else:
+                        if (bool_alpha_ignore and mode != 'ao' and mode != 'diffuse') or mode == 'alpha':
+                            for slot in obj.material_slots:
+                                if slot.material:
+                                    if slot.material.use_nodes:
+                                        _, bsdf_node = tuning.principled(slot.material)
+                                        if bsdf_node:
+                                            if slot.material not in AlphaIgnoredMaterials:
+                                                channel_ignore(modes['alpha'].relink['n'], slot.material, tuning)
+                                                AlphaIgnoredMaterials.append(slot.material)
+                        if setup_bake_nodes:
+                            setup_image_bake_node(obj, bakeReadyMaterials, image_name, previous_image_name, imagecopy_name)
+
+                # Assign Materials to Objects / tune the existing materials, and distribute temp bake image nodes
+                if (len(bset.objects_high) + len(bset.objects_float)) == 0:
+                    # Low poly bake: Assign material to lowpoly or tune the existing material/s
+                    for obj in bset.objects_low:
+                        try:
+                            if obj.name not in bpy.data.objects: raise ReferenceError
+                        except ReferenceError:
+                            continue
+                        if mode in {'ao', 'normal_tangent', 'normal_object', 'curvature', 'environment', 'uv', 'shadow',
+                                    'combined'}:
+                            # Clean unused material slots?
+                            # if len(obj.data.materials) > 0:
+                            # 	if not any(obj.data.materials):	# All material slots are empty
+                            # 		obj.active_material_index = 0
+                            # 		for i in range(len(obj.material_slots)):
+                            # 			bpy.ops.object.material_slot_remove({'object': obj})
+                            if len(obj.material_slots) == 0 or (not all(obj.data.materials)):
+                                if "TT_bake_node" not in bpy.data.materials:
+                                    bpy.data.materials.new(name="TT_bake_node")
+                                if len(obj.material_slots) == 0:
+                                    obj.data.materials.append(bpy.data.materials["TT_bake_node"])
+                                else:
+                                    for slot in obj.material_slots:
+                                        if not slot.material:
+                                            slot.material = bpy.data.materials["TT_bake_node"]
+                        assign_tune_materials(obj, setup_bake_nodes=True)
+                    if material_loaded:
+                        setup_image_bake_node(bset.objects_low[0], bakeReadyMaterials, image_name, previous_image_name,
+                                              imagecopy_name)
+                else:
+                    # High to low poly: Low poly requires any material to bake into image
+                    for obj in bset.objects_low:
+                        try:
+                            if obj.name not in bpy.data.objects: raise ReferenceError
+                        except ReferenceError:
+                            continue
                         if len(obj.material_slots) == 0 or (not all(obj.data.materials)):
                             if "TT_bake_node" not in bpy.data.materials:
                                 bpy.data.materials.new(name="TT_bake_node")
@@ -510,117 +622,120 @@ def bake(self, mode, size, bake_force, sampling_scale, circular_report, color_re
                                 for slot in obj.material_slots:
                                     if not slot.material:
                                         slot.material = bpy.data.materials["TT_bake_node"]
-                    assign_tune_materials(obj, setup_bake_nodes=True)
-                if material_loaded:
-                    setup_image_bake_node(bset.objects_low[0], bakeReadyMaterials, image_name, previous_image_name,
-                                          imagecopy_name)
-            else:
-                # High to low poly: Low poly requires any material to bake into image
-                for obj in bset.objects_low:
-                    try:
-                        if obj.name not in bpy.data.objects: raise ReferenceError
-                    except ReferenceError:
-                        continue
-                    if len(obj.material_slots) == 0 or (not all(obj.data.materials)):
-                        if "TT_bake_node" not in bpy.data.materials:
-                            bpy.data.materials.new(name="TT_bake_node")
-                        if len(obj.material_slots) == 0:
-                            obj.data.materials.append(bpy.data.materials["TT_bake_node"])
-                        else:
-                            for slot in obj.material_slots:
-                                if not slot.material:
-                                    slot.material = bpy.data.materials["TT_bake_node"]
-                    setup_image_bake_node(obj, bakeReadyMaterials, image_name, previous_image_name, imagecopy_name)
-                # Assign material to highpoly or tune the existing material/s
-                for obj in (bset.objects_high + bset.objects_float):
-                    try:
-                        if obj.name not in bpy.data.objects: raise ReferenceError
-                    except ReferenceError:
-                        continue
-                    assign_tune_materials(obj)
-
-            print("Bake", bset.name)
-
-            # Bake each low poly object in this set
-            for i in range(len(bset.objects_low)):
-                obj_low = None
-
+                        setup_image_bake_node(obj, bakeReadyMaterials, image_name, previous_image_name, imagecopy_name)
+                    # Assign material to highpoly or tune the existing material/s
+                    for obj in (bset.objects_high + bset.objects_float):
+                        try:
+                            if obj.name not in bpy.data.objects: raise ReferenceError
+                        except ReferenceError:
+                            continue
+                        assign_tune_materials(obj)
+
+                print("Bake", bset.name)
+
+                # Bake each low poly object in this set, or all of them at once when they can share a bake call
+                def bake_calls(uv_layer=None):
+                    for i, group in enumerate(low_bake_groups(bset)):
+                        obj_low = None
+
+                        try:
+                            candidate = bset.objects_low[group[0]]
+                            if candidate.name in bpy.data.objects:
+                                obj_low = candidate
+                        except (ReferenceError, AttributeError) as e:
+                            print(f"Warning: Could not access low poly object at index {group[0]}: {e}")
+
+                        if obj_low is None:
+                            if active and active.name in bpy.data.objects:
+                                obj_low = active
+                            else:
+                                continue
+
+                        try:
+                            obj_low.hide_render = False
+                            obj_low.hide_viewport = False
+                            obj_low.select_set(True)
+                            bpy.context.view_layer.objects.active = obj_low
+                        except:
+                            pass
+                        obj_cage = None if i >= len(bset.objects_cage) else bset.objects_cage[i]
+
+                        # Disable hide render
+                        obj_low.hide_render = False
+
+                        bpy.ops.object.select_all(action='DESELECT')
+                        obj_low.select_set(True)
+                        bpy.context.view_layer.objects.active = obj_low
+                        for index in group[1:]:
+                            bset.objects_low[index].hide_render = False
+                            bset.objects_low[index].hide_viewport = False
+                            bset.objects_low[index].select_set(True)
+
+                        # if modes[mode].engine == 'BLENDER_EEVEE':	#TODO would this still be needed when the set background code has been moved to the next lines?
+                        # 	# Assign image to texture faces
+                        # 	bpy.ops.object.mode_set(mode='EDIT')
+                        # 	bpy.ops.mesh.select_all(action='SELECT')
+                        # 	for area in bpy.context.screen.areas:
+                        # 		if area.ui_type == 'UV':
+                        # 			area.spaces[0].image = image
+                        # 	# bpy.data.screens['UV Editing'].areas[1].spaces[0].image = image
+                        # 	bpy.ops.object.mode_set(mode='OBJECT')
+
+                        if is_clear and i == 0 and not uv_layer:
+                            # Set background image (CYCLES & BLENDER_EEVEE)
+                            # for area in bpy.context.screen.areas:
+                            # 	if area.ui_type == 'UV':
+                            # 		area.spaces[0].image = bpy.data.images[image_name]
+                            # Invert background if final invert of the baked image is needed
+                            if modes[mode].invert:
+                                bake_postprocess_service.postprocess(bpy.data.images[image_name], inverted=True)
+
+                        for obj_high in bset.objects_high:
+                            obj_high.select_set(True)
+
+                        cycles_bake(mode, tt_settings().padding, sampling_scale, len(bset.objects_high) > 0, obj_cage,
+                                    uv_layer)
+
+                        # Bake Floaters separate bake
+                        if len(bset.objects_float) > 0:
+                            bpy.ops.object.select_all(action='DESELECT')
+                            for obj_high in bset.objects_float:
+                                obj_high.select_set(True)
+                            obj_low.select_set(True)
+
+                            cycles_bake(mode, 0, sampling_scale, len(bset.objects_float) > 0, obj_cage, uv_layer)
+
+                # The rest of the scene is hidden for the bake calls of this set only
                 try:
-                    candidate = bset.objects_low[i]
-                    if candidate.name in bpy.data.objects:
-                        obj_low = candidate
-                except (ReferenceError, AttributeError) as e:
-                    print(f"Warning: Could not access low poly object at index {i}: {e}")
-
-                if obj_low is None:
-                    if active and active.name in bpy.data.objects:
-                        obj_low = active
+                    if tt_settings().bake_isolate and can_isolate(mode):
+                        isolate_render(bset, isolated)
+                    if tiled:
+                        bake_tiles(bset, image_name, mode, grid, sampling_scale, bake_calls)
                     else:
-                        continue
+                        bake_calls()
+                finally:
+                    restore_render(isolated)
 
-                try:
-                    obj_low.hide_render = False
-                    obj_low.hide_viewport = False
-                    obj_low.select_set(True)
-                    bpy.context.view_layer.objects.active = obj_low
-                except:
-                    pass
-                obj_cage = None if i >= len(bset.objects_cage) else bset.objects_cage[i]
-
-                # Disable hide render
-                obj_low.hide_render = False
-
-                bpy.ops.object.select_all(action='DESELECT')
-                obj_low.select_set(True)
-                bpy.context.view_layer.objects.active = obj_low
-
-                # if modes[mode].engine == 'BLENDER_EEVEE':	#TODO would this still be needed when the set background code has been moved to the next lines?
-                # 	# Assign image to texture faces
-                # 	bpy.ops.object.mode_set(mode='EDIT')
-                # 	bpy.ops.mesh.select_all(action='SELECT')
-                # 	for area in bpy.context.screen.areas:
-                # 		if area.ui_type == 'UV':
-                # 			area.spaces[0].image = image
-                # 	# bpy.data.screens['UV Editing'].areas[1].spaces[0].image = image
-                # 	bpy.ops.object.mode_set(mode='OBJECT')
-
-                if is_clear and i == 0:
-                    # Set background image (CYCLES & BLENDER_EEVEE)
-                    # for area in bpy.context.screen.areas:
-                    # 	if area.ui_type == 'UV':
-                    # 		area.spaces[0].image = bpy.data.images[image_name]
-                    # Invert background if final invert of the baked image is needed
-                    if modes[mode].invert:
-                        bpy.ops.image.invert(invert_r=True, invert_g=True, invert_b=True, invert_a=False)
-
-                for obj_high in bset.objects_high:
-                    obj_high.select_set(True)
-
-                cycles_bake(mode, tt_settings().padding, sampling_scale, len(bset.objects_high) > 0, obj_cage)
-
-                # Bake Floaters separate bake
-                if len(bset.objects_float) > 0:
-                    bpy.ops.object.select_all(action='DESELECT')
-                    for obj_high in bset.objects_float:
-                        obj_high.select_set(True)
-                    obj_low.select_set(True)
-
-                    cycles_bake(mode, 0, sampling_scale, len(bset.objects_float) > 0, obj_cage)
-
-            # Operations to be made only after the bake is -or the bakes are- finished
-            if (not bake_force == "Single") or (bake_force == "Single" and s == len(sets) - 1):
-                if modes[mode].invert:
-                    bpy.ops.image.invert(invert_r=True, invert_g=True, invert_b=True, invert_a=False)
-                if render_width != size[0] or render_height != size[1]:
-                    bpy.data.images[image_name].scale(*size)
-
-                if modes[mode].composite:
-                    apply_composite(image_name, modes[mode].composite, tt_settings().bake_curvature_size)
-
-        # TODO: if autosave: image.save()
+                # Operations to be made only after the bake is -or the bakes are- finished
+                if (not bake_force == "Single") or (bake_force == "Single" and s == len(sets) - 1):
+                    # Invert and downsample the supersampled bake in one pass over its pixels, tiles are already
+                    bake_postprocess_service.postprocess(bpy.data.images[image_name], 1 if tiled else sampling_scale,
+                                                         modes[mode].invert, tt_settings().bake_downsample_filter)
+                    if modes[mode].invert and bpy.data.images[image_name].source == 'TILED':
+                        self.report({'WARNING'}, f"Only the first UDIM tile of '{image_name}' was inverted")
+
+                    if modes[mode].composite:
+                        apply_composite(image_name, modes[mode].composite, tt_settings().bake_curvature_size)
+
+                    baked.append((sets[0].name if bake_force == "Single" else bset.name, mode,
+                                  changed[mode][s], name_texture))
 
+            # Undo the relinked and ignored channels, so the next pass tunes untouched copies
+            tuning.revert()
 
     finally:
+        restore_render(isolated)
+
         # Restore visibility in renders for cage objects
         for bset in sets:
             for obj_cage in bset.objects_cage:
@@ -646,11 +761,10 @@ def bake(self, mode, size, bake_force, sampling_scale, circular_report, color_re
                     else:
                         obj.data.materials[i] = bpy.data.materials[mtlname]
 
-            if material_loaded:
-                if modes[mode].setVColor:
-                    vclsNames = [vcl.name for vcl in obj.data.vertex_colors]
-                    if 'TexTools_temp' in vclsNames:
-                        obj.data.vertex_colors.remove(obj.data.vertex_colors['TexTools_temp'])
+            if vertex_colors_set:
+                vclsNames = [vcl.name for vcl in obj.data.vertex_colors]
+                if 'TexTools_temp' in vclsNames:
+                    obj.data.vertex_colors.remove(obj.data.vertex_colors['TexTools_temp'])
 
         for mtl in copied_materials.values():
             bpy.data.materials.remove(bpy.data.materials[mtl], do_unlink=True)
@@ -658,8 +772,8 @@ def bake(self, mode, size, bake_force, sampling_scale, circular_report, color_re
         if "TT_bake_node" in bpy.data.materials:
             bpy.data.materials.remove(bpy.data.materials["TT_bake_node"], do_unlink=True)
 
-        if material_loaded:
-            bpy.data.materials.remove(bpy.data.materials[material_loaded], do_unlink=True)
+        for name in loaded_materials:
+            bpy.data.materials.remove(bpy.data.materials[name], do_unlink=True)
 
         for images in stored_images:
             if images[1] and images[1] in bpy.data.images and bpy.data.images[images[0]] != bpy.data.images[images[1]]:
@@ -712,12 +826,246 @@ def bake(self, mode, size, bake_force, sampling_scale, circular_report, color_re
             bpy.context.view_layer.objects.active = active
             bpy.ops.object.mode_set(mode=pre_selection_mode)
 
+    # Only reached when every pass succeeded, with the baked images renamed to their final names
+    for set_name, mode, fingerprint, name_texture in baked:
+        if fingerprint:
+            bake_fingerprint_service.record(set_name, mode, fingerprint, name_texture)
+            if prefs().bake_cache_dir:
+                bake_cache_service.store(bpy.path.abspath(prefs().bake_cache_dir), bpy.data.images[name_texture],
+                                         fingerprint, prefs().bake_cache_size * 1024 * 1024)
+
+    if tt_settings().bake_autosave:
+        save_images(self, [(set_name, mode, name_texture) for set_name, mode, _, name_texture in baked]
+                    + cache_loaded)
+
+
+def changed_sets(sets, mode, size, sampling_scale, bake_force):
+    """
+    Fingerprint of the inputs of every set to bake in a mode, by set index; None when it can't be fingerprinted.
+    Fingerprints are taken when Skip Unchanged or the bake cache is on; with Skip Unchanged, sets left out match
+    their last successful bake. In Single mode all sets bake one image, so they are fingerprinted and skipped
+    together.
+    """
+    skip = tt_settings().bake_skip_unchanged
+    if not (skip or prefs().bake_cache_dir) or not can_skip(mode):
+        return {s: None for s in range(len(sets))}
+
+    groups = [list(range(len(sets)))] if bake_force == "Single" else [[s] for s in range(len(sets))]
+    state = mode_state(mode, size, sampling_scale, bake_force)
+    changed = {}
+    for group in groups:
+        group_sets = [sets[s] for s in group]
+        try:
+            fingerprint = bake_fingerprint_service.set_fingerprint(group_sets, state)
+        except ReferenceError:
+            fingerprint = None
+        if fingerprint is None:
+            changed.update(dict.fromkeys(group))
+        elif not skip or not bake_fingerprint_service.is_current(group_sets[0].name, mode, fingerprint):
+            changed.update(dict.fromkeys(group, fingerprint))
+    return changed
+
+
+def load_cached(sets, changed, bake_force):
+    """
+    Loads the images of the changed sets found in the disk bake cache and takes those sets out of changed.
+    Every set loads its own image, even when sets with the same inputs share a fingerprint; in Single mode
+    all sets bake one image, so they are loaded together.
+    Returns the (set name, mode, image name) of every image loaded, and the number of cache misses.
+    """
+    if not prefs().bake_cache_dir:
+        return [], 0
+    directory = bpy.path.abspath(prefs().bake_cache_dir)
+
+    loaded = []
+    misses = 0
+    for mode, fingerprints in changed.items():
+        groups = [list(fingerprints)] if bake_force == "Single" else [[s] for s in fingerprints]
+        for group in groups:
+            fingerprint = fingerprints[group[0]] if group else None
+            if fingerprint is None:
+                continue
+            set_name = sets[group[0]].name
+            name_texture = f"{set_name}_{mode}"
+            path = bake_cache_service.lookup(directory, fingerprint)
+            if path is None or bake_cache_service.load(path, name_texture, tt_settings().bake_color_space) is None:
+                misses += 1
+                continue
+            print(f"Bake cache hit '{name_texture}'")
+            bake_fingerprint_service.record(set_name, mode, fingerprint, name_texture)
+            for s in group:
+                del fingerprints[s]
+            loaded.append((set_name, mode, name_texture))
+    return loaded, misses
+
+
+def save_images(self, images):
+    """
+    Saves (set name, mode, image name) images in the background, to the paths the Save template of the bake
+    settings gives them. The template may use {set}, {mode} and {image}.
+    """
+    template = tt_settings().bake_save_path
+    for set_name, mode, name_texture in images:
+        try:
+            path = template.format(set=set_name, mode=mode, image=name_texture)
+        except (KeyError, IndexError, ValueError):
+            self.report({'WARNING'}, f"Invalid save path '{template}', use {{set}}, {{mode}} and {{image}}")
+            return
+        image = bpy.data.images[name_texture]
+        if image.source == 'TILED':
+            self.report({'WARNING'}, f"UDIM image '{name_texture}' not saved, only single tile images can be")
+            continue
+        bake_writer_service.save_async(image, bpy.path.abspath(path))
+
+
+def can_skip(mode):
+    """
+    Whether a bake in a mode only depends on the set and the bake settings. Environment bakes the world,
+    Selection bakes the face selection, and Element and Material ID colors are numbered across all the sets
+    of a bake, so skipping a set would change the colors of the others.
+    """
+    return (can_isolate(mode) and modes[mode].type != 'ENVIRONMENT'
+            and mode not in {'selection', 'id_element', 'id_material'})
+
+
+def mode_state(mode, size, sampling_scale, bake_force):
+    """Settings a mode bakes with, part of the fingerprint of its inputs"""
+    bake_mode = modes[mode]
+    tool = tt_settings()
+    return (mode, bake_mode.material, bake_mode.type, bake_mode.normal_space, tuple(bake_mode.color),
+            bake_mode.engine, repr(bake_mode.relink), bake_mode.composite, bake_mode.use_project, bake_mode.invert,
+            tuple(size), sampling_scale, bake_force, tool.bake_samples, tool.padding, tool.bake_ray_distance,
+            tool.bake_cage_extrusion, tool.bake_color_space, repr([getattr(tool, param) for param in bake_mode.params]),
+            tool.bake_downsample_filter, tool.bake_tile_size,
+            prefs().swizzle_y_coordinate, prefs().bake_32bit_float, prefs().bake_color_space_def,
+            prefs().bool_emission_ignore, prefs().bool_alpha_ignore,
+            prefs().bool_bake_back_color, tuple(tool.bake_back_color))
+
+
+def can_isolate(mode):
+    """
+    Whether a mode only depends on the objects of the set, so the rest of the scene can be left out of the bake.
+    Glossy and Transmission passes bake with the direct and indirect lighting of the scene, only Diffuse turns
+    them off in cycles_bake.
+    """
+    if modes[mode].type in {'AO', 'SHADOW', 'COMBINED', 'GLOSSY', 'TRANSMISSION'}:
+        return False
+    return mode != 'thickness' or tt_settings().bake_thickness_local
+
+
+def isolate_render(bset, isolated):
+    """
+    Hides every other object of the view layer from rendering, their names are added to isolated.
+    Linked objects can't be edited and keep rendering.
+    """
+    keep = set(bset.objects_low + bset.objects_high + bset.objects_float + bset.objects_cage)
+    for obj in bpy.context.view_layer.objects:
+        if obj.library or not getattr(obj, 'is_editable', True):
+            continue
+        if obj not in keep and not obj.hide_render:
+            obj.hide_render = True
+            isolated.append(obj.name)
+
+
+def restore_render(isolated):
+    for name in isolated:
+        obj = bpy.data.objects.get(name)
+        if obj:
+            obj.hide_render = False
+    isolated.clear()
+
+
+def can_tile(bset):
+    """Whether every low poly mesh of a set has a UV map to bake, and room for the temporary UV map of the tiles"""
+    for obj in bset.objects_low:
+        try:
+            if obj.name not in bpy.data.objects: continue
+        except ReferenceError:
+            continue
+        if obj.type != 'MESH' or not obj.data.uv_layers.active or len(obj.data.uv_layers) >= 8:
+            return False
+    return True
+
+
+def bake_tiles(bset, image_name, mode, grid, sampling_scale, bake_calls):
+    """
+    Bakes a set tile by tile, so memory is bounded by the tile size instead of the supersampled image size.
+    Every tile is rendered supersampled into the image through a temporary UV map stretching the tile over
+    the whole image, then downsampled at once and copied into the final pixels, written back at the end.
+    """
+    image = bpy.data.images[image_name]
+    width, height = image.size
+    pixels = np.empty((height, width, image.channels), dtype=np.float32)
+    encoded = bake_postprocess_service.is_encoded(image)
+    kind = tt_settings().bake_downsample_filter
+    # Inverted up front like the background of an untiled bake, the final invert restores it
+    background = np.array(background_color(mode), dtype=np.float32)
+    if modes[mode].invert:
+        background[:3] = 1.0 - background[:3]
+
+    base_uvs = {}  # mesh -> UVs of its active UV map
+    for obj in bset.objects_low:
+        try:
+            if obj.name not in bpy.data.objects: continue
+        except ReferenceError:
+            continue
+        me = obj.data
+        if me not in base_uvs:
+            uv = np.empty(len(me.loops) * 2, dtype=np.float32)
+            me.uv_layers.active.data.foreach_get('uv', uv)
+            base_uvs[me] = uv.reshape(-1, 2)
+            me.uv_layers.new(name=TILE_UV_LAYER, do_init=False)
+
+    try:
+        for n, tile in enumerate(grid):
+            tile_width, tile_height = tile.render_size(sampling_scale)
+            image.scale(tile_width, tile_height)
+            image.pixels.foreach_set(np.tile(background, tile_width * tile_height))
+            for me, uv in base_uvs.items():
+                tile_uv = bake_tile_service.tile_uv(uv, tile, width, height)
+                me.uv_layers[TILE_UV_LAYER].data.foreach_set('uv', tile_uv.ravel())
+
+            print(f"Bake tile {n + 1}/{len(grid)}: {tile_width}x{tile_height}")
+            bake_calls(TILE_UV_LAYER)
+            tile_pixels = bake_postprocess_service.read(image)
+            if sampling_scale > 1:
+                tile_pixels = bake_postprocess_service.reduce(tile_pixels, sampling_scale, kind, encoded)
+            bake_tile_service.place(pixels, tile_pixels, tile)
+    finally:
+        for me in base_uvs:
+            layer = me.uv_layers.get(TILE_UV_LAYER)
+            if layer:
+                me.uv_layers.remove(layer)
+
+    bake_postprocess_service.write(image, pixels)
+
+
+def low_bake_groups(bset):
+    """
+    Indices of the low poly objects each bake call of a set bakes. Without cage, high poly or floater objects
+    nothing is projected onto the low poly objects, so all of them bake into the set image in a single call,
+    and Cycles syncs the scene and builds its BVH once instead of once per object.
+    """
+    if bset.objects_cage or bset.objects_high or bset.objects_float:
+        return [[i] for i in range(len(bset.objects_low))]
+
+    valid = []
+    for i, obj in enumerate(bset.objects_low):
+        try:
+            if obj.name in bpy.data.objects: valid.append(i)
+        except ReferenceError:
+            continue
+    if not valid:
+        return [[i] for i in range(len(bset.objects_low))]
+    return [valid]
+
 
 def apply_composite(image_name, scene_name, size):
     image = bpy.data.images[image_name]
-    previous_scene = bpy.context.window.scene
+    window = bpy.context.window  # None when running in background
+    previous_scene = bpy.context.scene
     # avoid Sun Position addon error
-    preWorldPropertiesNodesBool = previous_scene.world.use_nodes
+    preWorldPropertiesNodesBool = previous_scene.world.use_nodes if previous_scene.world else True
 
     # Get Scene with compositing nodes
     scene = None
@@ -730,8 +1078,10 @@ def apply_composite(image_name, scene_name, size):
 
     if scene:
         # Switch scene
-        bpy.context.window.scene = scene
-        bpy.context.window.scene.world.use_nodes = preWorldPropertiesNodesBool
+        if window:
+            window.scene = scene
+        if scene.world:
+            scene.world.use_nodes = preWorldPropertiesNodesBool
 
         # Setup composite nodes for Curvature
         if "Image" in scene.node_tree.nodes:
@@ -741,7 +1091,7 @@ def apply_composite(image_name, scene_name, size):
             scene.node_tree.nodes["Offset"].outputs[0].default_value = size
 
         # Render image
-        bpy.ops.render.render(use_viewport=False)
+        bpy.ops.render.render(use_viewport=False, scene=scene.name)
 
         # Get last images of viewer node and render result
         image_viewer_node = get_last_item("Viewer Node", bpy.data.images)
@@ -757,7 +1107,8 @@ def apply_composite(image_name, scene_name, size):
             bpy.data.images.remove(image_render_result)
 
         # Restore scene & remove other scene
-        bpy.context.window.scene = previous_scene
+        if window:
+            window.scene = previous_scene
 
         # Delete compositing scene
         bpy.data.scenes.remove(scene)
@@ -779,11 +1130,14 @@ def get_last_item(key_name, collection):
     return None
 
 
-def setup_image(color_report, mode, name, width, height, tiles, material_load=False):
+def background_color(mode):
     if prefs().bool_bake_back_color == 'CUSTOM':
-        bake_back_color = tt_settings().bake_back_color
-    else:
-        bake_back_color = modes[mode].color
+        return tt_settings().bake_back_color
+    return modes[mode].color
+
+
+def setup_image(color_report, mode, name, width, height, tiles, material_load=False):
+    bake_back_color = background_color(mode)
 
     def set_color_space(color_report, image):
         image.alpha_mode = 'NONE'
@@ -814,6 +1168,8 @@ def setup_image(color_report, mode, name, width, height, tiles, material_load=Fa
             image.scale(width, height)
 
     def set_image_as_background(image):
+        if not bpy.context.screen:  # Running in background
+            return
         for area in bpy.context.screen.areas:
             if area.ui_type == 'UV':
                 area.spaces[0].image = bpy.data.images[image.name]
@@ -840,9 +1196,14 @@ def setup_image(color_report, mode, name, width, height, tiles, material_load=Fa
 
         if tiles and settings.bversion >= 3.2:
             image.tiles.get(1001).generated_color = bake_back_color
+            # Through the data API rather than bpy.ops.image.tile_add, which needs an Image Editor, so headless
+            # bakes get their tiles too. Setting the generated properties of a tile fills it
             for tile in tiles:
-                bpy.ops.image.tile_add(number=tile, width=width, height=height, float=is_float_32,
-                                       color=bake_back_color)
+                image_tile = image.tiles.new(tile_number=tile)
+                image_tile.generated_width = width
+                image_tile.generated_height = height
+                image_tile.use_generated_float = is_float_32
+                image_tile.generated_color = bake_back_color
             image.tiles.active_index = 0
         else:
             apply_color(image)
@@ -934,22 +1295,14 @@ def setup_image_bake_node(obj, bakeReadyMaterials, image_name, previous_image_na
                     bakeReadyMaterials.append(slot.material.name)
 
 
-def relink_nodes(mode, material):
+def relink_nodes(mode, material, tuning):
     if not material.use_nodes:
         material.use_nodes = True
-    tree = material.node_tree
-    bsdf_node = None
-    for n in tree.nodes:
-        if n.bl_idname == "ShaderNodeBsdfPrincipled":
-            bsdf_node = n
-        elif n.bl_idname == "ShaderNodeGroup":
-            for ng in n.node_tree.nodes:
-                if ng.bl_idname == "ShaderNodeBsdfPrincipled":
-                    tree = n.node_tree
-                    bsdf_node = ng
+    tree, bsdf_node = tuning.principled(material)
 
     # set b, which is the base(original) socket index, and n, which is the new-values-source index for the base socket
     b, n = modes[mode].relink['b'], modes[mode].relink['n']
+    tuning.store(material, b)
 
     base_node = base_socket = None
     if len(bsdf_node.inputs[b].links) != 0:
@@ -976,19 +1329,11 @@ def relink_nodes(mode, material):
         bsdf_node.inputs[b].default_value = bsdf_node.inputs[n].default_value
 
 
-def channel_ignore(channel, material):
+def channel_ignore(channel, material, tuning):
     if not material.use_nodes:
         material.use_nodes = True
-    tree = material.node_tree
-    bsdf_node = None
-    for n in tree.nodes:
-        if n.bl_idname == "ShaderNodeBsdfPrincipled":
-            bsdf_node = n
-        elif n.bl_idname == "ShaderNodeGroup":
-            for ng in n.node_tree.nodes:
-                if ng.bl_idname == "ShaderNodeBsdfPrincipled":
-                    tree = n.node_tree
-                    bsdf_node = ng
+    tree, bsdf_node = tuning.principled(material)
+    tuning.store(material, channel)
 
     if len(bsdf_node.inputs[channel].links) != 0:
         tree.links.remove(bsdf_node.inputs[channel].links[0])
@@ -997,6 +1342,57 @@ def channel_ignore(channel, material):
     bsdf_node.inputs[channel].default_value = 1.0
 
 
+class MaterialTuning:
+    """
+    Principled BSDF of every material a bake tunes, searched once per material,
+    and the original state of the BSDF inputs a bake pass relinked or ignored.
+    """
+
+    def __init__(self):
+        self.nodes = {}  # material name -> (node tree, principled node)
+        self.stored = {}  # (material name, input index) -> (node tree, input socket, default value, linked socket)
+
+    def principled(self, material):
+        """(node tree, Principled BSDF node) of a material, a BSDF inside a node group comes with the group tree"""
+        if material.name in self.nodes:
+            return self.nodes[material.name]
+        tree = material.node_tree
+        found = (None, None)
+        if material.use_nodes and tree:
+            for n in tree.nodes:
+                if n.bl_idname == "ShaderNodeBsdfPrincipled":
+                    found = (tree, n)
+                elif n.bl_idname == "ShaderNodeGroup":
+                    for ng in n.node_tree.nodes:
+                        if ng.bl_idname == "ShaderNodeBsdfPrincipled":
+                            found = (n.node_tree, ng)
+            self.nodes[material.name] = found
+        return found
+
+    def store(self, material, index):
+        """Remembers a BSDF input before it is changed, only its first state is kept until revert"""
+        key = (material.name, index)
+        if key in self.stored:
+            return
+        tree, bsdf_node = self.principled(material)
+        socket = bsdf_node.inputs[index]
+        value = socket.default_value
+        if hasattr(value, '__len__'):
+            value = tuple(value)
+        linked = socket.links[0].from_socket if len(socket.links) != 0 else None
+        self.stored[key] = (tree, socket, value, linked)
+
+    def revert(self):
+        """Puts every stored BSDF input back as it was"""
+        for tree, socket, value, linked in self.stored.values():
+            for link in list(socket.links):
+                tree.links.remove(link)
+            socket.default_value = value
+            if linked:
+                tree.links.new(linked, socket)
+        self.stored.clear()
+
+
 def setup_material_loaded(mode, name):
     nodes = bpy.data.materials[name].node_tree.nodes
     if mode in ('normal_tangent_bevel', 'normal_object_bevel', 'bevel_mask') and 'Bevel' in nodes:
@@ -1032,7 +1428,7 @@ def get_material(mode):
     return name
 
 
-def cycles_bake(mode, padding, sampling_scale, is_multi, obj_cage):
+def cycles_bake(mode, padding, sampling_scale, is_multi, obj_cage, uv_layer=None):
     # if modes[mode].engine == 'BLENDER_EEVEE':
     # 	# Snippet: https://gist.github.com/AndrewRayCode/760c4634a77551827de41ed67585064b
     # 	bpy.context.scene.render.bake_margin = padding
@@ -1098,5 +1494,9 @@ def cycles_bake(mode, padding, sampling_scale, is_multi, obj_cage):
         if obj_cage:
             kwargs['use_cage'] = True
             kwargs['cage_object'] = obj_cage.name
+        if uv_layer:
+            kwargs['uv_layer'] = uv_layer
 
+        start = time.perf_counter()
         bpy.ops.object.bake(**kwargs)
+        print(f"Bake call '{mode}': {len(bpy.context.selected_objects)} objects in {time.perf_counter() - start:.2f}s")
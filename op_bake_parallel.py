@@ -0,0 +1,69 @@
+import os
+import time
+
+import bpy
+
+from . import op_bake
+from . import settings
+from . import utilities_ui
+from .services import bake_dispatch_service
+from .settings import tt_settings
+
+
+class op(bpy.types.Operator):
+	bl_idname = "uv.textools_bake_parallel"
+	bl_label = "Bake in Parallel"
+	bl_description = "Bake every set in its own background Blender process, several at a time, and load the baked images back"
+
+	workers: bpy.props.IntProperty(
+		name="Workers", default=0, min=0, soft_max=16,
+		description="Blender processes baking at the same time, 0 for one per 8 CPU cores")
+	bake_modes: bpy.props.StringProperty(
+		name="Modes", default="", options={'SKIP_SAVE'},
+		description="Comma separated bake modes, the selected bake mode when empty")
+
+	@classmethod
+	def poll(cls, context):
+		return len(settings.sets) > 0 and context.mode == 'OBJECT'
+
+	def execute(self, context):
+		start = time.perf_counter()
+		op_bake.update_transmission_mode()
+		bake_modes = [mode.strip() for mode in self.bake_modes.split(',') if mode.strip()]
+		if not bake_modes:
+			bake_modes = [utilities_ui.get_bake_mode()]
+		for bake_mode in bake_modes:
+			if bake_mode not in op_bake.modes or not op_bake.is_mode_ready(bake_mode):
+				self.report({'ERROR_INVALID_INPUT'}, f"Mode '{bake_mode}' can't be baked. {settings.bake_error}")
+				return {'CANCELLED'}
+
+		cores = os.cpu_count() or 1
+		workers = self.workers or max(1, cores // 8)
+		threads = max(1, cores // workers)
+
+		wm = context.window_manager
+		wm.progress_begin(0, len(settings.sets))
+
+		def progress(done, total, report):
+			wm.progress_update(done)
+			print(f"Bake {done}/{total} {', '.join(report.get('sets', []))}: {report['status']} in {report.get('seconds', 0)}s")
+
+		try:
+			reports = bake_dispatch_service.bake_parallel(settings.sets, bake_modes, workers, threads, progress)
+		finally:
+			wm.progress_end()
+
+		if tt_settings().bake_autosave:
+			op_bake.save_images(self, [(entry['set'], entry['mode'], entry['image'])
+				for report in reports for entry in report.get('images', []) if entry.get('loaded')])
+
+		failed = [name for report in reports if report['status'] != 'FINISHED' for name in report.get('sets', [])]
+		elapsed = round(time.perf_counter() - start, 2)
+		if failed:
+			for report in reports:
+				if report['status'] != 'FINISHED':
+					print(f"Bake failed for {', '.join(report.get('sets', []))}:", *report.get('messages', []), sep='\n')
+			self.report({'WARNING'}, f"{len(failed)} of {len(settings.sets)} sets failed: {', '.join(failed)}. Baking finished in {elapsed}s.")
+		else:
+			self.report({'INFO'}, f"Baked {len(settings.sets)} sets with {workers} workers in {elapsed}s.")
+		return {'FINISHED'}
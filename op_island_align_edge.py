@@ -33,11 +33,12 @@ def main(self, context):
 		bm = bmesh.from_edit_mesh(obj.data)
 		uv_layers = bm.loops.layers.uv.verify()
 
-		if not any(utilities_uv.get_loop_edge_selection(l, uv_layers) for f in bm.faces for l in f.loops):
+		seed_faces = [f for f in bm.faces if f.select and any(utilities_uv.get_loop_edge_selection(l, uv_layers) for l in f.loops)]
+		if not seed_faces:
 			continue
 
 		counter += 1
-		for island in utilities_uv.get_selected_islands(bm, uv_layers, selected=False):
+		for island in utilities_uv.get_islands_from_seeds(bm, uv_layers, seed_faces):
 			luvs = (l for f in island for l in f.loops)
 			for l in luvs:
 				if utilities_uv.get_loop_edge_selection(l, uv_layers):
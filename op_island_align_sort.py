@@ -1,9 +1,9 @@
 import bpy
-import bmesh
+import numpy as np
 
-from mathutils import Vector
+from typing import NamedTuple
 from . import utilities_uv
-from .utilities_bbox import BBox
+from .services import island_tracker, orient_service, redo_cache, uv_array_service
 
 class op(bpy.types.Operator):
 	bl_idname = "uv.textools_island_align_sort"
@@ -26,58 +26,86 @@ class op(bpy.types.Operator):
 		return True
 
 	def execute(self, context):
-		general_bbox = BBox()
-		all_groups = []
-		update_obj = []
-		bmeshes = []  # bmesh objects must be saved, otherwise they will be deallocated
 		selected_objs = utilities_uv.selected_unique_objects_in_mode_with_uv()
 
 		if not selected_objs:
 			self.report({'ERROR_INVALID_INPUT'}, "No object with UV.")
 			return {'CANCELLED'}
 
+		sync = bpy.context.scene.tool_settings.use_uv_select_sync
+		records = []
 		for obj in selected_objs:
-			bm = bmesh.from_edit_mesh(obj.data)
-			uv_layer = bm.loops.layers.uv.verify()
-			islands = utilities_uv.get_selected_islands(bm, uv_layer, selected=False, extend_selection_to_islands=True)
-			if not islands:
-				continue
-			for i, island in enumerate(islands):
-				bbox_pre = BBox.calc_bbox_uv(island, uv_layer)
-				general_bbox.union(bbox_pre)
-				if self.align:
-					angle = utilities_uv.calc_min_align_angle(island, uv_layer)
-					utilities_uv.rotate_island(island, uv_layer, angle)
-
-				bbox = BBox.calc_bbox_uv(island, uv_layer) if self.align else bbox_pre
-				all_groups.append((island, bbox, uv_layer))
-			bmeshes.append(bm)
-			update_obj.append(obj)
-
-		if not all_groups:
-			return {'CANCELLED'}
+			uv_layer_name = obj.data.uv_layers.active.name
+			arrays = uv_array_service.read_loop_arrays(obj, uv_layer_name)
 
-		all_groups.sort(key=lambda x: x[1].max_lenght, reverse=True)
+			# Islands, their bounds and alignment angles don't change when only the sorting options do
+			state = redo_cache.mesh_state(obj, uv_layer_name, sync, arrays=arrays)
+			measured = redo_cache.fetch('align_sort', obj.name, state, lambda: measure_islands(obj, uv_layer_name, arrays, sync))
+			if measured is not None:
+				records.append((obj, uv_layer_name, arrays, measured))
 
-		# transform
-		if self.is_vertical:
-			margin_x = general_bbox.xmin
-			margin_y = general_bbox.ymin
+		if not records:
+			return {'CANCELLED'}
 
-			for island, bbox, uv_layer in all_groups:
-				delta = Vector((margin_x, margin_y)) - bbox.left_bottom
-				utilities_uv.translate_island(island, uv_layer, delta)
-				margin_y += self.padding + bbox.height
-		else:
-			margin_x = general_bbox.xmin
-			margin_y = general_bbox.ymin
+		bbox_pre = np.concatenate([measured.bbox_pre for *_, measured in records])
+		bbox = np.concatenate([measured.bbox_aligned if self.align else measured.bbox_pre for *_, measured in records])
+		size = bbox[:, 2:] - bbox[:, :2]
 
-			for island, bbox, uv_layer in all_groups:
-				delta = Vector((margin_x, margin_y)) - bbox.min
-				utilities_uv.translate_island(island, uv_layer, delta)
-				margin_x += self.padding + bbox.width
+		# Stack the islands from the largest one, starting at the lower left corner of all of them
+		axis = 1 if self.is_vertical else 0
+		order = np.argsort(-size.max(axis=1), kind='stable')
+		advance = np.zeros(len(bbox))
+		advance[order] = np.concatenate(([0.0], np.cumsum(size[order, axis] + self.padding)[:-1]))
+		delta = bbox_pre[:, :2].min(axis=0) - bbox[:, :2]
+		delta[:, axis] += advance
 
-		for obj in update_obj:
-			bmesh.update_edit_mesh(obj.data)
+		first = 0
+		for obj, uv_layer_name, arrays, measured in records:
+			n_islands = len(measured.angles)
+			group = np.repeat(np.arange(n_islands), np.diff(measured.offsets))
+			uv = arrays.uv[measured.order]
+			if self.align:
+				uv = orient_service.rotate_groups(uv, group, measured.angles)
+			arrays.uv[measured.order] = uv + delta[first:first + n_islands][group]
+			uv_array_service.commit_uvs(obj, arrays, measured.order, uv_layer_name)
+			first += n_islands
 
 		return {'FINISHED'}
+
+
+class Measured(NamedTuple):
+	order: np.ndarray  # loops sorted by island
+	offsets: np.ndarray  # island i is order[offsets[i]:offsets[i + 1]]
+	bbox_pre: np.ndarray  # (xmin, ymin, xmax, ymax) of every island
+	angles: np.ndarray  # minimal bounds angle of every island
+	bbox_aligned: np.ndarray  # bounds once rotated by that angle
+
+
+def measure_islands(obj, uv_layer_name, arrays, sync):
+	"""Loops, bounds, minimal bounds angle and bounds once rotated by that angle of every island"""
+	visible = ~arrays.face_hide if sync else arrays.face_select & ~arrays.face_hide
+	if not visible.any():
+		return None
+	labels = island_tracker.island_labels(obj, uv_layer_name, arrays, visible)
+
+	# Only the islands with a selected face, like utilities_uv.get_selected_islands with extend_selection_to_islands
+	selected = np.zeros(labels.max() + 1, dtype=bool)
+	selected[labels[visible & arrays.face_select]] = True
+	compact = np.cumsum(selected) - 1
+	labels = np.where((labels >= 0) & selected[labels], compact[labels], -1)
+
+	order, offsets = uv_array_service.group_loops(labels[arrays.face])
+	if not len(order):
+		return None
+
+	n_islands = len(offsets) - 1
+	group = np.repeat(np.arange(n_islands), np.diff(offsets))
+	uv = arrays.uv[order]
+	angles = orient_service.min_box_angles(uv, group, n_islands)
+	angles[np.abs(angles) < 1e-05] = 0.0
+	rotated = orient_service.rotate_groups(uv, group, angles)
+	return Measured(order, offsets, _bounds(uv, offsets), angles, _bounds(rotated, offsets))
+
+
+def _bounds(uv, offsets):
+	return np.hstack((np.minimum.reduceat(uv, offsets[:-1], axis=0), np.maximum.reduceat(uv, offsets[:-1], axis=0)))
@@ -2,8 +2,10 @@ import bpy
 import bmesh
 import numpy as np
 
-from mathutils import Vector
 from . import utilities_uv
+from .services import island_tracker
+from .services import redo_cache
+from .services import uv_array_service
 
 
 precision = 5
@@ -51,77 +53,46 @@ def main(self, context):
 	uv_layers = bm.loops.layers.uv.verify()
 	sync = bpy.context.scene.tool_settings.use_uv_select_sync
 
-	if sync:
-		selected_faces = {f for f in bm.faces if f.select}
-	else:
-		selected_faces = {f for f in bm.faces if all([utilities_uv.get_loop_selection(loop, uv_layers) for loop in f.loops]) and f.select}
-	if not selected_faces:
-		return
+	arrays = uv_array_service.read_loop_arrays(obj, uv_layers.name)
 
-	if self.bool_face:
-		islands = [[f] for f in selected_faces]
-	else:
-		islands = utilities_uv.get_selected_islands(bm, uv_layers, extend_selection_to_islands=True)
-
-	for faces in islands:
-		faces_set = set(faces)
-
-		if self.bool_face:
-			calc_loops = faces[0].loops
-			avg_normal = faces[0].normal
-
-		else:
-			selected_faces_in_island = faces.intersection(selected_faces)
-
-			if selected_faces_in_island:
-				pre_calc_faces = selected_faces_in_island
-			else:
-				pre_calc_faces = faces
-
-			if len(pre_calc_faces) == 1:
-				selected_face = next(iter(pre_calc_faces))
-				calc_loops = selected_face.loops
-				avg_normal = selected_face.normal
-			else:
-				calc_loops = []
-				calc_edges = set()
-				island_edges = {edge for face in pre_calc_faces for edge in face.edges}
-				island_loops = {loop for face in pre_calc_faces for loop in face.loops}
-				for edge in island_edges:
-					if len({loop[uv_layers].uv.to_tuple(precision) for vert in edge.verts for loop in vert.link_loops if loop in island_loops}) == 2:
-						calc_edges.add(edge)
-						for loop in edge.link_loops:
-							if loop in island_loops:
-								calc_loops.append(loop)
-								break
-				if not calc_loops:
-					self.report({'ERROR_INVALID_INPUT'}, "Invalid selection in an island: zero non-splitted edges." )
-					continue
-
-				# Get average viewport normal of UV island
-				avg_normal = Vector((0,0,0))
-				calc_faces = [face for face in pre_calc_faces if {edge for edge in face.edges}.issubset(calc_edges)]
-				if not calc_faces:
-					self.report({'ERROR_INVALID_INPUT'}, "Invalid selection in an island: no faces formed by unique edges." )
-					continue
-				for face in calc_faces:
-					avg_normal += face.normal
-				avg_normal /= len(calc_faces)
-
-		# Which Side
-		x = 0
-		y = 1
-		z = 2
-		max_size = max(map(abs, avg_normal))
-
-		if (self.axis == '-1' and abs(avg_normal.z) == max_size) or self.axis == '2':
-			align_island(self, me, bm, uv_layers, faces, calc_loops, x, y, False, avg_normal.z < 0)
-		elif (self.axis == '-1' and abs(avg_normal.y) == max_size) or self.axis == '1':
-			align_island(self, me, bm, uv_layers, faces, calc_loops, x, z, avg_normal.y > 0, False)
-		else:	#(self.axis == '-1' and abs(avg_normal.x) == max_size) or self.axis == '0':
-			align_island(self, me, bm, uv_layers, faces, calc_loops, y, z, avg_normal.x < 0, False)
-
-	bmesh.update_edit_mesh(obj.data)
+	# The groups and their measured edges only depend on the mesh state, a redo with another Axis reuses them
+	state = redo_cache.mesh_state(obj, uv_layers.name, sync, self.bool_face, arrays=arrays)
+	analysis = redo_cache.fetch('align_world', obj.name, state, lambda: analyse_groups(self, obj, uv_layers.name, arrays, sync))
+	if analysis is None:
+		return
+	groups, n_groups, calc_loops, calc_groups, avg_normal, has_edges, has_faces = analysis
+
+	if (~has_edges).any():
+		self.report({'ERROR_INVALID_INPUT'}, "Invalid selection in an island: zero non-splitted edges." )
+	if (has_edges & ~has_faces).any():
+		self.report({'ERROR_INVALID_INPUT'}, "Invalid selection in an island: no faces formed by unique edges." )
+	valid = has_edges & has_faces
+
+	co = np.empty(len(me.vertices) * 3)
+	me.vertices.foreach_get('co', co)
+	co = co.reshape(-1, 3)
+
+	# Which Side
+	x = 0
+	y = 1
+	z = 2
+	max_size = np.abs(avg_normal).max(axis=1)
+	side_z = (self.axis == '-1') & (np.abs(avg_normal[:, z]) == max_size) | (self.axis == '2')
+	side_y = ~side_z & ((self.axis == '-1') & (np.abs(avg_normal[:, y]) == max_size) | (self.axis == '1'))
+	side_x = ~side_z & ~side_y
+
+	axis_u = np.where(side_x, y, x)
+	axis_v = np.where(side_z, y, z)
+	flip_u = (side_y & (avg_normal[:, y] > 0)) | (side_x & (avg_normal[:, x] < 0))
+	flip_v = side_z & (avg_normal[:, z] < 0)
+
+	angles = align_angles(arrays, co, calc_loops, calc_groups, n_groups, axis_u, axis_v, flip_u, flip_v)
+	angles = np.where(valid, angles, 0.0)
+	rotate_groups(arrays, groups, angles)
+
+	changed = groups[arrays.face] >= 0
+	changed[changed] = angles[groups[arrays.face[changed]]] != 0
+	uv_array_service.commit_uvs(obj, arrays, np.flatnonzero(changed), uv_layers.name)
 
 	# Workaround for selection not flushing properly from loops to EDGE Selection Mode, apparently since UV edge selection support was added to the UV space
 	if not sync:
@@ -130,61 +101,130 @@ def main(self, context):
 
 
 
-def align_island(self, me, bm, uv_layers, faces, loops, x=0, y=1, flip_x=False, flip_y=False):
-	n_edges = 0
-	avg_angle = 0
-
-	for loop in loops:
-		co0 = loop.vert.co
-		co1 = loop.link_loop_next.vert.co
-		delta = co1- co0
-		max_side = max(map(abs, delta))
-
-		# Check edges dominant in active axis
-		if abs(delta[x]) == max_side or abs(delta[y]) == max_side:
-			n_edges += 1
-			uv0 = loop[uv_layers].uv
-			uv1 = loop.link_loop_next[uv_layers].uv
-
-			delta_verts = Vector((0,0))
-			if not flip_x:
-				delta_verts.x = co1[x] - co0[x]
-			else:
-				delta_verts.x = co0[x] - co1[x]
-			if not flip_y:
-				delta_verts.y = co1[y] - co0[y]
-			else:
-				delta_verts.y = co0[y] - co1[y]
-			
-			delta_uvs = uv1 - uv0
-
-			a0 = np.arctan2(delta_verts.y, delta_verts.x)
-			a1 = np.arctan2(delta_uvs.y, delta_uvs.x)
-
-			a_delta = np.arctan2(np.sin(a0-a1), np.cos(a0-a1))
-
-			# Consolidation (np.arctan2 gives the lower angle between -Pi and Pi, this triggers errors when using the average avg_angle /= n_edges for rotation angles close to Pi)
-			if n_edges > 1:
-				if abs( (avg_angle / (n_edges-1)) - a_delta ) > 3.12:
-					if a_delta > 0:
-						avg_angle += (a_delta - np.pi*2)
-					else:
-						avg_angle += (a_delta + np.pi*2)
-				else:
-					avg_angle += a_delta
-			else:
-				avg_angle += a_delta
-
-	avg_angle /= n_edges
-
-	if avg_angle:
-		matrix = np.array([[np.cos(avg_angle), -np.sin(avg_angle)], [np.sin(avg_angle), np.cos(avg_angle)]])
-		vec_origin = utilities_uv.get_center(faces, bm, uv_layers)
-
-		for face in faces:
-			for loop in face.loops:
-				uvs0 = loop[uv_layers].uv - vec_origin
-				loop[uv_layers].uv = (vec_origin.x + matrix[0][0]*uvs0.x + matrix[0][1]*uvs0.y, vec_origin.y + matrix[1][0]*uvs0.x + matrix[1][1]*uvs0.y)
-
-		if self.bool_face:
-			bmesh.update_edit_mesh(me, loop_triangles=False)
+def analyse_groups(self, obj, uv_layer_name, arrays, sync):
+	"""Groups to align and the edges and average normal measured for each, None without selected faces"""
+	visible = arrays.face_select & ~arrays.face_hide
+	if sync:
+		selected_faces = visible
+	else:
+		selected_faces = visible & np.logical_and.reduceat(arrays.uv_select, arrays.face_start) if len(arrays.face_start) else visible
+	if not selected_faces.any():
+		return None
+
+	# One group per face, or per island of the visible faces
+	if self.bool_face:
+		groups = np.where(selected_faces, np.cumsum(selected_faces) - 1, -1)
+	else:
+		groups = island_tracker.island_labels(obj, uv_layer_name, arrays, visible)
+	n_groups = groups.max() + 1
+
+	normals = np.empty(len(obj.data.polygons) * 3)
+	obj.data.polygons.foreach_get('normal', normals)
+	normals = normals.reshape(-1, 3)
+
+	return (groups, n_groups) + calc_island_edges(arrays, groups, n_groups, selected_faces, normals)
+
+
+
+def calc_island_edges(arrays, groups, n_groups, selected_faces, normals):
+	"""Edges and average normal used to align each group, for all groups at once"""
+	face_group = groups
+	has_selected = np.zeros(n_groups, dtype=bool)
+	has_selected[face_group[selected_faces & (face_group >= 0)]] = True
+
+	# Use the selected faces of an island, or the whole island if none is selected
+	pre_calc = (face_group >= 0) & (selected_faces | ~has_selected[np.maximum(face_group, 0)])
+	pre_calc_count = np.bincount(face_group[pre_calc], minlength=n_groups)
+
+	loops = np.flatnonzero(pre_calc[arrays.face])
+	loop_group = face_group[arrays.face[loops]]
+
+	# Vertices with a single UV in the group
+	keys = uv_array_service.quantize(arrays.uv[loops], 10 ** -precision)
+	corner_keys = np.column_stack((loop_group, arrays.vert[loops], keys))
+	unique_corners = np.unique(corner_keys, axis=0)
+	vert_keys, uv_count = np.unique(unique_corners[:, :2], axis=0, return_counts=True)
+	split_keys = vert_keys[uv_count > 1]
+
+	def is_split(verts):
+		query = np.column_stack((loop_group, verts))
+		if not len(split_keys):
+			return np.zeros(len(verts), dtype=bool)
+		index = np.unique(np.concatenate((split_keys, query)), axis=0, return_inverse=True)[1].ravel()
+		split = np.zeros(index.max() + 1, dtype=bool)
+		split[index[:len(split_keys)]] = True
+		return split[index[len(split_keys):]]
+
+	next_loops = arrays.next[loops]
+	next_keys = uv_array_service.quantize(arrays.uv[next_loops], 10 ** -precision)
+	loop_valid = ~is_split(arrays.vert[loops]) & ~is_split(arrays.vert[next_loops]) & (keys != next_keys).any(axis=1)
+
+	# One loop per valid edge of each group
+	edge_keys = np.column_stack((loop_group, arrays.edge[loops]))
+	_, first = np.unique(edge_keys[loop_valid], axis=0, return_index=True)
+	calc_loops = loops[loop_valid][first]
+
+	# Single faces use all their loops and their own normal
+	single = pre_calc_count[loop_group] == 1
+	calc_loops = np.union1d(calc_loops, loops[single])
+	calc_groups = face_group[arrays.face[calc_loops]]
+
+	# Get average viewport normal of UV island, from the faces formed by valid edges only
+	valid_per_loop = np.zeros(len(arrays.vert), dtype=bool)
+	valid_per_loop[loops] = loop_valid | single
+	face_valid = pre_calc & np.logical_and.reduceat(valid_per_loop, arrays.face_start)
+	faces = np.flatnonzero(face_valid)
+	count = np.bincount(face_group[faces], minlength=n_groups)
+	avg_normal = np.zeros((n_groups, 3))
+	for i in range(3):
+		avg_normal[:, i] = np.bincount(face_group[faces], weights=normals[faces, i], minlength=n_groups)
+	avg_normal /= np.maximum(count, 1)[:, None]
+
+	has_edges = np.bincount(calc_groups, minlength=n_groups) > 0
+	return calc_loops, calc_groups, avg_normal, has_edges, count > 0
+
+
+
+def align_angles(arrays, co, loops, loop_group, n_groups, axis_u, axis_v, flip_u, flip_v):
+	"""Rotation of every group, as the mean angle between the 3D edges dominant in the group's plane and their UV edges"""
+	delta = co[arrays.vert[arrays.next[loops]]] - co[arrays.vert[loops]]
+	rows = np.arange(len(loops))
+	delta_u = delta[rows, axis_u[loop_group]]
+	delta_v = delta[rows, axis_v[loop_group]]
+	max_side = np.abs(delta).max(axis=1)
+
+	# Check edges dominant in active axis
+	dominant = (np.abs(delta_u) == max_side) | (np.abs(delta_v) == max_side)
+	delta_u = np.where(flip_u[loop_group], -delta_u, delta_u)[dominant]
+	delta_v = np.where(flip_v[loop_group], -delta_v, delta_v)[dominant]
+	loop_group = loop_group[dominant]
+	delta_uvs = arrays.uv[arrays.next[loops[dominant]]] - arrays.uv[loops[dominant]]
+
+	a_delta = np.arctan2(delta_v, delta_u) - np.arctan2(delta_uvs[:, 1], delta_uvs[:, 0])
+	a_delta = np.arctan2(np.sin(a_delta), np.cos(a_delta))
+
+	# Unwrap the angles around their circular mean before averaging, so angles close to Pi don't cancel out
+	n_edges = np.bincount(loop_group, minlength=n_groups)
+	reference = np.arctan2(
+		np.bincount(loop_group, weights=np.sin(a_delta), minlength=n_groups),
+		np.bincount(loop_group, weights=np.cos(a_delta), minlength=n_groups))
+	offset = a_delta - reference[loop_group]
+	unwrapped = reference[loop_group] + np.arctan2(np.sin(offset), np.cos(offset))
+	total = np.bincount(loop_group, weights=unwrapped, minlength=n_groups)
+	return np.divide(total, n_edges, out=np.zeros(n_groups), where=n_edges > 0)
+
+
+
+def rotate_groups(arrays, groups, angles):
+	"""Rotate every group of faces around its UV center, in one batch"""
+	loops = np.flatnonzero(groups[arrays.face] >= 0)
+	loop_group = groups[arrays.face[loops]]
+	n_groups = len(angles)
+	count = np.maximum(np.bincount(loop_group, minlength=n_groups), 1)
+	center = np.column_stack([np.bincount(loop_group, weights=arrays.uv[loops, i], minlength=n_groups) for i in (0, 1)]) / count[:, None]
+
+	cos = np.cos(angles)[loop_group]
+	sin = np.sin(angles)[loop_group]
+	local = arrays.uv[loops] - center[loop_group]
+	arrays.uv[loops, 0] = center[loop_group, 0] + cos * local[:, 0] - sin * local[:, 1]
+	arrays.uv[loops, 1] = center[loop_group, 1] + sin * local[:, 0] + cos * local[:, 1]
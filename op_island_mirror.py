@@ -1,5 +1,8 @@
 import bpy
 
+from . import utilities_uv
+from .services import uv_transform_service
+
 
 
 class op(bpy.types.Operator):
@@ -12,8 +15,6 @@ class op(bpy.types.Operator):
 
 	@classmethod
 	def poll(cls, context):
-		if bpy.context.area.ui_type != 'UV':
-			return False
 		if not bpy.context.active_object:
 			return False
 		if bpy.context.active_object.type != 'MESH':
@@ -26,11 +27,8 @@ class op(bpy.types.Operator):
 
 
 	def execute(self, context):
-		#bpy.ops.uv.select_linked()
-		is_vertical = self.is_vertical
-		if is_vertical:
-			bpy.ops.transform.mirror(orient_type='GLOBAL', orient_matrix=((1, 0, 0), (0, 1, 0), (0, 0, 1)), orient_matrix_type='GLOBAL', constraint_axis=(False, True, False))
-		else:
-			bpy.ops.transform.mirror(orient_type='GLOBAL', orient_matrix=((1, 0, 0), (0, 1, 0), (0, 0, 1)), orient_matrix_type='GLOBAL', constraint_axis=(True, False, False))
-
+		sync = bpy.context.scene.tool_settings.use_uv_select_sync
+		pivot, cursor = uv_transform_service.editor_pivot(context.space_data)
+		axis = 1 if self.is_vertical else 0
+		uv_transform_service.mirror(utilities_uv.selected_unique_objects_in_mode_with_uv(), sync, axis, pivot, cursor)
 		return {'FINISHED'}
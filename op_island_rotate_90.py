@@ -1,6 +1,7 @@
 import bpy
 
-from . import settings
+from . import utilities_uv
+from .services import uv_transform_service
 
 
 
@@ -14,8 +15,6 @@ class op(bpy.types.Operator):
 
 	@classmethod
 	def poll(cls, context):
-		if bpy.context.area.ui_type != 'UV':
-			return False
 		if not bpy.context.active_object:
 			return False
 		if bpy.context.active_object.type != 'MESH':
@@ -29,16 +28,7 @@ class op(bpy.types.Operator):
 
 	def execute(self, context):
 		sync = bpy.context.scene.tool_settings.use_uv_select_sync
-		if sync:
-			selection_mode = tuple(bpy.context.scene.tool_settings.mesh_select_mode)
-			bpy.ops.mesh.select_mode(use_extend=False, use_expand=False, type='FACE')
-
-		angle = - self.angle
-		if settings.bversion == 2.83 or settings.bversion == 2.91:
-			angle = -angle
-		bpy.ops.transform.rotate(value=-angle, orient_axis='Z', constraint_axis=(False, False, False), use_proportional_edit=False)
-
-		if sync:
-			bpy.context.scene.tool_settings.mesh_select_mode = selection_mode
-
+		pivot, cursor = uv_transform_service.editor_pivot(context.space_data)
+		# Positive angles turn clockwise, like the UV editor rotate tool
+		uv_transform_service.rotate(utilities_uv.selected_unique_objects_in_mode_with_uv(), sync, -self.angle, pivot, cursor)
 		return {'FINISHED'}
@@ -32,13 +32,13 @@ class op(bpy.types.Operator):
 
         if selected_faces:
             # Use Rectify logic
-            success = align_uv_rectify(obj, bm, uv_layer_name, keep_bounds=True)
+            success = align_uv_rectify(obj, uv_layer_name, keep_bounds=True)
             if not success:
                 self.report({"WARNING"}, "Rectify failed. Select connected Quad faces.")
                 return {"CANCELLED"}
         else:
             # Use Straight logic
-            success = align_uv_straight_edge(bm, uv_layer_name)
+            success = align_uv_straight_edge(obj, uv_layer_name)
             if not success:
                 self.report({"WARNING"}, "Straighten failed. Select UV edges.")
                 return {"CANCELLED"}
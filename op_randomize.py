@@ -1,12 +1,13 @@
 import math
-import random
+import zlib
 import bpy
 import bmesh
-import bl_math
+import numpy as np
 
 from . import utilities_uv
-from .utilities_bbox import BBox
-from mathutils import Vector
+from .services import island_tracker
+from .services import redo_cache
+from .services import uv_array_service as uas
 
 
 class op(bpy.types.Operator):
@@ -76,111 +77,104 @@ class op(bpy.types.Operator):
 
 def main(self, context, udim_tile=1001, column=0, row=0):
 	counter = 0
+	sync = bpy.context.scene.tool_settings.use_uv_select_sync
 	selected_obj = utilities_uv.selected_unique_objects_in_mode_with_uv()
-	for e1, obj in enumerate(selected_obj, start=100):
+	for obj in selected_obj:
 		me = obj.data
 		bm = bmesh.from_edit_mesh(me)
 		uv_layers = bm.loops.layers.uv.verify()
-		sync = bpy.context.scene.tool_settings.use_uv_select_sync
+		arrays = uas.read_loop_arrays(obj, uv_layers.name)
 
-		if self.bool_face:
-			if sync:
-				group = {f for f in bm.faces if f.select}
-			else:
-				group = utilities_uv.get_selected_uv_faces(bm, uv_layers)
-		else:
-			group = utilities_uv.get_selected_islands(bm, uv_layers)
+		# Redo re-runs the operator on the same mesh state, so the grouping is only detected once
+		state = redo_cache.mesh_state(obj, uv_layers.name, sync, self.bool_face, arrays=arrays)
+		order, offsets = redo_cache.fetch(
+			'randomize', obj.name, state, lambda: uas.group_loops(group_labels(obj, uv_layers.name, arrays, sync, self.bool_face)[arrays.face]))
 
-		if not group:
+		n_groups = len(offsets) - 1
+		if not n_groups:
 			continue
 
 		counter += 1
-		for e2, f in enumerate(group, start=100):
-			seed = e1*e2+self.rand_seed+id(obj)
-			random.seed(seed)
-			rand_rotation = random.uniform(-self.rotation, self.rotation)
-			random.seed(seed+2)
-			rand_scale = random.uniform(self.min_scale, self.max_scale)
-
-			f = (f,) if self.bool_face else f
-
-			if self.bool_bounds or self.rotation or self.scale_factor != 0:
-				bb = BBox.calc_bbox_uv(f, uv_layers)
-				if not bb.is_valid:
-					self.report({'WARNING'}, f"The {obj.name} object have UV-Island with zero area")
-					continue
-
-				vec_origin = bb.center
-
-				if self.rotation:
-					angle = rand_rotation
-					if self.rotation_steps:
-						angle = round_threshold(angle, self.rotation_steps)
-						# clamp angle in self.rotation
-						if angle > self.rotation:
-							angle -= self.rotation_steps
-						elif angle < -self.rotation:
-							angle += self.rotation_steps
-					if utilities_uv.rotate_island(f, uv_layers, angle, vec_origin):
-						bb.rotate_expand(angle)
-
-				scale = bl_math.lerp(1.0, rand_scale, self.scale_factor)
-
-				new_scale = 1
-				# Reset the scale to fit in the tile
-				if self.bool_bounds and self.bool_bounds_scaling:
-					max_length = bb.max_lenght
-					if max_length * scale > 1:
-						new_scale = 1 / max_length
-
-				if self.scale_factor != 0 or (self.bool_bounds_scaling and new_scale < 1):
-					# If the scale from random is smaller, we choose it
-					scale = min(scale, new_scale)
-					scale = Vector((scale, scale))
-					utilities_uv.scale_island(f, uv_layers, scale, pivot=vec_origin)
-					bb.scale(scale)
-
-				if self.bool_bounds:
-					to_center_delta = Vector((0.5, 0.5)) - vec_origin
-					utilities_uv.translate_island(f, uv_layers, delta=to_center_delta)
-					bb.translate(to_center_delta)
+		# Seeded from names instead of id(obj), the same seed gives the same result in every session
+		rng = np.random.default_rng([zlib.crc32(f"{obj.name}\0{me.name}".encode()), self.rand_seed % 2**32])
+		rand_rotation = rng.uniform(-self.rotation, self.rotation, n_groups)
+		rand_scale = rng.uniform(self.min_scale, self.max_scale, n_groups)
+		rand_move = rng.uniform(-1.0, 1.0, (n_groups, 2))
+
+		group = np.repeat(np.arange(n_groups), np.diff(offsets))
+		uv = arrays.uv[order]
+		bb_min = np.minimum.reduceat(uv, offsets[:-1], axis=0)
+		bb_max = np.maximum.reduceat(uv, offsets[:-1], axis=0)
+		valid = np.ones(n_groups, dtype=bool)
+
+		if self.bool_bounds or self.rotation or self.scale_factor != 0:
+			valid = (bb_min < bb_max).all(axis=1)
+			if not valid.all():
+				self.report({'WARNING'}, f"The {obj.name} object have UV-Island with zero area")
+
+			center = (bb_min + bb_max) / 2
+			half = (bb_max - bb_min) / 2
+			uv -= center[group]
+
+			if self.rotation:
+				angle = rand_rotation
+				if self.rotation_steps:
+					angle = round_threshold(angle, self.rotation_steps)
+					# clamp angle in self.rotation
+					angle[angle > self.rotation] -= self.rotation_steps
+					angle[angle < -self.rotation] += self.rotation_steps
+				angle[np.abs(angle) < 1e-05] = 0.0
+
+				# Same rotation as utilities_uv.rotate_island, the bounds expand like BBox.rotate_expand
+				cos, sin = np.abs(np.cos(angle)), np.abs(np.sin(angle))
+				c, s = np.cos(angle)[group], np.sin(angle)[group]
+				uv[:] = np.column_stack((c * uv[:, 0] + s * uv[:, 1], c * uv[:, 1] - s * uv[:, 0]))
+				half = np.column_stack((cos * half[:, 0] + sin * half[:, 1], sin * half[:, 0] + cos * half[:, 1]))
+
+			scale = 1.0 + (rand_scale - 1.0) * self.scale_factor
+
+			new_scale = np.ones(n_groups)
+			# Reset the scale to fit in the tile
+			if self.bool_bounds and self.bool_bounds_scaling:
+				max_length = 2 * half.max(axis=1)
+				too_big = max_length * scale > 1
+				new_scale[too_big] = 1 / max_length[too_big]
+
+			# If the scale from random is smaller, we choose it
+			rescale = (self.scale_factor != 0) | (new_scale < 1)
+			scale = np.where(rescale, np.minimum(scale, new_scale), 1.0)
+			uv *= scale[group, None]
+			half *= scale[:, None]
 
 			if self.bool_bounds:
-				move = Vector((
-					max(bb.xmin, 0) * max(min(self.strength.x, 1), -1),
-					max(bb.ymin, 0) * max(min(self.strength.y, 1), -1)
-				))
-			else:
-				move = Vector((self.strength.x, self.strength.y))
-
-			if not (move.x or move.y):
-				continue
-
-			random.seed(seed+3)
-			rand_move_x = 2*(random.random()-0.5)
-			random.seed(seed+4)
-			rand_move_y = 2*(random.random()-0.5)
-
-			randmove = Vector((rand_move_x, rand_move_y)) * move
-
-			if self.round_mode == 'INT':
-				randmove = Vector([round(i) for i in randmove])
-			elif self.round_mode == 'STEPS':
-				# TODO bool_bounds for steps
-				if self.steps.x > 1e-05:
-					randmove.x = round_threshold(randmove.x, self.steps.x)
-				if self.steps.y > 1e-05:
-					randmove.y = round_threshold(randmove.y, self.steps.y)
-
-				# if self.bool_bounds:
-				# 	pass
+				center[:] = 0.5
+			uv += center[group]
+			bb_min = center - half
 
-			if (not self.bool_bounds) or udim_tile == 1001:
-				utilities_uv.translate_island(f, uv_layers, randmove)
-			else:
-				utilities_uv.translate_island(f, uv_layers, delta=randmove + Vector((column, row)))
-
-		bmesh.update_edit_mesh(me, loop_triangles=False, destructive=False)
+		if self.bool_bounds:
+			move = np.maximum(bb_min, 0) * np.clip(np.array(self.strength), -1, 1)
+		else:
+			move = np.broadcast_to(np.array(self.strength), (n_groups, 2))
+
+		randmove = rand_move * move
+		if self.round_mode == 'INT':
+			randmove = np.round(randmove)
+		elif self.round_mode == 'STEPS':
+			# TODO bool_bounds for steps
+			for axis in (0, 1):
+				if self.steps[axis] > 1e-05:
+					randmove[:, axis] = round_threshold(randmove[:, axis], self.steps[axis])
+
+		if self.bool_bounds and udim_tile != 1001:
+			randmove += (column, row)
+		# Groups without move strength stay where they are, UDIM offset included
+		randmove[~move.any(axis=1)] = 0
+		uv += randmove[group]
+
+		keep = valid[group]
+		loops = order[keep]
+		arrays.uv[loops] = uv[keep]
+		uas.commit_uvs(obj, arrays, loops, uv_layers.name)
 
 	if counter:
 		return {'FINISHED'}
@@ -189,5 +183,18 @@ def main(self, context, udim_tile=1001, column=0, row=0):
 	return {'CANCELLED'}
 
 
+def group_labels(obj, uv_layer_name, arrays, sync, per_face):
+	"""Group index of every face: selected UV faces one by one, or whole selected islands."""
+	face_mask = arrays.face_select & ~arrays.face_hide
+	if per_face:
+		if not sync and len(face_mask):
+			# Faces with all their loops UV selected
+			face_mask &= np.logical_and.reduceat(arrays.uv_select, arrays.face_start)
+		labels = np.full(len(face_mask), -1, dtype=np.int64)
+		labels[face_mask] = np.arange(np.count_nonzero(face_mask))
+		return labels
+	return island_tracker.island_labels(obj, uv_layer_name, arrays, face_mask)
+
+
 def round_threshold(a, min_clip):
-	return round(float(a) / min_clip) * min_clip
+	return np.round(np.asarray(a, dtype=np.float64) / min_clip) * min_clip
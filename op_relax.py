@@ -3,9 +3,9 @@ import bmesh
 
 from mathutils import Vector
 from itertools import chain
-from collections import defaultdict
 from . import op_meshtex_create
 from . import utilities_uv
+from .services import redo_cache
 
 
 
@@ -40,14 +40,46 @@ class op(bpy.types.Operator):
 
 
 def relax(self, context):
+	obj = bpy.context.active_object
+	obj_name = obj.name
+	bm = bmesh.from_edit_mesh(obj.data)
+	uv_layers = bm.loops.layers.uv.verify()
+
+	# Smoothing only depends on the mesh state and the iterations, a redo with another Area Preservation reuses it
+	state = redo_cache.mesh_state(obj, uv_layers.name, self.iterations)
+	smoothed = redo_cache.fetch('relax', obj_name, state, lambda: smooth_islands(self, context, obj))
+	if smoothed is None:
+		return
+	face_uvs, islands = smoothed
+
+	bm = bmesh.from_edit_mesh(bpy.data.objects[obj_name].data)
+	bm.faces.ensure_lookup_table()
+	uv_layers = bm.loops.layers.uv.verify()
+
+	for face_indices, edge_length, edge_uv_length, pre_center in islands:
+		scale = 1
+		if self.area_preservation > 0 and edge_length > 0 and edge_uv_length > 0:
+			scale = 1 + (edge_uv_length / edge_length - 1)*self.area_preservation
+
+		for face_index in face_indices:
+			for loop, uv in zip(bm.faces[face_index].loops, face_uvs[face_index]):
+				if utilities_uv.get_loop_selection(loop, uv_layers):
+					if scale != 1:
+						loop[uv_layers].uv = pre_center + (Vector(uv) - pre_center)*scale
+					else:
+						loop[uv_layers].uv = uv
+
+
+
+def smooth_islands(self, context, obj):
+	"""Smoothed UVs of the faces of the selected islands by face index, and the lengths and center of every island before smoothing"""
 	# UV to temporary mesh
 	pre_selection_mode = tuple(bpy.context.scene.tool_settings.mesh_select_mode)
-	obj = bpy.context.active_object
-	obj_name = bpy.context.active_object.name
+	obj_name = obj.name
 
 	bm, uv_layers, faces_by_island = op_meshtex_create.create_uv_mesh(self, context, obj, sk_create=False, bool_scale=False, delete_unselected=False, restore_selected=True)
 	if bm == {'CANCELLED'}:
-		return
+		return None
 
 	temp_obj = bpy.context.active_object
 	temp_obj_data_name = temp_obj.data.name
@@ -60,63 +92,34 @@ def relax(self, context):
 	bpy.ops.mesh.vertices_smooth(factor=0.5, repeat=self.iterations)
 
 
-	# Mesh to UV
+	# Mesh to UV, keeping the measures of the UV edges before smoothing to preserve the island areas
+	face_uvs = {}
+	islands = []
 	for faces in faces_by_island:
-		if self.area_preservation > 0:
-			edge_length = 0
-			edge_uv_length = 0
-			pre_center = Vector((0.0, 0.0))
-			n_loops = 0
+		edge_length = 0
+		edge_uv_length = 0
+		pre_center = Vector((0.0, 0.0))
+		n_loops = 0
 
 		for face in faces:
-			face.select = True
 			for loop in face.loops:
-				if self.area_preservation > 0:
-					edge_length += (loop.link_loop_next.vert.co - loop.vert.co).length
-					edge_uv_length += (loop.link_loop_next[uv_layers].uv - loop[uv_layers].uv).length
-					pre_center += loop[uv_layers].uv
-					n_loops += 1
-				# Move UVs making sure future UV edges measures will be real
-				if loop != face.loops[0]:
-					if loop != face.loops[-1]:
-						loop[uv_layers].uv = (loop.vert.co.x, loop.vert.co.y)
-					else:
-						loop[uv_layers].uv = (loop.vert.co.x, loop.vert.co.y)
-						face.loops[0][uv_layers].uv = (face.loops[0].vert.co.x, face.loops[0].vert.co.y)
+				edge_length += (loop.link_loop_next.vert.co - loop.vert.co).length
+				edge_uv_length += (loop.link_loop_next[uv_layers].uv - loop[uv_layers].uv).length
+				pre_center += loop[uv_layers].uv
+				n_loops += 1
+			face_uvs[face.index] = [(loop.vert.co.x, loop.vert.co.y) for loop in face.loops]
 
-		scale = 1
-		if self.area_preservation > 0 and edge_length > 0 and edge_uv_length > 0:
+		if n_loops:
 			pre_center /= n_loops
-			scale = 1 + (edge_uv_length / edge_length - 1)*self.area_preservation
-
-		if scale != 1:
-			for face in faces:
-				for loop in face.loops:
-					loop[uv_layers].uv = pre_center + (loop[uv_layers].uv - pre_center)*scale
-
-
-	# Copy and Paste UVs between temporary and original meshes
-	copied_uvs = defaultdict(list)
-	for face in bm.faces:
-		if face.select:
-			for loop in face.loops:
-				copied_uvs[face.index].append(loop[uv_layers].uv.to_tuple())
+		islands.append(([face.index for face in faces], edge_length, edge_uv_length, pre_center))
 
 	bpy.ops.object.mode_set(mode='OBJECT', toggle=False)
 	bpy.ops.object.select_all(action='DESELECT')
 	bpy.context.view_layer.objects.active = bpy.data.objects[obj_name]
 	bpy.ops.object.mode_set(mode='EDIT', toggle=False)
 
-	bm = bmesh.from_edit_mesh(bpy.context.active_object.data)
-	bm.faces.ensure_lookup_table()
-	bm.verts.ensure_lookup_table()
-	uv_layers = bm.loops.layers.uv.verify()
-
-	for face_index in copied_uvs:
-		for i, loop in enumerate(bm.faces[face_index].loops):
-			if utilities_uv.get_loop_selection(loop, uv_layers):
-				loop[uv_layers].uv = copied_uvs[face_index][i]
-
 	# Remove temporary mesh and restore selection mode altered by meshtex_create
 	bpy.data.meshes.remove(bpy.data.meshes[temp_obj_data_name], do_unlink=True)
 	bpy.context.scene.tool_settings.mesh_select_mode = pre_selection_mode
+
+	return face_uvs, islands
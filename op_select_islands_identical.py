@@ -53,7 +53,11 @@ def island_find(self, context):
 	bm = bmesh.from_edit_mesh(bpy.context.active_object.data)
 	uv_layers = bm.loops.layers.uv.verify()
 
-	islands = utilities_uv.get_selected_islands(bm, uv_layers, selected=False, extend_selection_to_islands=True)
+	if bpy.context.scene.tool_settings.use_uv_select_sync:
+		seed_faces = [f for f in bm.faces if f.select]
+	else:
+		seed_faces = [f for f in bm.faces if f.select and any(utilities_uv.get_loop_selection(l, uv_layers, bm=bm) for l in f.loops)]
+	islands = utilities_uv.get_islands_from_seeds(bm, uv_layers, seed_faces)
 	if not islands:
 		return {}
 	if len(islands) > 1:
@@ -2,6 +2,8 @@ import bpy
 import bmesh
 
 from . import utilities_uv
+from .services import uv_array_service
+from .services import uv_boundary_service
 
 
 
@@ -32,54 +34,28 @@ class op(bpy.types.Operator):
 
 
 
-def select_outline(self, context, bm=None, uv_layers=None): #, linkloops=True added just for stitch to work, may slow down the script
+def select_outline(self, context, bm=None, uv_layers=None):
+	obj = bpy.context.active_object
 	if bm is None:
-		bm = bmesh.from_edit_mesh(bpy.context.active_object.data)
+		bm = bmesh.from_edit_mesh(obj.data)
 		uv_layers = bm.loops.layers.uv.verify()
 
 	sync = bpy.context.scene.tool_settings.use_uv_select_sync
 
-	if sync:
-		selected_loops = {l for e in bm.edges for l in e.link_loops if e.select}
-	else:
-		selected_loops = {l for f in bm.faces for l in f.loops if utilities_uv.get_loop_edge_selection(l, uv_layers) and l.edge.select}
+	arrays = uv_array_service.read_loop_arrays(obj, uv_layers.name)
+	edge_select = uv_boundary_service.read_edge_flag(obj, 'select')
+	selected_loops = edge_select[arrays.edge] & ~arrays.face_hide[arrays.face]
+	if not sync:
+		selected_loops &= arrays.uv_select_edge
 
-	# Store previous edge seams
-	edges_seam = {l.edge for l in selected_loops if l.edge.seam}
-	
-	# Clear original seams
-	for edge in edges_seam:
-		edge.seam = False
-
-	bpy.ops.uv.seams_from_islands(mark_seams=True, mark_sharp=False)
+	boundary = uv_boundary_service.find_uv_boundaries(arrays, selected_loops)
 
-	if sync:
-		boundary_edges = {l.edge for l in selected_loops if l.edge.seam or l.edge.is_boundary}
-	else:
-		boundary_loops = {l for l in selected_loops if l.edge.seam or l.edge.is_boundary}
-		boundary_edges = {l.edge for l in boundary_loops}
-
-	# Select bound edges from edges marked as seams and edge boundaries
+	# Select bound edges: UV splits and mesh boundaries
 	if sync:
 		bpy.ops.mesh.select_all(action='DESELECT')
 		bpy.ops.mesh.select_mode(use_extend=False, use_expand=False, type='EDGE')
-		for edge in boundary_edges:
-			edge.select_set(True)
+		uv_boundary_service.select_edges(bm, boundary.edges)
 	else:
 		bpy.ops.uv.select_all(action='DESELECT')
 		bpy.ops.uv.select_mode(type='EDGE')
-		for loop in boundary_loops:
-			utilities_uv.set_loop_selection(loop, uv_layers, True)
-			utilities_uv.set_loop_edge_selection(loop, uv_layers, True)
-			# if linkloops:
-			# 	loop.link_loop_next[uv_layers].select = True
-		# Workaround for selection not flushing properly from loops to EDGE Selection Mode, apparently since UV edge selection support was added to the UV space
-		# Not fully working though
-		# bpy.ops.uv.select_mode(type='VERTEX')
-		# bpy.ops.uv.select_mode(type='EDGE')
-
-	# Restore seam selection
-	for edge in boundary_edges:
-		edge.seam = False
-	for edge in edges_seam:
-		edge.seam = True
+		uv_boundary_service.select_loops(bm, uv_layers, arrays, boundary.loops)
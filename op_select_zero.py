@@ -1,8 +1,10 @@
 import bpy
 import bmesh
-import mathutils
+import numpy as np
 
 from . import utilities_uv
+from .services import redo_cache
+from .services import uv_array_service
 
 
 class op(bpy.types.Operator):
@@ -40,23 +42,22 @@ def select_zero(self):
 	for obj in utilities_uv.selected_unique_objects_in_mode_with_uv():
 		bm = bmesh.from_edit_mesh(obj.data)
 		uv_layer = bm.loops.layers.uv.verify()
-		for f in bm.faces:
-			for l in f.loops:
-				l1 = l[uv_layer].uv
-				l2 = l.link_loop_next[uv_layer].uv
-				l3 = l.link_loop_prev[uv_layer].uv
-				area = mathutils.geometry.area_tri(l1, l2, l3)
-				thres = max((l1-l2).length, (l2-l3).length, (l1-l3).length)**2 * self.precision
-				if area < thres:
-					if sync:
-						f.select_set(True)
-					else:
-						for i in f.loops:
-							utilities_uv.set_loop_selection(i, uv_layer, True)
-					counter += 1
-					break
-				elif len(f.loops) == 3:
-					break
+		arrays = uv_array_service.read_loop_arrays(obj, uv_layer.name)
+
+		# Only the Precision changes on redo, the per face measure is kept for the same mesh state
+		state = redo_cache.mesh_state(obj, uv_layer.name, arrays=arrays)
+		ratios = redo_cache.fetch('select_zero', obj.name, state, lambda: degenerate_ratios(arrays))
+
+		faces = bm.faces
+		faces.ensure_lookup_table()
+		for index in np.flatnonzero(ratios < self.precision).tolist():
+			f = faces[index]
+			if sync:
+				f.select_set(True)
+			else:
+				for i in f.loops:
+					utilities_uv.set_loop_selection(i, uv_layer, True)
+			counter += 1
 
 	if not counter:
 		self.report({'INFO'}, f'Degenerate triangles not found')
@@ -73,3 +74,26 @@ def select_zero(self):
 
 	self.report({'WARNING'}, f'Detected {counter} degenerate UV triangles (THE AFFECTED MESH POLYGONS MAY BE HIDDEN OR UNSELECTED!)')
 	return {'FINISHED'}
+
+
+
+def degenerate_ratios(arrays):
+	"""Lowest UV triangle area over its longest side squared, of the corner triangles of every face"""
+	if not len(arrays.face_start):
+		return np.empty(0)
+	corner = np.arange(len(arrays.face)) - arrays.face_start[arrays.face]
+	prev_loop = arrays.face_start[arrays.face] + (corner - 1) % arrays.face_size[arrays.face]
+
+	l1 = arrays.uv
+	l2 = arrays.uv[arrays.next]
+	l3 = arrays.uv[prev_loop]
+	a, b = l2 - l1, l3 - l1
+	area = np.abs(a[:, 0] * b[:, 1] - a[:, 1] * b[:, 0]) / 2
+	longest = np.maximum.reduce([
+		((l1 - l2) ** 2).sum(axis=1),
+		((l2 - l3) ** 2).sum(axis=1),
+		((l1 - l3) ** 2).sum(axis=1)])
+
+	# A triangle collapsed to a point never passes the area < longest * precision test
+	ratio = np.divide(area, longest, out=np.full(len(area), np.inf), where=longest > 0)
+	return np.minimum.reduceat(ratio, arrays.face_start)
@@ -1,9 +1,12 @@
 import bpy
 import math
 import bmesh
+import numpy as np
 
 from . import utilities_uv
 from . import settings
+from .services import uv_array_service
+from .services import uv_boundary_service
 
 
 
@@ -44,36 +47,30 @@ def smooth_uv_islands(self, context):
 	bpy.ops.mesh.faces_shade_smooth()
 	bpy.ops.mesh.mark_sharp(clear=True)
 
-	bpy.ops.uv.select_all(action='SELECT')
-	bpy.ops.uv.seams_from_islands(mark_seams=False, mark_sharp=True)
+	obj = bpy.context.active_object
+	bm = bmesh.from_edit_mesh(obj.data)
+	uv_layer = bm.loops.layers.uv.verify()
+
+	arrays = uv_array_service.read_loop_arrays(obj, uv_layer.name)
+	partner = uv_array_service.radial_partner(arrays)
+	connected = uv_array_service.uv_connected(arrays, partner)
+	boundary = uv_boundary_service.find_uv_boundaries(arrays, partner=partner, connected=connected)
+
+	# Open mesh borders are left smooth, like seams_from_islands does
+	faces_per_edge = np.bincount(arrays.edge)
+	split_loops = boundary.loops[faces_per_edge[arrays.edge[boundary.loops]] > 1]
 
 	# Do not create sharp edges if the uv island has a uv seam to itself.
 	# Best example is the lateral surface of a cylinder - which doesn't need 
 	# a sharp edge when unrolled for normal map baking.
 
 	if self.soft_self_border:
-		bm = bmesh.from_edit_mesh(bpy.context.active_object.data)
-		uv_layer = bm.loops.layers.uv.verify()
-
-		islands = utilities_uv.getAllIslands(bm, uv_layer)
-		bpy.ops.uv.select_all(action='SELECT')
-		tested_edges = set()
-
-		for island in islands:
-			for face in list(island):
-				for edge in face.edges:
-					if edge in tested_edges:
-						continue
-
-					smooth_border = True
-					for link_face in edge.link_faces:
-						if link_face not in island:
-							smooth_border = False	
-							break
-					if smooth_border:
-						edge.smooth = True
-
-					tested_edges.add(edge)
+		labels = uv_array_service.island_labels(arrays, np.ones(len(arrays.face_start), dtype=bool), partner, connected)
+		partner_loops = partner[split_loops]
+		self_border = (partner_loops >= 0) & (labels[arrays.face[split_loops]] == labels[arrays.face[np.maximum(partner_loops, 0)]])
+		split_loops = split_loops[~self_border]
+
+	uv_boundary_service.write_sharp(obj, np.unique(arrays.edge[split_loops]))
 
 	bpy.ops.mesh.customdata_custom_splitnormals_clear()
 	if settings.bversion < 4.1:
@@ -6,6 +6,7 @@ import math
 
 from . import utilities_texel
 from . import utilities_uv
+from .services import redo_cache
 
 
 
@@ -94,6 +95,9 @@ def set_texel_density(self, context, edit_mode, getmode, setmode, density, udim_
 		size = int(getmode)
 
 	if getmode != 'IMAGE' or (image and getmode == 'IMAGE'):
+		# Group areas only depend on the mesh state, a redo or a new density only rescales the groups
+		state = redo_cache.mesh_state(obj, uv_layers.name, edit_mode, setmode, is_sync)
+
 		if is_sync:
 			bpy.context.scene.tool_settings.use_uv_select_sync = False
 			bpy.ops.uv.select_all(action='DESELECT')
@@ -101,67 +105,19 @@ def set_texel_density(self, context, edit_mode, getmode, setmode, density, udim_
 				for loop in face.loops:
 					utilities_uv.set_loop_selection(loop, uv_layers, True)
 
-		# Collect groups of faces to scale together
-		if setmode == 'ISLAND':
-			if edit_mode:
-				group_faces = utilities_uv.getSelectionIslands(bm, uv_layers)
-			else:
-				group_faces = utilities_uv.getAllIslands(bm, uv_layers)
-		else:	
-			# setmode == 'ALL' Scale all faces together
-			if edit_mode:
-				group_faces = [utilities_uv.get_selected_uv_faces(bm, uv_layers)]
-			else:
-				group_faces = [bm.faces]
-
-		for group in group_faces:
-			sum_area_vt = 0
-			sum_area_uv = 0
-			if setmode == 'ISLAND':
-				pre_center = Vector((0.0, 0.0))
-				n_loops = 0
-
-			for face in group:
-				# Decomposed face into triagles to calculate area
-				tris = len(face.loops)-2
-				if tris <= 0:
-					continue
-				if setmode == 'ISLAND':
-					for loop in face.loops:
-						pre_center += loop[uv_layers].uv
-						n_loops += 1
-
-				index = None
-				area_uv = 0
-				area_vt = 0
-
-				for _ in range(tris):
-					vA = face.loops[0][uv_layers].uv
-					if index is None:
-						origin = face.loops[0].link_loop_next
-					else:
-						for loop in face.loops:
-							if loop.vert.index == index:
-								origin = loop.link_loop_next
-								break
-					vB = origin[uv_layers].uv
-					vC = origin.link_loop_next[uv_layers].uv
-
-					area_uv += mathutils.geometry.area_tri(Vector(vA), Vector(vB), Vector(vC))
-
-					index = origin.vert.index
-
-				area_vt += face.calc_area()
-
-				sum_area_uv += math.sqrt(area_uv) * size
-				sum_area_vt += math.sqrt(area_vt)
+		groups = redo_cache.fetch('texel_density_set', obj.name, state, lambda: measure_groups(bm, uv_layers, edit_mode, setmode))
+		bm.faces.ensure_lookup_table()
 
+		for face_indices, root_area_uv, root_area_vt, center in groups:
+			group = [bm.faces[index] for index in face_indices]
+			sum_area_uv = root_area_uv * size
+			sum_area_vt = root_area_vt
 
 			# Apply scale to group
 			scale = 1
 			if density > 0 and sum_area_uv > 0 and sum_area_vt > 0:
 				if setmode == 'ISLAND':
-					pre_center /= n_loops
+					pre_center = center
 					#pre_center = Vector((0.5, 0.5))
 				else:
 					if udim_tile != 1001:
@@ -186,3 +142,70 @@ def set_texel_density(self, context, edit_mode, getmode, setmode, density, udim_
 
 	if is_sync:
 		bpy.context.scene.tool_settings.use_uv_select_sync = True
+
+
+
+def measure_groups(bm, uv_layers, edit_mode, setmode):
+	"""Face indices, summed square roots of the UV (per texture pixel) and mesh face areas, and UV center of every group"""
+	bm.faces.index_update()
+
+	# Collect groups of faces to scale together
+	if setmode == 'ISLAND':
+		if edit_mode:
+			group_faces = utilities_uv.getSelectionIslands(bm, uv_layers)
+		else:
+			group_faces = utilities_uv.getAllIslands(bm, uv_layers)
+	else:	
+		# setmode == 'ALL' Scale all faces together
+		if edit_mode:
+			group_faces = [utilities_uv.get_selected_uv_faces(bm, uv_layers)]
+		else:
+			group_faces = [bm.faces]
+
+	groups = []
+	for group in group_faces:
+		sum_area_vt = 0
+		sum_area_uv = 0
+		if setmode == 'ISLAND':
+			pre_center = Vector((0.0, 0.0))
+			n_loops = 0
+
+		for face in group:
+			# Decomposed face into triagles to calculate area
+			tris = len(face.loops)-2
+			if tris <= 0:
+				continue
+			if setmode == 'ISLAND':
+				for loop in face.loops:
+					pre_center += loop[uv_layers].uv
+					n_loops += 1
+
+			index = None
+			area_uv = 0
+			area_vt = 0
+
+			for _ in range(tris):
+				vA = face.loops[0][uv_layers].uv
+				if index is None:
+					origin = face.loops[0].link_loop_next
+				else:
+					for loop in face.loops:
+						if loop.vert.index == index:
+							origin = loop.link_loop_next
+							break
+				vB = origin[uv_layers].uv
+				vC = origin.link_loop_next[uv_layers].uv
+
+				area_uv += mathutils.geometry.area_tri(Vector(vA), Vector(vB), Vector(vC))
+
+				index = origin.vert.index
+
+			area_vt += face.calc_area()
+
+			sum_area_uv += math.sqrt(area_uv)
+			sum_area_vt += math.sqrt(area_vt)
+
+		center = pre_center / n_loops if setmode == 'ISLAND' and n_loops else None
+		groups.append(([face.index for face in group], sum_area_uv, sum_area_vt, center))
+
+	return groups
@@ -3,8 +3,8 @@ import bmesh
 
 from . import utilities_ui
 from . import utilities_uv
-from . import op_rectify
 from . import settings
+from .services import rectify_service
 
 
 
@@ -36,9 +36,11 @@ class op(bpy.types.Operator):
 			return {'CANCELLED'}
 
 		padding = utilities_ui.get_padding()
-		utilities_uv.multi_object_loop(unwrap_edges_pipe, self, context, padding)
+		reprojected = utilities_uv.multi_object_loop(unwrap_edges_pipe, self, context, padding, need_results=True)
 
-		bpy.ops.uv.average_islands_scale()
+		# Rectified strips are already in world units, only reprojected faces need rescaling
+		if any(reprojected):
+			bpy.ops.uv.average_islands_scale()
 		bpy.ops.uv.pack_islands(rotate=False, margin=padding)
 
 		# Move to active UDIM Tile TODO pack if not {'CANCELLED'} in the active UDIM Tile when implemented in Blender master (watch out for versioning)
@@ -63,7 +65,8 @@ class op(bpy.types.Operator):
 
 
 def unwrap_edges_pipe(self, context, padding):
-	me = bpy.context.active_object.data
+	obj = bpy.context.active_object
+	me = obj.data
 	bm = bmesh.from_edit_mesh(me)
 	uv_layers = bm.loops.layers.uv.verify()
 
@@ -95,7 +98,6 @@ def unwrap_edges_pipe(self, context, padding):
 	for edge in selected_edges:
 		edge.seam = True
 
-	# "Follow active quad" kind of unwrap
 	bpy.context.scene.tool_settings.use_uv_select_sync = False
 
 	bpy.ops.mesh.select_all(action='DESELECT')
@@ -105,64 +107,24 @@ def unwrap_edges_pipe(self, context, padding):
 		for loop in face.loops:
 			utilities_uv.set_loop_selection(loop, uv_layers, True)
 
-	bpy.ops.uv.unwrap(method='ANGLE_BASED', margin=padding)
-
-
-	# Rectify the unwrapped islands
-	islands = utilities_uv.getSelectionIslands(bm, uv_layers, extend_selection_to_islands=True, selected_faces=selected_faces)
-
-	for island in islands:
-		unrectified_faces = set()
-		rectified_faces = set()
-		face_loops = {face : [loop for loop in face.loops] for face in island}
-		active = {bm.faces.active}
-		count = 3
-
-		# Repeat Rectify until the result is not self-overlapping; max 3 iterations
-		while count > 0:
-			if count == 3:
-				unrectified_faces = op_rectify.main(me, bm, uv_layers, island, face_loops, return_discarded_faces=True)
-				rectified_faces = island.difference(unrectified_faces)
-				for face in unrectified_faces:
-					face.select_set(False)
-			else:
-				for f in rectified_faces:
-					if f not in active:
-						bm.faces.active = f
-						active.add(f)
-						break
-				bpy.ops.mesh.select_all(action='DESELECT')
-				for face in rectified_faces:
-					face.select_set(True)
-					for loop in face.loops:
-						utilities_uv.set_loop_selection(loop, uv_layers, True)
-				bpy.ops.uv.unwrap(method='ANGLE_BASED', margin=padding)
-				op_rectify.main(me, bm, uv_layers, island, face_loops)
-
-			if not rectified_faces:
-				count = 0
-				continue
-			bpy.ops.uv.select_all(action='DESELECT')
-			bpy.ops.uv.select_overlap(extend=False)
-			for f in rectified_faces:
-				if utilities_uv.get_loop_selection(f.loops[0], uv_layers):
-					count -= 1
-				else:
-					count = 0
-				break
-
-		# Reproject ngons and triangular faces
-		if unrectified_faces:
-			bpy.ops.mesh.select_all(action='DESELECT')
-			for face in unrectified_faces:
-				face.select_set(True)
-				for loop in face.loops:
-					utilities_uv.set_loop_selection(loop, uv_layers, True)
-			bpy.ops.uv.unwrap(method='ANGLE_BASED', margin=padding)
+	# Lay every pipe out as a rectified strip in one pass: the grid walk stops at the new seams,
+	# so rows follow the arc-length along the loop and columns the position around the ring
+	rectify_service.align_uv_rectify(obj, uv_layers.name, delimit={'SEAM'})
 
+	# Reproject ngons and triangular faces
+	unrectified_faces = [face for face in selected_faces if len(face.loops) != 4]
+	if unrectified_faces:
+		bpy.ops.mesh.select_all(action='DESELECT')
+		for face in unrectified_faces:
+			face.select_set(True)
+			for loop in face.loops:
+				utilities_uv.set_loop_selection(loop, uv_layers, True)
+		bpy.ops.uv.unwrap(method='ANGLE_BASED', margin=padding)
 
 	# Restore selection
 	for face in selected_faces:
 		face.select_set(True)
 		for loop in face.loops:
 			utilities_uv.set_loop_selection(loop, uv_layers, True)
+
+	return bool(unrectified_faces)
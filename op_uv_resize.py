@@ -4,6 +4,7 @@ from mathutils import Vector
 from . import utilities_uv
 from . import utilities_ui
 from . import utilities_texel
+from .services import uv_transform_service
 
 name_texture = "TT_resize_area"
 
@@ -137,9 +138,6 @@ class op(bpy.types.Operator):
 
 	
 	def execute(self, context):
-		#Store selection
-		utilities_uv.selection_store()
-
 		# Get start and end size
 		size_A = Vector([ 
 			bpy.context.scene.texToolsSettings.size[0],
@@ -167,33 +165,15 @@ class op(bpy.types.Operator):
 		bpy.context.scene.texToolsSettings.size[0] = self.size_x
 		bpy.context.scene.texToolsSettings.size[1] = self.size_y
 
-		#Restore selection
-		utilities_uv.selection_restore()
-
 		return {'FINISHED'}
 
 
 
 def resize_uv(self, context, mode, size_A, size_B):
-
-	# Set pivot
-	bpy.context.space_data.pivot_point = 'CURSOR'
-	if mode == 'TL':
-		bpy.ops.uv.cursor_set(location=Vector([0,1]))
-	elif mode == 'TR':
-		bpy.ops.uv.cursor_set(location=Vector([1,1]))
-	elif mode == 'BL':
-		bpy.ops.uv.cursor_set(location=Vector([0,0]))
-	elif mode == 'BR':
-		bpy.ops.uv.cursor_set(location=Vector([1,0]))
-
-	# Select all UV faces
-	bpy.ops.uv.select_all(action='SELECT')
-
-	# Resize
-	scale_x = size_A.x / size_B.x
-	scale_y = size_A.y / size_B.y
-	bpy.ops.transform.resize(value=(scale_x, scale_y, 1.0), use_proportional_edit=False)
+	# Scale all the UVs around the corner the area is extended from
+	sync = bpy.context.scene.tool_settings.use_uv_select_sync
+	selected_obs = utilities_uv.selected_unique_objects_in_mode_with_uv()
+	uv_transform_service.resize_area(selected_obs, sync, mode, size_A, size_B)
 
 
 
@@ -1,10 +1,10 @@
 import bpy
-import bmesh
+import numpy as np
 
 from . import utilities_uv
 from . import utilities_ui
-from mathutils import Vector
-from .utilities_bbox import BBox
+from .services import uv_array_service
+from .services import uv_boundary_service
 
 class op(bpy.types.Operator):
 	bl_idname = "uv.textools_uv_unwrap"
@@ -38,59 +38,42 @@ class op(bpy.types.Operator):
 def main(self, axis):
 	groups = []
 	selected_obj = utilities_uv.selected_unique_objects_in_mode_with_uv()
+
+	# Capture and prepare the state of every object in bulk, outside of Edit Mode
+	bpy.ops.object.mode_set(mode='OBJECT')
 	for obj in selected_obj:
-		bm = bmesh.from_edit_mesh(obj.data)
-		uv_layer = bm.loops.layers.uv.verify()
-		# selection_store
-		sel_states = [(utilities_uv.get_loop_selection(loop, uv_layer, bm=bm), utilities_uv.get_loop_edge_selection(loop, uv_layer)) for face in bm.faces for loop in face.loops]
+		me = obj.data
+		uv_name = me.uv_layers.active.name
+		arrays = uv_array_service.read_loop_arrays(obj, uv_name)
+		sel_face = uv_array_service.read_uv_flag(me, uv_name, 'face')
+		pin_state = uv_array_service.read_uv_flag(me, uv_name, 'pin')
+		edge_seam = uv_boundary_service.read_edge_flag(obj, 'use_seam')
+		uv_coords = arrays.uv.copy()
 
 		# analyze if a full uv-island has been selected.
-		full_islands = []
-		for island in utilities_uv.get_selected_islands(bm, uv_layer, selected=False, extend_selection_to_islands=True):
-			if all(utilities_uv.get_loop_selection(loop, uv_layer, bm=bm) for face in island for loop in face.loops):
-				full_islands.append(list(island))
-
-		# store pins and edge seams
-		edge_seam = []
-		for edge in bm.edges:
-			edge_seam.append(edge.seam)
-			edge.seam = False
-
-		# Pin the inverse of the current selection, and cache the uv coords
-		pin_state = []
-		uv_coords = []
-		for face in bm.faces:
-			for loop in face.loops:
-				uv = loop[uv_layer]
-				pin_state.append(uv.pin_uv)
-				uv.pin_uv = not utilities_uv.get_loop_selection(loop, uv_layer, bm=bm)
-				if axis:
-					uv_coords.append(uv.uv.copy())
-
+		visible = arrays.face_select & ~arrays.face_hide
+		labels = uv_array_service.island_labels(arrays, visible)
+		loop_island = labels[arrays.face]
+		partial = np.unique(loop_island[~arrays.uv_select & (loop_island >= 0)])
+		full = np.ones(labels.max() + 1, dtype=bool)
+		full[partial] = False
+		island_index = np.cumsum(full) - 1
+		loop_island = np.where(loop_island >= 0, np.where(full[loop_island], island_index[loop_island], -1), -1)
+		n_islands = int(full.sum())
+
+		# Pin the inverse of the current selection.
 		# If entire islands are selected, pin one vert to keep the island somewhat in place,
 		# otherwise it can get moved away quite randomly by the uv unwrap method; also store some uvs data to reconstruct orientation
-		orient_uvs = []
-		if full_islands:
-			for island in full_islands:
-
-				x_min = x_max = y_min = y_max = island[0].loops[0][uv_layer]
-				x_min.pin_uv = True
+		pins = ~arrays.uv_select
+		extremes = _island_extremes(arrays.uv, loop_island, n_islands)
+		pins[extremes[0]] = True
 
-				for face in island:
-					for loop in face.loops:
-						uv = loop[uv_layer]
-						if uv.uv.x > x_max.uv.x:
-							x_max = uv
-						if uv.uv.x < x_min.uv.x:
-							x_min = uv
-						if uv.uv.y > y_max.uv.y:
-							y_max = uv
-						if uv.uv.y < y_min.uv.y:
-							y_min = uv
+		uv_array_service.write_uv_flag(me, uv_name, 'pin', pins)
+		me.edges.foreach_set('use_seam', np.zeros(len(me.edges), dtype=bool))
 
-				orient_uvs.append((x_min, x_max, y_min, y_max, x_min.uv.copy(), x_max.uv.copy(), y_min.uv.copy(), y_max.uv.copy()))
+		groups.append((obj, uv_name, arrays, sel_face, pin_state, edge_seam, uv_coords, loop_island, n_islands, extremes))
 
-		groups.append((bm, uv_layer, sel_states, full_islands, edge_seam, pin_state, uv_coords, orient_uvs))
+	bpy.ops.object.mode_set(mode='EDIT')
 
 	# apply unwrap
 	bpy.ops.uv.select_all(action='SELECT')
@@ -99,110 +82,147 @@ def main(self, axis):
 	padding = utilities_ui.get_padding()
 	bpy.ops.uv.unwrap(method='ANGLE_BASED', margin=padding)
 
-	# try to reconstruct the original orientation of the uv island
-	up = Vector((0, 1.0))
-	for bm, uv_layer, sel_states, full_islands, edge_seam, pin_state, uv_coords, orient_uvs in groups:
-		for bbox, island in zip(orient_uvs, full_islands):
-			x_min, x_max, y_min, y_max, x_min_coord, x_max_coord, y_min_coord, y_max_coord = bbox
-			prev_bbox = BBox(x_min_coord.x, x_max_coord.x, y_min_coord.y, y_max_coord.y)
-
-			island_bbox = BBox.calc_bbox_uv(island, uv_layer)
-			pivot = island_bbox.center
-
-			# Case: Normal
-			if prev_bbox.max_lenght > 0.0002 and prev_bbox.min_lenght > 2e-08:  # Zero area island protection
-				intial_x_axis = x_min_coord - x_max_coord
-				intial_x_angle = up.angle_signed(intial_x_axis)
-
-				axis_x_current = x_min.uv - x_max.uv
-				current_x_angle = up.angle_signed(axis_x_current)
-
-				intial_y_axis = y_min_coord - y_max_coord
-				intial_y_angle = up.angle_signed(intial_y_axis)
-
-				axis_y_current = y_min.uv - y_max.uv
-				current_y_angle = up.angle_signed(axis_y_current)
-
-				angle_x = intial_x_angle - current_x_angle
-				angle_y = intial_y_angle - current_y_angle
-				angle = min(angle_x, angle_y)
-
-				utilities_uv.rotate_island(island, uv_layer, angle, pivot)
-
-				# keep it the same size
-				scale_x = intial_x_axis.length / axis_x_current.length
-				scale_y = intial_y_axis.length / axis_y_current.length
-				scale = min([scale_x, scale_y], key=lambda x: abs(x-1.0))  # pick scale closer to 1.0
-
-				utilities_uv.scale_island(island, uv_layer, Vector((scale, scale)), pivot)
-			# case: when the island had zero area, but was stretched on the axis
-			elif prev_bbox.max_lenght > 0.0001 and prev_bbox.min_lenght < 2e-09:
-				scale = prev_bbox.max_lenght / island_bbox.max_lenght
-				utilities_uv.scale_island(island, uv_layer, Vector((scale, scale)), pivot)
-				self.report({'INFO'}, f'A stretched island with zero area has been found, and successfully deployed')
-			# case: when area zero
-			elif island_bbox.area > 0.2:
-				scale = 0.2/island_bbox.max_lenght
-				utilities_uv.scale_island(island, uv_layer, Vector((scale, scale)), pivot)
-				self.report({'WARNING'}, f'UV Island with zero area was detected and scaled to 0.2.')
-			# case: when island small
-			elif island_bbox.area < 1e-05:
-				length = prev_bbox.max_lenght
-				if prev_bbox.max_lenght == 0:
-					length = island_bbox.max_lenght
-				sum_length = 0
-				count_valid_bbox = 0
-				# Finding the average size of other islands, and scaling to their size
-				for orient_uv in orient_uvs:
-					x_min, x_max, y_min, y_max = orient_uv[:4]
-					all_bbox = BBox(x_min.uv.x, x_max.uv.x, y_min.uv.y, y_max.uv.y)
-					max_length = all_bbox.max_lenght
-					if max_length > 1e-05:
-						sum_length += max_length
-						count_valid_bbox += 1
-				if count_valid_bbox:
-					avg_length = sum_length / count_valid_bbox
-					scale = avg_length / length
-					self.report(
-						{'WARNING'}, f"UV Island with a small area ({island_bbox.area}) was found and scaled "
-						f"to the average size ({scale}) of the other islands. To validate the unwrap, try again.")
-				else:
-					scale = 0.2 / length
-					self.report({'WARNING'}, f'UV Island with small area ({island_bbox.area}) was detected and scaled to 0.2')
-				utilities_uv.scale_island(island, uv_layer, Vector((scale, scale)), pivot)
+	bpy.ops.object.mode_set(mode='OBJECT')
+	for obj, uv_name, arrays, sel_face, pin_state, edge_seam, uv_coords, loop_island, n_islands, extremes in groups:
+		me = obj.data
+		uv = np.empty(len(me.loops) * 2, dtype=np.float32)
+		me.uv_layers[uv_name].uv.foreach_get('vector', uv)
+		uv = uv.reshape(-1, 2).astype(np.float64)
+
+		# try to reconstruct the original orientation of the uv island
+		if n_islands:
+			_reconstruct_orientation(self, uv, uv_coords, loop_island, n_islands, extremes)
+
+		# apply axis constraint
+		if axis:
+			if axis == "x":
+				uv[:, 1] = uv_coords[:, 1]
 			else:
-				self.report({'WARNING'}, f'Island not have boundary edges or other')
-
-			# move back into place
-			delta = x_min_coord - x_min.uv
-			utilities_uv.translate_island(island, uv_layer, delta)
-
-		# restore selections, pins & edge seams
-		index = 0
-		for face in bm.faces:
-			for loop in face.loops:
-				uv = loop[uv_layer]
-				uv.pin_uv = pin_state[index]
-
-				# apply axis constraint
-				if axis:
-					if axis == "x":
-						uv.uv.y = uv_coords[index].y
-					else:
-						uv.uv.x = uv_coords[index].x
-				index += 1
-
-		for edge, seam in zip(bm.edges, edge_seam):
-			edge.seam = seam
-
-		# restore selection
-		luvs = (loop[uv_layer] for face in bm.faces for loop in face.loops)
-		for luv, sel_state in zip(luvs, sel_states):
-			try:
-				luv.select, luv.select_edge = sel_state
-			except AttributeError:
-				# Silently skip restoration if attributes are missing in 5.0+.
-				pass
+				uv[:, 0] = uv_coords[:, 0]
+
+		# restore uvs, selections, pins & edge seams
+		me.uv_layers[uv_name].uv.foreach_set('vector', uv.astype(np.float32).ravel())
+		uv_array_service.write_uv_flag(me, uv_name, 'pin', pin_state)
+		uv_array_service.write_uv_flag(me, uv_name, 'vert', arrays.uv_select)
+		uv_array_service.write_uv_flag(me, uv_name, 'edge', arrays.uv_select_edge)
+		uv_array_service.write_uv_flag(me, uv_name, 'face', sel_face)
+		me.edges.foreach_set('use_seam', edge_seam)
+		me.update()
+
+	bpy.ops.object.mode_set(mode='EDIT')
+
+
+def _island_extremes(uv, loop_island, n_islands):
+	"""First loop with the minimal x, maximal x, minimal y and maximal y UV of every island"""
+	loops = np.flatnonzero(loop_island >= 0)
+	extremes = []
+	for key in (uv[:, 0], -uv[:, 0], uv[:, 1], -uv[:, 1]):
+		order = loops[np.lexsort((loops, key[loops], loop_island[loops]))]
+		islands = loop_island[order]
+		first = np.flatnonzero(np.concatenate(([True], islands[1:] != islands[:-1])))
+		extreme = np.zeros(n_islands, dtype=np.int64)
+		extreme[islands[first]] = order[first]
+		extremes.append(extreme)
+	return extremes
+
+
+def _reconstruct_orientation(self, uv, uv_coords, loop_island, n_islands, extremes):
+	x_min, x_max, y_min, y_max = extremes
+	x_min_coord, x_max_coord = uv_coords[x_min], uv_coords[x_max]
+	y_min_coord, y_max_coord = uv_coords[y_min], uv_coords[y_max]
+
+	prev_width = x_max_coord[:, 0] - x_min_coord[:, 0]
+	prev_height = y_max_coord[:, 1] - y_min_coord[:, 1]
+	prev_max_length = np.maximum(prev_width, prev_height)
+	prev_min_length = np.minimum(prev_width, prev_height)
+
+	loops = np.flatnonzero(loop_island >= 0)
+	islands = loop_island[loops]
+
+	def island_bbox():
+		lo = np.full((n_islands, 2), np.inf)
+		hi = np.full((n_islands, 2), -np.inf)
+		for i in (0, 1):
+			np.minimum.at(lo[:, i], islands, uv[loops, i])
+			np.maximum.at(hi[:, i], islands, uv[loops, i])
+		return lo, hi
+
+	lo, hi = island_bbox()
+	pivot = (lo + hi) * 0.5
+	size = hi - lo
+	max_length = size.max(axis=1)
+	area = size[:, 0] * size[:, 1]
+
+	# Case: Normal
+	normal = (prev_max_length > 0.0002) & (prev_min_length > 2e-08)  # Zero area island protection
+	# case: when the island had zero area, but was stretched on the axis
+	stretched = ~normal & (prev_max_length > 0.0001) & (prev_min_length < 2e-09)
+	# case: when area zero
+	zero_area = ~normal & ~stretched & (area > 0.2)
+	# case: when island small
+	small = ~normal & ~stretched & ~zero_area & (area < 1e-05)
+
+	def angle_to_up(vec):
+		return np.arctan2(vec[:, 0], vec[:, 1])
+
+	intial_x_axis = x_min_coord - x_max_coord
+	axis_x_current = uv[x_min] - uv[x_max]
+	intial_y_axis = y_min_coord - y_max_coord
+	axis_y_current = uv[y_min] - uv[y_max]
+
+	angle = np.minimum(angle_to_up(intial_x_axis) - angle_to_up(axis_x_current), angle_to_up(intial_y_axis) - angle_to_up(axis_y_current))
+	angle = np.where(normal & (np.abs(angle) >= 1e-05), angle, 0.0)
+
+	# keep it the same size
+	scale_x = _safe_ratio(np.linalg.norm(intial_x_axis, axis=1), np.linalg.norm(axis_x_current, axis=1))
+	scale_y = _safe_ratio(np.linalg.norm(intial_y_axis, axis=1), np.linalg.norm(axis_y_current, axis=1))
+	scale = np.ones(n_islands)
+	scale[normal] = np.where(np.abs(scale_x - 1.0) <= np.abs(scale_y - 1.0), scale_x, scale_y)[normal]  # pick scale closer to 1.0
+	scale[stretched] = _safe_ratio(prev_max_length, max_length)[stretched]
+	scale[zero_area] = _safe_ratio(np.full(n_islands, 0.2), max_length)[zero_area]
+
+	_rotate_scale(uv, loops, islands, pivot, angle, scale)
+
+	# Finding the average size of other islands, and scaling small ones to their size
+	if small.any():
+		all_max_length = np.maximum(uv[x_max, 0] - uv[x_min, 0], uv[y_max, 1] - uv[y_min, 1])
+		valid_lengths = all_max_length[all_max_length > 1e-05]
+		length = np.where(prev_max_length == 0, max_length, prev_max_length)
+		small_scale = np.ones(n_islands)
+		if len(valid_lengths):
+			small_scale[small] = _safe_ratio(np.full(n_islands, valid_lengths.mean()), length)[small]
+		else:
+			small_scale[small] = _safe_ratio(np.full(n_islands, 0.2), length)[small]
+		_rotate_scale(uv, loops, islands, pivot, np.zeros(n_islands), small_scale)
+
+	for i in np.flatnonzero(~normal).tolist():
+		if stretched[i]:
+			self.report({'INFO'}, f'A stretched island with zero area has been found, and successfully deployed')
+		elif zero_area[i]:
+			self.report({'WARNING'}, f'UV Island with zero area was detected and scaled to 0.2.')
+		elif small[i]:
+			if len(valid_lengths):
+				self.report(
+					{'WARNING'}, f"UV Island with a small area ({area[i]}) was found and scaled "
+					f"to the average size ({small_scale[i]}) of the other islands. To validate the unwrap, try again.")
+			else:
+				self.report({'WARNING'}, f'UV Island with small area ({area[i]}) was detected and scaled to 0.2')
+		else:
+			self.report({'WARNING'}, f'Island not have boundary edges or other')
 
-	for obj in selected_obj:
-		bmesh.update_edit_mesh(obj.data)
+	# move back into place
+	delta = x_min_coord - uv[x_min]
+	uv[loops] += delta[islands]
+
+
+def _rotate_scale(uv, loops, islands, pivot, angle, scale):
+	"""Rotates every island by -angle and scales it around its pivot, like rotate_island and scale_island"""
+	cos = np.cos(angle)[islands] * scale[islands]
+	sin = np.sin(angle)[islands] * scale[islands]
+	local = uv[loops] - pivot[islands]
+	uv[loops, 0] = cos * local[:, 0] + sin * local[:, 1] + pivot[islands, 0]
+	uv[loops, 1] = -sin * local[:, 0] + cos * local[:, 1] + pivot[islands, 1]
+
+
+def _safe_ratio(numerator, denominator):
+	return np.divide(numerator, denominator, out=np.ones_like(numerator), where=denominator != 0)
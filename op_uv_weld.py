@@ -0,0 +1,39 @@
+import bpy
+import bmesh
+
+from . import utilities_uv
+from .services import uv_weld_service
+
+
+class op(bpy.types.Operator):
+	bl_idname = "uv.textools_uv_weld"
+	bl_label = "Weld"
+	bl_description = "Merge the UVs of each vertex that are closer than the distance, across all objects in Edit Mode"
+	bl_options = {'REGISTER', 'UNDO'}
+
+	distance: bpy.props.FloatProperty(name="Distance", description="Maximum distance between UVs to merge", default=0.0001, min=0, soft_max=0.01, precision=5, step=0.001)
+	selected_only: bpy.props.BoolProperty(name="Selected Only", description="Only merge the selected UVs", default=True)
+	within_island: bpy.props.BoolProperty(name="Within Island", description="Only merge UVs of the same island", default=False)
+
+	@classmethod
+	def poll(cls, context):
+		if not bpy.context.active_object:
+			return False
+		if bpy.context.active_object.mode != 'EDIT':
+			return False
+		if bpy.context.active_object.type != 'MESH':
+			return False
+		if not bpy.context.object.data.uv_layers:
+			return False
+		return True
+
+	def execute(self, context):
+		sync = bpy.context.scene.tool_settings.use_uv_select_sync
+		welded = 0
+		for obj in utilities_uv.selected_unique_objects_in_mode_with_uv():
+			bm = bmesh.from_edit_mesh(obj.data)
+			uv_layers = bm.loops.layers.uv.verify()
+			welded += uv_weld_service.weld_uvs(obj, uv_layers.name, self.distance, sync, self.selected_only, self.within_island)
+
+		self.report({'INFO'}, f"Welded {welded} UVs")
+		return {'FINISHED'}
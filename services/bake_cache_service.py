@@ -0,0 +1,115 @@
+# SPDX-License-Identifier: GPL-3.0-or-later
+"""
+Disk cache of baked images, keyed by the fingerprint of their bake inputs from bake_fingerprint_service,
+so a bake already done with the same inputs, in this file or any other, is loaded instead of rendered.
+Files are touched whenever they are used, and the least recently used ones are evicted once the cache
+grows past its size cap.
+"""
+
+import os
+
+import bpy
+import numpy as np
+
+EXTENSIONS = ('.png', '.exr')
+TEMP_IMAGE = 'TT_bake_cache'
+
+
+def lookup(directory: str, fingerprint: str) -> str | None:
+    """Path of the cached image of a fingerprint, marked as the most recently used one."""
+    for extension in EXTENSIONS:
+        path = os.path.join(directory, fingerprint + extension)
+        if os.path.isfile(path):
+            os.utime(path)
+            return path
+    return None
+
+
+def load(path: str, name: str, color_space: str) -> bpy.types.Image | None:
+    """
+    Pixels of a cached image into the image of that name, created like op_bake creates bake images if missing.
+    None when the file can't be read.
+    """
+    try:
+        loaded = bpy.data.images.load(path, check_existing=False)
+    except RuntimeError:
+        return None
+    try:
+        width, height = loaded.size
+        if loaded.channels != 4 or not width or not height:
+            return None
+        pixels = np.empty(width * height * 4, dtype=np.float32)
+        loaded.pixels.foreach_get(pixels)
+        is_float = loaded.is_float
+    finally:
+        bpy.data.images.remove(loaded)
+
+    image = bpy.data.images.get(name)
+    if image is None:
+        image = bpy.data.images.new(name, width=width, height=height, alpha=True, float_buffer=is_float)
+        image.alpha_mode = 'NONE'
+        try:
+            image.colorspace_settings.name = color_space
+        except TypeError:
+            pass
+    elif tuple(image.size) != (width, height):
+        image.scale(width, height)
+    image.pixels.foreach_set(pixels)
+    image.update()
+    return image
+
+
+def store(directory: str, image: bpy.types.Image, fingerprint: str, max_bytes: int):
+    """
+    Writes a baked image to the cache, as EXR when it holds floats and PNG otherwise, then evicts the least
+    recently used files past max_bytes. Tiled images are not cached.
+    """
+    width, height = image.size
+    if image.source == 'TILED' or image.channels != 4 or not width or not height:
+        return
+    os.makedirs(directory, exist_ok=True)
+
+    pixels = np.empty(width * height * 4, dtype=np.float32)
+    image.pixels.foreach_get(pixels)
+    extension = '.exr' if image.is_float else '.png'
+    path = os.path.join(directory, fingerprint + extension)
+    # Written aside and moved in place, so another Blender sharing the cache never reads a partial file
+    temp_path = f"{path}.{os.getpid()}.tmp"
+
+    # A new image so the baked one keeps its source and file path
+    copy = bpy.data.images.new(TEMP_IMAGE, width=width, height=height, alpha=True, float_buffer=image.is_float)
+    try:
+        copy.colorspace_settings.name = image.colorspace_settings.name
+        copy.pixels.foreach_set(pixels)
+        copy.filepath_raw = temp_path
+        copy.file_format = 'OPEN_EXR' if image.is_float else 'PNG'
+        copy.save()
+        os.replace(temp_path, path)
+    finally:
+        bpy.data.images.remove(copy)
+        if os.path.isfile(temp_path):
+            os.remove(temp_path)
+
+    evict(directory, max_bytes)
+
+
+def evict(directory: str, max_bytes: int) -> int:
+    """Removes the least recently used cached images until the cache fits in max_bytes, returns how many."""
+    entries = []
+    for entry in os.scandir(directory):
+        if entry.is_file() and os.path.splitext(entry.name)[1] in EXTENSIONS:
+            stat = entry.stat()
+            entries.append((stat.st_mtime, stat.st_size, entry.path))
+
+    total = sum(size for _, size, _ in entries)
+    removed = 0
+    for _, size, path in sorted(entries):
+        if total <= max_bytes:
+            break
+        try:
+            os.remove(path)
+        except OSError:
+            continue
+        total -= size
+        removed += 1
+    return removed
@@ -0,0 +1,193 @@
+# SPDX-License-Identifier: GPL-3.0-or-later
+"""
+Bakes the sets of the scene in parallel background Blender processes. The file is saved to a temporary copy,
+every set becomes a job of its own, baked by bake_job_service in a worker process, and the images the workers
+save are loaded back into the current file, along with the fingerprints of their bakes. A set that fails only
+fails its own job. Workers don't save to the Save path of the bake settings: relative to the temporary copy,
+it would point into the work directory, so the caller saves the loaded images instead.
+"""
+
+import json
+import os
+import shutil
+import subprocess
+import tempfile
+import time
+from typing import Callable, NamedTuple
+
+import bpy
+import numpy as np
+
+from . import bake_fingerprint_service
+from .. import utilities_bake as ub
+from ..settings import tt_settings, prefs
+
+WORKER_EXPR = "import importlib; importlib.import_module({module!r}).main()"
+
+
+class Worker(NamedTuple):
+    """A running worker process and the job it bakes."""
+
+    job: dict
+    process: subprocess.Popen
+    report_path: str
+    log: object  # file receiving the worker output
+    start: float
+
+
+def set_jobs(sets: list[ub.BakeSet], modes: list[str], output_dir: str) -> list[dict]:
+    """
+    One bake_job_service job per set, with the current scene bake settings.
+    Single mode bakes all sets into one texture, so they stay together in one job.
+    """
+    extension = '.exr' if prefs().bake_32bit_float == '32' else '.png'
+    tool = tt_settings()
+    common = {
+        'modes': modes,
+        'size': list(tool.size),
+        'samples': tool.bake_samples,
+        'sampling': int(tool.bake_sampling),
+        'padding': tool.padding,
+        'ray_distance': tool.bake_ray_distance,
+        'cage_extrusion': tool.bake_cage_extrusion,
+        'bake_force': tool.bake_force,
+        'isolate': tool.bake_isolate,
+        'autosave': False,
+        'output': os.path.join(output_dir, '{image}' + extension),
+    }
+
+    def entry(bset):
+        return {'name': bset.name, 'low': [obj.name for obj in bset.objects_low],
+                'cage': [obj.name for obj in bset.objects_cage], 'high': [obj.name for obj in bset.objects_high],
+                'float': [obj.name for obj in bset.objects_float]}
+
+    if tool.bake_force == "Single":
+        return [dict(common, sets=[entry(bset) for bset in sets])]
+    return [dict(common, sets=[entry(bset)]) for bset in sets]
+
+
+def save_copy(work_dir: str) -> str:
+    """Saves the current file to the work directory for the workers, without changing the open file path."""
+    path = os.path.join(work_dir, 'bake.blend')
+    bpy.ops.wm.save_as_mainfile(filepath=path, copy=True, check_existing=False)
+    return path
+
+
+def dispatch(jobs: list[dict], blend_path: str, work_dir: str, workers: int, threads: int = 0,
+             progress: Callable[[int, int, dict], None] | None = None) -> list[dict]:
+    """
+    Runs every job in a background Blender process, at most workers at a time, each one rendering
+    with threads threads (0 lets Cycles decide). Returns the report of every job, in the order of the jobs.
+    progress(done, total, report) is called whenever a job ends.
+    """
+    module = __package__ + '.bake_job_service'
+    pending = list(enumerate(jobs))
+    running: dict[int, Worker] = {}
+    reports: list[dict | None] = [None] * len(jobs)
+
+    while pending or running:
+        while pending and len(running) < max(1, workers):
+            index, job = pending.pop(0)
+            running[index] = _start(index, job, module, blend_path, work_dir, threads)
+
+        time.sleep(0.1)
+        for index, worker in list(running.items()):
+            if worker.process.poll() is None:
+                continue
+            del running[index]
+            worker.log.close()
+            reports[index] = _collect(worker)
+            if progress:
+                progress(sum(report is not None for report in reports), len(jobs), reports[index])
+
+    return reports
+
+
+def _start(index: int, job: dict, module: str, blend_path: str, work_dir: str, threads: int) -> Worker:
+    manifest_path = os.path.join(work_dir, f'job_{index}.json')
+    report_path = os.path.join(work_dir, f'report_{index}.json')
+    with open(manifest_path, 'w', encoding='utf-8') as file:
+        json.dump({'jobs': [job], 'report': report_path}, file)
+
+    command = [bpy.app.binary_path, '-b', blend_path]
+    if threads:
+        command += ['-t', str(threads)]
+    command += ['--python-expr', WORKER_EXPR.format(module=module), '--', manifest_path]
+    log = open(os.path.join(work_dir, f'job_{index}.log'), 'w', encoding='utf-8')
+    process = subprocess.Popen(command, stdout=log, stderr=subprocess.STDOUT)
+    return Worker(job, process, report_path, log, time.perf_counter())
+
+
+def _collect(worker: Worker) -> dict:
+    """Report of a finished worker, a failure report when the process died before writing it."""
+    seconds = round(time.perf_counter() - worker.start, 3)
+    sets = [entry['name'] for entry in worker.job['sets']]
+    if os.path.isfile(worker.report_path):
+        with open(worker.report_path, encoding='utf-8') as file:
+            report = json.load(file)['jobs'][0]
+        report.setdefault('sets', sets)
+        report['seconds'] = seconds
+        return report
+
+    with open(worker.log.name, encoding='utf-8', errors='replace') as file:
+        tail = file.read()[-2000:]
+    return {'sets': sets, 'modes': worker.job['modes'], 'status': 'FAILED', 'seconds': seconds,
+            'messages': [f"Worker exited with code {worker.process.returncode}", tail], 'images': []}
+
+
+def load_images(reports: list[dict]) -> int:
+    """
+    Loads the images of the finished jobs back into the file and records the fingerprints of their bakes,
+    returns how many were loaded. The entries of the images loaded are marked with 'loaded'.
+    """
+    count = 0
+    for report in reports:
+        for entry in report.get('images', []):
+            if entry.get('path') and os.path.isfile(entry['path']):
+                load_image(entry['image'], entry['path'])
+                entry['loaded'] = True
+                if entry.get('fingerprint'):
+                    bake_fingerprint_service.record(entry['set'], entry['mode'], entry['fingerprint'], entry['image'])
+                count += 1
+    return count
+
+
+def load_image(name: str, path: str) -> bpy.types.Image:
+    """
+    Pixels of an image file into the image of that name, so the materials using it see the bake.
+    A new image is created and packed when the file has none of that name.
+    """
+    loaded = bpy.data.images.load(path, check_existing=False)
+    try:
+        loaded.colorspace_settings.name = tt_settings().bake_color_space
+    except TypeError:
+        pass
+
+    image = bpy.data.images.get(name)
+    if image is None:
+        loaded.name = name
+        loaded.pack()
+        return loaded
+
+    if tuple(image.size) != tuple(loaded.size):
+        image.scale(*loaded.size)
+    pixels = np.empty(len(loaded.pixels), dtype=np.float32)
+    loaded.pixels.foreach_get(pixels)
+    image.pixels.foreach_set(pixels)
+    image.update()
+    bpy.data.images.remove(loaded)
+    return image
+
+
+def bake_parallel(sets: list[ub.BakeSet], modes: list[str], workers: int, threads: int = 0,
+                  progress: Callable[[int, int, dict], None] | None = None) -> list[dict]:
+    """Bakes the sets in worker processes and loads the results, returns the report of every job."""
+    work_dir = tempfile.mkdtemp(prefix='textools_bake_')
+    try:
+        blend_path = save_copy(work_dir)
+        jobs = set_jobs(sets, modes, work_dir)
+        reports = dispatch(jobs, blend_path, work_dir, workers, threads, progress)
+        load_images(reports)
+        return reports
+    finally:
+        shutil.rmtree(work_dir, ignore_errors=True)
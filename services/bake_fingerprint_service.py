@@ -0,0 +1,180 @@
+# SPDX-License-Identifier: GPL-3.0-or-later
+"""
+Content fingerprints of bake inputs. A fingerprint covers the evaluated meshes and transforms of the objects
+of a set, the node settings and textures of their materials, and the bake settings of a mode; the fingerprint
+of the last successful bake of every (set, mode) is kept in the scene together with the name of the image it baked.
+"""
+
+import os
+
+import bpy
+import numpy as np
+from bpy.types import Material, Object
+
+from . import redo_cache
+from .. import utilities_bake as ub
+
+STORE_KEY = 'textools_bake_fingerprints'
+
+# Node properties that only change the node's look in the editor
+_UI_PROPS = {'name', 'label', 'location', 'width', 'width_hidden', 'height', 'hide', 'mute', 'select',
+             'show_options', 'show_preview', 'show_texture', 'use_custom_color', 'color'}
+
+
+class UnknownInput(Exception):
+    """A bake input whose content can't be fingerprinted."""
+
+
+def set_fingerprint(bsets: list[ub.BakeSet], mode_state: tuple) -> str | None:
+    """
+    Fingerprint of the sets baked into one image, mode_state being the settings the mode bakes with.
+    None when an input can't be fingerprinted, like a UDIM or movie texture.
+    """
+    try:
+        return _set_fingerprint(bsets, mode_state)
+    except UnknownInput:
+        return None
+
+
+def _set_fingerprint(bsets: list[ub.BakeSet], mode_state: tuple) -> str:
+    parts = [mode_state]
+    depsgraph = bpy.context.evaluated_depsgraph_get()
+    materials = []
+    for bset in bsets:
+        parts.append(bset.name)
+        for kind in (bset.objects_low, bset.objects_cage, bset.objects_high, bset.objects_float):
+            parts.append(len(kind))
+            for obj in kind:
+                parts.extend(object_state(obj, depsgraph))
+                materials.extend(slot.material for slot in obj.material_slots if slot.material)
+    for material in dict.fromkeys(materials):
+        parts.extend(material_state(material))
+    return redo_cache.fingerprint(*parts)
+
+
+def object_state(obj: Object, depsgraph: bpy.types.Depsgraph) -> list:
+    """Transform and evaluated mesh of an object: positions, topology, normals, UVs and material indices."""
+    state = [obj.name, obj.type, np.array(obj.matrix_world, dtype=np.float64)]
+    evaluated = obj.evaluated_get(depsgraph)
+    try:
+        me = evaluated.to_mesh()
+    except RuntimeError:
+        return state
+    if me is None:
+        return state
+
+    try:
+        co = np.empty(len(me.vertices) * 3, dtype=np.float32)
+        me.vertices.foreach_get('co', co)
+        loop_vert = np.empty(len(me.loops), dtype=np.int32)
+        me.loops.foreach_get('vertex_index', loop_vert)
+        loop_total = np.empty(len(me.polygons), dtype=np.int32)
+        me.polygons.foreach_get('loop_total', loop_total)
+        material_index = np.empty(len(me.polygons), dtype=np.int32)
+        me.polygons.foreach_get('material_index', material_index)
+        normals = np.empty(len(me.loops) * 3, dtype=np.float32)
+        if hasattr(me, 'corner_normals'):
+            me.corner_normals.foreach_get('vector', normals)
+        else:
+            me.calc_normals_split()
+            me.loops.foreach_get('normal', normals)
+        state += [co, loop_vert, loop_total, material_index, normals]
+
+        for uv_layer in me.uv_layers:
+            uv = np.empty(len(me.loops) * 2, dtype=np.float32)
+            uv_layer.data.foreach_get('uv', uv)
+            state += [uv_layer.name, uv_layer.active_render, uv]
+    finally:
+        evaluated.to_mesh_clear()
+    return state
+
+
+def material_state(material: Material) -> list:
+    return [material.name, material.use_nodes] + (node_tree_state(material.node_tree, set())
+                                                  if material.use_nodes and material.node_tree else [])
+
+
+def node_tree_state(tree: bpy.types.NodeTree, seen: set) -> list:
+    """Settings, unlinked input values, images and links of the nodes of a tree and of the groups it uses."""
+    if tree.name in seen:
+        return []
+    seen.add(tree.name)
+
+    state = [tree.name]
+    for node in tree.nodes:
+        state += [node.name, node.bl_idname, node.mute]
+        for prop in node.bl_rna.properties:
+            if (prop.identifier not in _UI_PROPS and not prop.is_readonly
+                    and prop.type in {'BOOLEAN', 'INT', 'FLOAT', 'STRING', 'ENUM'}):
+                state.append(_plain(getattr(node, prop.identifier)))
+        for socket in node.inputs:
+            if not socket.is_linked and hasattr(socket, 'default_value'):
+                state.append(_plain(socket.default_value))
+        image = getattr(node, 'image', None)
+        if image:
+            state += image_state(image)
+        node_group = getattr(node, 'node_tree', None)
+        if node_group:
+            state += node_tree_state(node_group, seen)
+    for link in tree.links:
+        state += [link.from_node.name, link.from_socket.identifier, link.to_node.name, link.to_socket.identifier]
+    return state
+
+
+def _plain(value):
+    """Property value with a stable repr: arrays as tuples, enum flags sorted."""
+    if isinstance(value, str):
+        return value
+    if isinstance(value, set):
+        return tuple(sorted(value))
+    if hasattr(value, '__len__'):
+        return tuple(value)
+    return value
+
+
+def image_state(image: bpy.types.Image) -> list:
+    """
+    Content of a texture a material samples. Files on disk are tracked by their modification time, images painted
+    in Blender by their pixels and packed ones by their packed data.
+    """
+    state = [image.name, image.source, image.filepath, tuple(image.size), image.colorspace_settings.name]
+    if image.source not in {'FILE', 'GENERATED'}:
+        # Pixel buffers only hold the first tile or frame of UDIM, sequence and movie images
+        raise UnknownInput(image.name)
+
+    if image.is_dirty:
+        pixels = np.empty(len(image.pixels), dtype=np.float32)
+        image.pixels.foreach_get(pixels)
+        state.append(pixels)
+    elif image.packed_file:
+        state.append(np.frombuffer(image.packed_file.data, dtype=np.uint8))
+    elif image.source == 'GENERATED':
+        state += [image.generated_type, tuple(image.generated_color), image.use_generated_float]
+    else:
+        path = bpy.path.abspath(image.filepath)
+        state.append(os.path.getmtime(path) if os.path.isfile(path) else None)
+    return state
+
+
+def last_bake(set_name: str, mode: str) -> dict | None:
+    """Fingerprint and image name of the last successful bake of a set in a mode."""
+    store = bpy.context.scene.get(STORE_KEY)
+    entry = store.get(f"{set_name}/{mode}") if store else None
+    return entry.to_dict() if entry else None
+
+
+def is_current(set_name: str, mode: str, fingerprint: str) -> bool:
+    """Whether the last bake of a set in a mode used the same inputs and its image still holds the result."""
+    entry = last_bake(set_name, mode)
+    if entry is None or entry['fingerprint'] != fingerprint:
+        return False
+    image = bpy.data.images.get(entry['image'])
+    # A generated image that is neither dirty nor packed lost its pixels when the file was reloaded
+    return image is not None and bool(image.is_dirty or image.packed_file or image.source != 'GENERATED')
+
+
+def record(set_name: str, mode: str, fingerprint: str, image_name: str):
+    scene = bpy.context.scene
+    if STORE_KEY not in scene:
+        scene[STORE_KEY] = {}
+    scene[STORE_KEY][f"{set_name}/{mode}"] = {'fingerprint': fingerprint, 'image': image_name}
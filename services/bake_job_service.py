@@ -0,0 +1,220 @@
+# SPDX-License-Identifier: GPL-3.0-or-later
+"""
+Headless baking from a JSON job manifest, for render farms:
+
+    blender -b scene.blend --python-expr "from bl_ext.user_default.textools.services import bake_job_service; bake_job_service.main()" -- job.json
+
+Manifest:
+
+    {
+        "jobs": [{
+            "objects": ["chair_low", "chair_high"],
+            "sets": [{"name": "chair", "low": ["chair_low"], "high": ["chair_high"], "cage": [], "float": []}],
+            "modes": ["normal_tangent", "ao"],
+            "size": [2048, 2048], "samples": 64, "sampling": 2, "padding": 4,
+            "ray_distance": 0.0, "cage_extrusion": 0.0, "bake_force": "None", "isolate": true, "autosave": false,
+            "output": "//bake/{set}_{mode}.png"
+        }],
+        "report": "//bake/report.json"
+    }
+
+A job either lists "objects", grouped into bake sets by name like the Bake panel does, or explicit "sets".
+Everything but "modes" and "output" is optional and falls back to the scene settings.
+"""
+
+import json
+import os
+import sys
+import time
+from typing import Any
+
+import bpy
+
+from .. import op_bake
+from .. import settings
+from .. import utilities_bake as ub
+from . import bake_fingerprint_service
+from . import bake_writer_service
+from ..settings import tt_settings
+
+FILE_FORMATS = {'.png': 'PNG', '.exr': 'OPEN_EXR', '.tga': 'TARGA', '.tif': 'TIFF', '.tiff': 'TIFF', '.jpg': 'JPEG'}
+
+
+class Reporter:
+    """Collects the messages op_bake.bake reports through its operator."""
+
+    def __init__(self):
+        self.messages = []
+
+    def report(self, kind, message):
+        self.messages.append(f"{'/'.join(sorted(kind))}: {message}")
+
+
+def load_manifest(path: str) -> dict:
+    with open(bpy.path.abspath(path), encoding='utf-8') as file:
+        return json.load(file)
+
+
+def build_sets(job: dict) -> list[ub.BakeSet]:
+    """Bake sets of a job, explicit or detected from the job objects with the Bake panel rules."""
+    objects = bpy.data.objects
+    if 'sets' in job:
+        return [ub.BakeSet(entry['name'], *[[objects[name] for name in entry.get(kind, [])]
+                                            for kind in ('low', 'cage', 'high', 'float')])
+                for entry in job['sets']]
+
+    bpy.ops.object.select_all(action='DESELECT')
+    for name in job.get('objects', []):
+        objects[name].select_set(True)
+    return ub.get_bake_sets()
+
+
+def apply_settings(job: dict):
+    """Scene bake settings of a job, the ones it leaves out keep their current value."""
+    tool = tt_settings()
+    if 'size' in job:
+        tool.size = job['size']
+    if 'samples' in job:
+        tool.bake_samples = job['samples']
+    if 'sampling' in job:
+        tool.bake_sampling = str(job['sampling'])
+    if 'padding' in job:
+        tool.padding = job['padding']
+    if 'ray_distance' in job:
+        tool.bake_ray_distance = job['ray_distance']
+    if 'cage_extrusion' in job:
+        tool.bake_cage_extrusion = job['cage_extrusion']
+    if 'bake_force' in job:
+        tool.bake_force = job['bake_force']
+    if 'isolate' in job:
+        tool.bake_isolate = job['isolate']
+    if 'autosave' in job:
+        tool.bake_autosave = job['autosave']
+
+
+def texture_names(sets: list[ub.BakeSet], mode: str, bake_force: str) -> list[tuple[str, str]]:
+    """(set name, image name) of every image a mode bakes, like op_bake.bake names them."""
+    if bake_force == "Single":
+        return [(sets[0].name, f"{sets[0].name}_{mode}")]
+    return [(bset.name, f"{bset.name}_{mode}") for bset in sets]
+
+
+def save_image(image: bpy.types.Image, path: str):
+    extension = os.path.splitext(path)[1].lower()
+    os.makedirs(os.path.dirname(bpy.path.abspath(path)) or '.', exist_ok=True)
+    image.filepath_raw = path
+    image.file_format = FILE_FORMATS.get(extension, 'PNG')
+    image.save()
+
+
+def run_job(job: dict) -> dict[str, Any]:
+    """Bakes one job and saves its images, returns its report entry."""
+    start = time.perf_counter()
+    reporter = Reporter()
+    result = {'modes': job['modes'], 'status': 'FINISHED', 'messages': reporter.messages, 'images': []}
+
+    apply_settings(job)
+    sets = build_sets(job)
+    result['sets'] = [bset.name for bset in sets]
+    settings.sets = sets
+
+    op_bake.update_transmission_mode()
+    for mode in job['modes']:
+        if mode not in op_bake.modes:
+            reporter.report({'ERROR'}, f"Unknown mode '{mode}'")
+        elif not op_bake.is_mode_ready(mode):
+            reporter.report({'ERROR'}, f"Mode '{mode}': {settings.bake_error}")
+    if not sets or reporter.messages:
+        result['status'] = 'CANCELLED'
+        result['seconds'] = round(time.perf_counter() - start, 3)
+        return result
+
+    # bake() restores the selection and the mode of the active object once finished
+    low = sets[0].objects_low
+    bpy.context.view_layer.objects.active = low[0] if low else None
+    selected = list(bpy.context.selected_objects)
+    active = bpy.context.view_layer.objects.active
+
+    op_bake.setup_bake_scene()
+    circular_report = [False]
+    color_report = [False]
+    skipped_report = [0]
+    cache_report = [0, 0]
+    cancelled = op_bake.bake(
+        self=reporter,
+        bake_modes=job['modes'],
+        size=tt_settings().size,
+        bake_force=tt_settings().bake_force,
+        sampling_scale=int(tt_settings().bake_sampling),
+        circular_report=circular_report,
+        color_report=color_report,
+        selected=selected,
+        active=active,
+        pre_selection_mode=active.mode if active else None,
+        skipped_report=skipped_report,
+        cache_report=cache_report
+    )
+    result['skipped'] = skipped_report[0]
+    result['cache_hits'], result['cache_misses'] = cache_report
+    if cancelled == {'CANCELLED'}:
+        result['status'] = 'CANCELLED'
+    if color_report[0]:
+        reporter.report({'WARNING'}, color_report[0])
+
+    for mode in job['modes']:
+        for set_name, image_name in texture_names(sets, mode, tt_settings().bake_force):
+            entry = {'set': set_name, 'mode': mode, 'image': image_name, 'path': None}
+            image = bpy.data.images.get(image_name)
+            if image is None:
+                result['status'] = 'FAILED'
+            else:
+                entry['path'] = job['output'].format(set=set_name, mode=mode, image=image_name)
+                save_image(image, entry['path'])
+                # Recorded in the scene of this process, handed over for a dispatching file to record in its own
+                last = bake_fingerprint_service.last_bake(set_name, mode)
+                if last and last['image'] == image_name and result['status'] == 'FINISHED':
+                    entry['fingerprint'] = last['fingerprint']
+            result['images'].append(entry)
+
+    result['seconds'] = round(time.perf_counter() - start, 3)
+    return result
+
+
+def run_manifest(manifest: dict) -> dict[str, Any]:
+    """Bakes every job of a manifest. A failing job is reported and the next jobs still run."""
+    start = time.perf_counter()
+    report = {'blend': bpy.data.filepath, 'jobs': []}
+    for job in manifest['jobs']:
+        try:
+            report['jobs'].append(run_job(job))
+        except Exception as error:
+            report['jobs'].append({'modes': job.get('modes'), 'status': 'FAILED', 'messages': [repr(error)]})
+    # Background Blender has no timers to follow the saves of the Save bake setting
+    for error in bake_writer_service.wait():
+        report.setdefault('messages', []).append(error)
+    report['seconds'] = round(time.perf_counter() - start, 3)
+    return report
+
+
+def main(argv: list[str] | None = None):
+    """
+    Command line entry point: the manifest path follows '--' in the Blender arguments.
+    The report is printed as one JSON line, and also written to the manifest "report" path if set.
+    Exits with status 1 when any job did not finish.
+    """
+    if argv is None:
+        argv = sys.argv[sys.argv.index('--') + 1:] if '--' in sys.argv else []
+    if not argv:
+        raise SystemExit("Usage: blender -b file.blend --python-expr ... -- job.json")
+
+    manifest = load_manifest(argv[0])
+    report = run_manifest(manifest)
+    print(json.dumps(report))
+    if manifest.get('report'):
+        path = bpy.path.abspath(manifest['report'])
+        os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+        with open(path, 'w', encoding='utf-8') as file:
+            json.dump(report, file, indent=2)
+
+    if any(job['status'] != 'FINISHED' for job in report['jobs']):
+        sys.exit(1)
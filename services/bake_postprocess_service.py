@@ -0,0 +1,138 @@
+# SPDX-License-Identifier: GPL-3.0-or-later
+"""
+Post-processing of baked images on their pixel buffers, read with foreach_get and written back with
+foreach_set, so it runs headless and without the Image Editor context bpy.ops.image needs.
+Supersampled bakes are downsampled with a box or Lanczos filter, in linear space for color images.
+"""
+
+import bpy
+import numpy as np
+
+LANCZOS_LOBES = 3
+
+
+def read(image: bpy.types.Image) -> np.ndarray:
+    """Pixels of an image as a (height, width, channels) float32 array, bottom row first."""
+    width, height = image.size
+    pixels = np.empty(width * height * image.channels, dtype=np.float32)
+    image.pixels.foreach_get(pixels)
+    return pixels.reshape(height, width, image.channels)
+
+
+def write(image: bpy.types.Image, pixels: np.ndarray):
+    """Writes pixels back to an image, resized first when their size differs."""
+    height, width = pixels.shape[:2]
+    if tuple(image.size) != (width, height):
+        image.scale(width, height)
+    image.pixels.foreach_set(np.ascontiguousarray(pixels, dtype=np.float32).ravel())
+    image.update()
+
+
+def invert(pixels: np.ndarray):
+    """Inverts the color channels in place, leaving alpha like bpy.ops.image.invert does."""
+    color = pixels[..., :3]
+    np.subtract(1.0, color, out=color)
+
+
+def clamp(pixels: np.ndarray, low: np.ndarray | float | None, high: np.ndarray | float | None):
+    """Clamps the pixels in place, a None bound is left open."""
+    np.clip(pixels, low, high, out=pixels)
+
+
+def linear_to_srgb(values: np.ndarray) -> np.ndarray:
+    values = np.clip(values, 0.0, None)
+    return np.where(values <= 0.0031308, values * 12.92, 1.055 * np.power(values, 1 / 2.4) - 0.055)
+
+
+def srgb_to_linear(values: np.ndarray) -> np.ndarray:
+    return np.where(values <= 0.04045, values / 12.92, np.power((values + 0.055) / 1.055, 2.4))
+
+
+def filter_taps(factor: int, kind: str) -> tuple[np.ndarray, np.ndarray]:
+    """
+    Offsets and normalized weights of the input pixels every output pixel of a downsample by factor averages,
+    relative to the first input pixel it covers.
+    """
+    center = (factor - 1) / 2
+    radius = factor * (LANCZOS_LOBES if kind == 'LANCZOS' else 0.5)
+    offsets = np.arange(int(np.floor(center - radius)) + 1, int(np.ceil(center + radius)))
+    x = (offsets - center) / factor
+    if kind == 'LANCZOS':
+        weights = np.sinc(x) * np.sinc(x / LANCZOS_LOBES)
+    else:
+        weights = np.ones(len(offsets))
+    keep = np.abs(x) < radius / factor
+    offsets, weights = offsets[keep], weights[keep]
+    return offsets, (weights / weights.sum()).astype(np.float32)
+
+
+def downsample(pixels: np.ndarray, factor: int, kind: str = 'LANCZOS') -> np.ndarray:
+    """
+    Pixels reduced by an integer factor with a separable box or Lanczos filter, edges clamped.
+    Each pass only allocates its output, already factor times smaller than its input.
+    """
+    for axis in (1, 0):
+        pixels = _downsample_axis(pixels, factor, kind, axis)
+    return pixels
+
+
+def _downsample_axis(pixels: np.ndarray, factor: int, kind: str, axis: int) -> np.ndarray:
+    size = pixels.shape[axis]
+    count = size // factor
+    offsets, weights = filter_taps(factor, kind)
+    first = np.arange(count) * factor
+
+    shape = list(pixels.shape)
+    shape[axis] = count
+    result = np.zeros(shape, dtype=np.float32)
+    tap = np.empty(shape, dtype=np.float32)
+    for offset, weight in zip(offsets, weights):
+        np.take(pixels, np.clip(first + offset, 0, size - 1), axis=axis, out=tap)
+        tap *= weight
+        result += tap
+    return result
+
+
+def postprocess(image: bpy.types.Image, factor: int = 1, inverted: bool = False, kind: str = 'LANCZOS'):
+    """
+    Finishes a baked image in one read and one write: inverts it, and downsamples it by factor when it was
+    baked supersampled. Byte color images are filtered in linear space, and the result is clamped to the range
+    of the bake so the negative lobes of Lanczos don't ring past it. Only the first tile of a UDIM image is
+    inverted, and it is downsampled with image.scale.
+    """
+    if not inverted and factor <= 1:
+        return
+    if image.source == 'TILED':
+        # Pixel buffers only hold the first tile of a UDIM image, the other tiles are left as baked
+        if inverted:
+            pixels = read(image)
+            invert(pixels)
+            write(image, pixels)
+        if factor > 1:
+            image.scale(image.size[0] // factor, image.size[1] // factor)
+        return
+
+    pixels = read(image)
+    if inverted:
+        invert(pixels)
+    if factor > 1:
+        pixels = reduce(pixels, factor, kind, is_encoded(image))
+    write(image, pixels)
+
+
+def is_encoded(image: bpy.types.Image) -> bool:
+    """Whether the pixels of an image hold sRGB encoded colors, rather than linear or non-color values."""
+    return not image.is_float and not image.colorspace_settings.is_data
+
+
+def reduce(pixels: np.ndarray, factor: int, kind: str, encoded: bool) -> np.ndarray:
+    """Downsampled pixels, filtered in linear space when encoded and clamped to the range of the input."""
+    low = pixels.min(axis=(0, 1))
+    high = pixels.max(axis=(0, 1))
+    if encoded:
+        pixels[..., :3] = srgb_to_linear(pixels[..., :3])
+    pixels = downsample(pixels, factor, kind)
+    if encoded:
+        pixels[..., :3] = linear_to_srgb(pixels[..., :3])
+    clamp(pixels, low, high)
+    return pixels
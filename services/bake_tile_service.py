@@ -0,0 +1,55 @@
+# SPDX-License-Identifier: GPL-3.0-or-later
+"""
+Tiling of supersampled bakes too large to render at once. The output image is split into a grid of tiles;
+every tile is rendered on its own through a UV layer that maps it, with an overlap, onto the whole bake image,
+then downsampled and cropped into the output pixels.
+"""
+
+import math
+from typing import NamedTuple
+
+import numpy as np
+
+
+class Tile(NamedTuple):
+    """Output pixel bounds of a tile, end excluded, and the overlap rendered around it."""
+
+    x0: int
+    y0: int
+    x1: int
+    y1: int
+    overlap: int
+
+    def render_size(self, factor: int) -> tuple[int, int]:
+        """Width and height of the supersampled render of the tile and its overlap."""
+        return ((self.x1 - self.x0 + 2 * self.overlap) * factor,
+                (self.y1 - self.y0 + 2 * self.overlap) * factor)
+
+
+def tile_grid(width: int, height: int, factor: int, max_render_size: int, overlap: int) -> list[Tile] | None:
+    """
+    Tiles covering a width x height output baked with factor supersampling, each rendering at most about
+    max_render_size pixels on a side. None when the whole bake fits in a single render.
+    """
+    if max_render_size <= 0 or max(width, height) * factor <= max_render_size:
+        return None
+    columns = math.ceil(width * factor / max_render_size)
+    rows = math.ceil(height * factor / max_render_size)
+    xs = np.linspace(0, width, columns + 1).round().astype(int)
+    ys = np.linspace(0, height, rows + 1).round().astype(int)
+    return [Tile(int(xs[c]), int(ys[r]), int(xs[c + 1]), int(ys[r + 1]), overlap)
+            for r in range(rows) for c in range(columns)]
+
+
+def tile_uv(uv: np.ndarray, tile: Tile, width: int, height: int) -> np.ndarray:
+    """UVs (n, 2) of the output image mapped so the tile and its overlap cover the whole 0-1 range."""
+    origin = np.array([(tile.x0 - tile.overlap) / width, (tile.y0 - tile.overlap) / height], dtype=np.float32)
+    extent = np.array([(tile.x1 - tile.x0 + 2 * tile.overlap) / width,
+                       (tile.y1 - tile.y0 + 2 * tile.overlap) / height], dtype=np.float32)
+    return (uv - origin) / extent
+
+
+def place(pixels: np.ndarray, tile_pixels: np.ndarray, tile: Tile):
+    """Copies the downsampled pixels of a tile, without its overlap, into the output pixels (bottom row first)."""
+    o = tile.overlap
+    pixels[tile.y0:tile.y1, tile.x0:tile.x1] = tile_pixels[o:o + tile.y1 - tile.y0, o:o + tile.x1 - tile.x0]
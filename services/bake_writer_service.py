@@ -0,0 +1,183 @@
+# SPDX-License-Identifier: GPL-3.0-or-later
+"""
+Saves baked images without blocking the UI. The pixels are copied out of the image on the main thread,
+then encoded and written by a thread pool: PNG with zlib, 8 bit for byte images and 16 bit for float ones,
+or uncompressed 32 bit float OpenEXR. A timer follows the writes and shows their progress in the Bake panel.
+"""
+
+import os
+import struct
+import zlib
+from concurrent.futures import Future, ThreadPoolExecutor, wait as wait_futures
+from typing import NamedTuple
+
+import bpy
+import numpy as np
+
+from .. import settings
+from . import bake_postprocess_service
+
+POLL_INTERVAL = 0.5
+STATUS_SECONDS = 10.0
+
+
+class Write(NamedTuple):
+    """An image being written in the background."""
+
+    name: str
+    path: str
+    future: Future
+
+
+_executor: ThreadPoolExecutor | None = None
+_writes: list[Write] = []
+
+
+def save_async(image: bpy.types.Image, path: str) -> Future:
+    """
+    Writes the pixels of an image to path in the background, as OpenEXR for a .exr path and PNG otherwise.
+    A path without extension gets .exr for float images and .png for byte ones.
+    """
+    global _executor
+    # Blender stores the bottom row first, image files the top one
+    rgba = _rgba(bake_postprocess_service.read(image))[::-1]
+
+    if not os.path.splitext(path)[1]:
+        path += '.exr' if image.is_float else '.png'
+    if path.lower().endswith('.exr'):
+        if not image.is_float and not image.colorspace_settings.is_data:
+            rgba[..., :3] = bake_postprocess_service.srgb_to_linear(rgba[..., :3])
+        encode, args = encode_exr, (rgba,)
+    else:
+        if image.is_float and not image.colorspace_settings.is_data:
+            rgba[..., :3] = bake_postprocess_service.linear_to_srgb(rgba[..., :3])
+        encode, args = encode_png, (rgba, 16 if image.is_float else 8)
+
+    if _executor is None:
+        _executor = ThreadPoolExecutor(max_workers=min(4, os.cpu_count() or 1), thread_name_prefix='textools_save')
+    future = _executor.submit(_write, path, encode, args)
+    if not _writes:
+        bpy.app.timers.register(_poll, first_interval=POLL_INTERVAL)
+    _writes.append(Write(image.name, path, future))
+    _set_status(f"Saving {len(_writes)} baked images")
+    return future
+
+
+def wait() -> list[str]:
+    """Blocks until every pending write is done, for background runs without timers. Returns the errors."""
+    wait_futures([write.future for write in _writes])
+    return _finish()
+
+
+def _write(path: str, encode, args):
+    data = encode(*args)
+    os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+    temp_path = f"{path}.{os.getpid()}.tmp"
+    with open(temp_path, 'wb') as file:
+        file.write(data)
+    os.replace(temp_path, path)
+
+
+def _poll():
+    done = sum(write.future.done() for write in _writes)
+    if done < len(_writes):
+        _set_status(f"Saving baked images {done}/{len(_writes)}")
+        return POLL_INTERVAL
+    _finish()
+    return None
+
+
+def _finish() -> list[str]:
+    errors = [f"{write.name}: {write.future.exception()}" for write in _writes if write.future.exception()]
+    for error in errors:
+        print("Saving baked image failed", error)
+    for write in _writes:
+        if not write.future.exception():
+            print("Saved", write.path)
+    if _writes:
+        status = f"Saved {len(_writes) - len(errors)} baked images"
+        _set_status(status + (f", {len(errors)} failed, see the console" if errors else ""))
+        bpy.app.timers.register(_clear_status, first_interval=STATUS_SECONDS)
+    _writes.clear()
+    return errors
+
+
+def _clear_status():
+    if not _writes:
+        _set_status('')
+
+
+def _set_status(text: str):
+    settings.bake_save_status = text
+    window_manager = bpy.context.window_manager
+    for window in window_manager.windows if window_manager else []:
+        for area in window.screen.areas:
+            if area.type in {'IMAGE_EDITOR', 'VIEW_3D'}:
+                area.tag_redraw()
+
+
+def _rgba(pixels: np.ndarray) -> np.ndarray:
+    """(height, width, 4) pixels from pixels with 1 to 4 channels."""
+    channels = pixels.shape[2]
+    if channels == 4:
+        return pixels
+    rgba = np.ones(pixels.shape[:2] + (4,), dtype=np.float32)
+    rgba[..., :3] = pixels[..., :1] if channels < 3 else pixels[..., :3]
+    if channels == 2:
+        rgba[..., 3] = pixels[..., 1]
+    return rgba
+
+
+def encode_png(rgba: np.ndarray, bits: int = 8) -> bytes:
+    """PNG of (height, width, 4) values in 0..1, top row first, with the Up filter on every row."""
+    height, width = rgba.shape[:2]
+    scale, dtype = (65535, '>u2') if bits == 16 else (255, np.uint8)
+    rows = (np.clip(rgba, 0, 1) * scale + 0.5).astype(dtype).reshape(height, -1).view(np.uint8)
+
+    filtered = np.empty((height, rows.shape[1] + 1), dtype=np.uint8)
+    filtered[:, 0] = 2  # Up: every byte minus the byte above it
+    filtered[0, 1:] = rows[0]
+    filtered[1:, 1:] = rows[1:] - rows[:-1]
+
+    def chunk(kind, data):
+        return struct.pack('>I', len(data)) + kind + data + struct.pack('>I', zlib.crc32(kind + data))
+
+    return b''.join((
+        b'\x89PNG\r\n\x1a\n',
+        chunk(b'IHDR', struct.pack('>IIBBBBB', width, height, bits, 6, 0, 0, 0)),
+        chunk(b'IDAT', zlib.compress(filtered.tobytes(), 6)),
+        chunk(b'IEND', b''),
+    ))
+
+
+def encode_exr(rgba: np.ndarray) -> bytes:
+    """Uncompressed scanline OpenEXR of (height, width, 4) floats, top row first, channels stored as 32 bit floats."""
+    height, width = rgba.shape[:2]
+
+    def attribute(name, kind, value):
+        return name.encode() + b'\0' + kind.encode() + b'\0' + struct.pack('<i', len(value)) + value
+
+    channels = b''.join(name + b'\0' + struct.pack('<iB3xii', 2, 0, 1, 1) for name in (b'A', b'B', b'G', b'R'))
+    window = struct.pack('<iiii', 0, 0, width - 1, height - 1)
+    header = b''.join((
+        struct.pack('<ii', 20000630, 2),
+        attribute('channels', 'chlist', channels + b'\0'),
+        attribute('compression', 'compression', b'\0'),
+        attribute('dataWindow', 'box2i', window),
+        attribute('displayWindow', 'box2i', window),
+        attribute('lineOrder', 'lineOrder', b'\0'),
+        attribute('pixelAspectRatio', 'float', struct.pack('<f', 1.0)),
+        attribute('screenWindowCenter', 'v2f', struct.pack('<ff', 0.0, 0.0)),
+        attribute('screenWindowWidth', 'float', struct.pack('<f', 1.0)),
+        b'\0',
+    ))
+
+    # One block per scanline: y, data size, then the row of every channel in A, B, G, R order
+    row_size = width * 4 * 4
+    blocks = np.empty((height, 8 + row_size), dtype=np.uint8)
+    blocks[:, :8] = np.stack((np.arange(height), np.full(height, row_size)), axis=1).astype('<i4').view(np.uint8)
+    planes = np.ascontiguousarray(rgba[..., ::-1].transpose(0, 2, 1), dtype='<f4')
+    blocks[:, 8:] = planes.reshape(height, -1).view(np.uint8)
+
+    offsets = len(header) + 8 * height + np.arange(height, dtype=np.uint64) * (8 + row_size)
+    return header + offsets.astype('<u8').tobytes() + blocks.tobytes()
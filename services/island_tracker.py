@@ -0,0 +1,123 @@
+# SPDX-License-Identifier: GPL-3.0-or-later
+
+from typing import NamedTuple
+
+import numpy as np
+from bpy.types import Object
+
+from . import uv_array_service as uas
+
+
+class _Snapshot(NamedTuple):
+    """Mesh state and island partition of the last query of one object and UV layer."""
+
+    vert: np.ndarray
+    edge: np.ndarray
+    face_start: np.ndarray
+    partner: np.ndarray
+    keys: np.ndarray  # quantized UVs
+    connected: np.ndarray
+    face_mask: np.ndarray
+    labels: np.ndarray
+
+
+# (object name, UV layer name) -> snapshot of the last query
+_snapshots: dict[tuple[str, str], _Snapshot] = {}
+
+
+def island_labels(obj: Object, uv_layer_name: str, arrays: uas.LoopArrays, face_mask: np.ndarray) -> np.ndarray:
+    """
+    Same labels as uv_array_service.island_labels, kept up to date between calls instead of rebuilt:
+    the UVs and the face mask are diffed against the last query of the object, and only the islands
+    touching a changed face are split or merged again. A topology change rebuilds the whole partition.
+    """
+    key = (obj.name, uv_layer_name)
+    snapshot = _snapshots.get(key)
+    keys = uas.quantize(arrays.uv)
+
+    if snapshot is None or not _same_topology(snapshot, arrays):
+        partner = uas.radial_partner(arrays)
+        connected = uas.uv_connected(arrays, partner, keys)
+        labels = uas.island_labels(arrays, face_mask, partner, connected)
+        _snapshots[key] = _Snapshot(arrays.vert, arrays.edge, arrays.face_start, partner, keys, connected,
+                                    face_mask.copy(), labels)
+        return labels.copy()
+
+    moved = np.flatnonzero((keys != snapshot.keys).any(axis=1))
+    changed = np.zeros(len(face_mask), dtype=bool)
+    changed[arrays.face[moved]] = True
+    changed |= face_mask != snapshot.face_mask
+    if not changed.any():
+        return snapshot.labels.copy()
+
+    connected, labels = _patch(snapshot, arrays, keys, face_mask, changed)
+    _snapshots[key] = snapshot._replace(keys=keys, connected=connected, face_mask=face_mask.copy(), labels=labels)
+    return labels.copy()
+
+
+def _same_topology(snapshot: _Snapshot, arrays: uas.LoopArrays) -> bool:
+    return (np.array_equal(snapshot.vert, arrays.vert) and np.array_equal(snapshot.edge, arrays.edge)
+            and np.array_equal(snapshot.face_start, arrays.face_start))
+
+
+def _patch(snapshot: _Snapshot, arrays: uas.LoopArrays, keys: np.ndarray, face_mask: np.ndarray,
+           changed: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+    """UV connectivity and labels with the islands around the changed faces labelled again."""
+    partner = snapshot.partner
+    changed_faces = np.flatnonzero(changed)
+    changed_loops = _face_loops(arrays, changed_faces)
+    across = partner[changed_loops]
+    across = across[across >= 0]
+
+    # Only the edges of the changed faces can have been split or welded
+    touched = np.concatenate((changed_loops, across))
+    connected = snapshot.connected.copy()
+    connected[touched] = uas.uv_connected(arrays, partner, keys, touched)[touched]
+
+    # Faces whose island may differ: the old islands of the changed faces and of their neighbours,
+    # and those faces themselves
+    labels = snapshot.labels.copy()
+    near = np.concatenate((changed_faces, arrays.face[across]))
+    stale = np.zeros(len(labels) + 1, dtype=bool)  # the spare last entry stays False for label -1
+    stale[labels[near][labels[near] >= 0]] = True
+    region = stale[labels]
+    region[near] = True
+    region &= face_mask
+    labels[stale[labels]] = -1
+    labels[~face_mask] = -1
+
+    faces = np.flatnonzero(region)
+    loops = _face_loops(arrays, faces)
+    links = loops[connected[loops]]
+    links = links[region[arrays.face[partner[links]]]]
+    local = np.full(len(region), -1, dtype=np.int64)
+    local[faces] = np.arange(len(faces))
+    components = uas.connected_components(len(faces), local[arrays.face[links]], local[arrays.face[partner[links]]])
+    labels[faces] = components + (labels.max() + 1 if len(labels) else 0)
+    return connected, _canonical(labels)
+
+
+def _face_loops(arrays: uas.LoopArrays, faces: np.ndarray) -> np.ndarray:
+    size = arrays.face_size[faces]
+    return np.repeat(arrays.face_start[faces] - np.cumsum(size) + size, size) + np.arange(size.sum())
+
+
+def _canonical(labels: np.ndarray) -> np.ndarray:
+    """Labels renumbered 0..n-1 in the order of the first face of every island, like a full rebuild."""
+    faces = np.flatnonzero(labels >= 0)
+    if not len(faces):
+        return labels
+    islands, first = np.unique(labels[faces], return_index=True)
+    rank = np.empty(labels.max() + 1, dtype=np.int64)
+    rank[islands[np.argsort(first)]] = np.arange(len(islands))
+    labels[faces] = rank[labels[faces]]
+    return labels
+
+
+def forget(obj: Object | None = None):
+    """Drops the snapshots of one object, or of all of them."""
+    if obj is None:
+        _snapshots.clear()
+    else:
+        for key in [key for key in _snapshots if key[0] == obj.name]:
+            del _snapshots[key]
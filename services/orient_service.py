@@ -0,0 +1,151 @@
+# SPDX-License-Identifier: GPL-3.0-or-later
+
+from typing import NamedTuple
+
+import numpy as np
+
+
+class Hulls(NamedTuple):
+    """Convex hulls of many point groups, flattened: hull i is points[offsets[i]:offsets[i + 1]], counter-clockwise."""
+
+    points: np.ndarray  # (H, 2)
+    offsets: np.ndarray  # (G + 1,)
+
+
+def convex_hulls(points: np.ndarray, group: np.ndarray, n_groups: int) -> Hulls:
+    """
+    Convex hull of the points of every group, all groups at once: points inside the quadrilateral
+    of their group's extreme points are dropped first, then a monotone chain runs on all groups in lockstep.
+    """
+    if not len(points):
+        return Hulls(np.empty((0, 2)), np.zeros(n_groups + 1, dtype=np.int64))
+
+    keep = ~_inside_extremes(points, group, n_groups)
+    points, group = points[keep], group[keep]
+
+    order = np.lexsort((points[:, 1], points[:, 0], group))
+    points, group = points[order], group[order]
+    size = np.bincount(group, minlength=n_groups)
+    start = np.cumsum(size) - size
+
+    lower, lower_size = _half_hulls(points, start, size, reverse=False)
+    upper, upper_size = _half_hulls(points, start, size, reverse=True)
+
+    # Each half hull ends where the other one starts, single points keep their only point
+    lower_size = np.where(size > 1, lower_size - 1, size)
+    upper_size = np.where(size > 1, upper_size - 1, 0)
+    hull_size = lower_size + upper_size
+    offsets = np.concatenate(([0], np.cumsum(hull_size)))
+
+    hull = np.empty((offsets[-1], 2))
+    hull_group = np.repeat(np.arange(n_groups), hull_size)
+    local = np.arange(offsets[-1]) - offsets[hull_group]
+    from_lower = local < lower_size[hull_group]
+    hull[from_lower] = lower[start[hull_group[from_lower]] + local[from_lower]]
+    upper_local = local[~from_lower] - lower_size[hull_group[~from_lower]]
+    hull[~from_lower] = upper[start[hull_group[~from_lower]] + upper_local]
+    return Hulls(hull, offsets)
+
+
+def _inside_extremes(points: np.ndarray, group: np.ndarray, n_groups: int) -> np.ndarray:
+    """Points strictly inside the left-bottom-right-top quadrilateral of their group (Akl-Toussaint)."""
+    corners = []
+    for axis, sign in ((0, 1), (1, 1), (0, -1), (1, -1)):
+        value = points[:, axis] * sign
+        order = np.lexsort((value, group))
+        first = np.searchsorted(group[order], np.arange(n_groups))
+        corners.append(points[order[np.minimum(first, len(order) - 1)]])
+
+    inside = np.ones(len(points), dtype=bool)
+    for i in range(4):
+        a = corners[i][group]
+        b = corners[(i + 1) % 4][group]
+        inside &= _cross(a, b, points) > 0
+    return inside
+
+
+def _half_hulls(points: np.ndarray, start: np.ndarray, size: np.ndarray, reverse: bool) -> tuple[np.ndarray, np.ndarray]:
+    """
+    Lower (or upper when reverse) monotone chain of every group of the sorted points,
+    stored at the group's start in the returned array, with the chain length of every group.
+    """
+    stack = np.empty_like(points)
+    top = np.zeros(len(size), dtype=np.int64)
+    for step in range(size.max() if len(size) else 0):
+        active = np.flatnonzero(size > step)
+        index = start[active] + (size[active] - 1 - step if reverse else step)
+        point = points[index]
+        while True:
+            turning = top[active] >= 2
+            pop = np.zeros(len(active), dtype=bool)
+            rows = np.flatnonzero(turning)
+            if len(rows):
+                base = start[active[rows]] + top[active[rows]]
+                pop[rows] = _cross(stack[base - 2], stack[base - 1], point[rows]) <= 0
+            if not pop.any():
+                break
+            top[active[pop]] -= 1
+        stack[start[active] + top[active]] = point
+        top[active] += 1
+    return stack, top
+
+
+def _cross(o: np.ndarray, a: np.ndarray, b: np.ndarray) -> np.ndarray:
+    return (a[:, 0] - o[:, 0]) * (b[:, 1] - o[:, 1]) - (a[:, 1] - o[:, 1]) * (b[:, 0] - o[:, 0])
+
+
+def min_box_angles(points: np.ndarray, group: np.ndarray, n_groups: int) -> np.ndarray:
+    """
+    Rotation of every group, counter-clockwise in radians, that gives its points their minimal-area
+    axis-aligned bounds, like mathutils.geometry.box_fit_2d snapped by find_min_rotate_angle.
+    The box is found with rotating calipers: one side lies on an edge of the group's convex hull.
+    """
+    hulls = convex_hulls(points, group, n_groups)
+    hull_size = np.diff(hulls.offsets)
+    angles = np.zeros(n_groups)
+    if not len(hulls.points):
+        return angles
+
+    # Hull edges, closed per group
+    edge_group = np.repeat(np.arange(n_groups), hull_size)
+    local = np.arange(len(hulls.points)) - hulls.offsets[edge_group]
+    nxt = hulls.offsets[edge_group] + (local + 1) % hull_size[edge_group]
+    direction = hulls.points[nxt] - hulls.points[np.arange(len(hulls.points))]
+    length = np.linalg.norm(direction, axis=1)
+    valid = length > 0
+    direction = np.divide(direction, length[:, None], out=np.zeros_like(direction), where=valid[:, None])
+
+    # Every edge against every hull point of its group
+    pairs = hull_size[edge_group]
+    edge_of = np.repeat(np.arange(len(direction)), pairs)
+    point_of = hulls.offsets[edge_group][edge_of] + np.arange(pairs.sum()) - np.repeat(np.cumsum(pairs) - pairs, pairs)
+    p = hulls.points[point_of]
+    d = direction[edge_of]
+    u = p[:, 0] * d[:, 0] + p[:, 1] * d[:, 1]
+    v = p[:, 1] * d[:, 0] - p[:, 0] * d[:, 1]
+
+    first = np.cumsum(pairs) - pairs
+    area = (np.maximum.reduceat(u, first) - np.minimum.reduceat(u, first)) * \
+           (np.maximum.reduceat(v, first) - np.minimum.reduceat(v, first))
+    area[~valid] = np.inf
+
+    # First edge of minimal area in every group
+    order = np.lexsort((np.arange(len(area)), area, edge_group))
+    best = order[np.searchsorted(edge_group[order], np.arange(n_groups))[hull_size > 0]]
+    best = best[np.isfinite(area[best])]
+    angles[edge_group[best]] = snap_angles(-np.arctan2(direction[best, 1], direction[best, 0]))
+    return angles
+
+
+def snap_angles(angles: np.ndarray) -> np.ndarray:
+    """Vectorized utilities_uv.find_min_rotate_angle: the same orientation with the smallest turn, within +-45 degrees."""
+    return np.mod(angles + np.pi / 4, np.pi / 2) - np.pi / 4
+
+
+def rotate_groups(uv: np.ndarray, group: np.ndarray, angles: np.ndarray, pivots: np.ndarray | None = None) -> np.ndarray:
+    """Rotates every point counter-clockwise by the angle of its group, around the group pivot or the origin."""
+    c = np.cos(angles)[group]
+    s = np.sin(angles)[group]
+    local = uv if pivots is None else uv - pivots[group]
+    rotated = np.column_stack((c * local[:, 0] - s * local[:, 1], s * local[:, 0] + c * local[:, 1]))
+    return rotated if pivots is None else rotated + pivots[group]
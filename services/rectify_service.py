@@ -1,106 +1,170 @@
 # SPDX-License-Identifier: GPL-3.0-or-later
 
-import bmesh
-import bpy
-from bmesh.types import BMesh
+import numpy as np
 from bpy.types import Object
 
+from . import uv_array_service as uas
+from . import uv_boundary_service
 
-def align_uv_rectify(obj: Object, bm: BMesh, uv_layer_name: str, keep_bounds: bool = False):
+# Grid corners of the first loop to the fourth of an island's start quad
+QUAD_CORNERS = np.array(((0, 0), (1, 0), (1, 1), (0, 1)), dtype=np.int64)
+
+
+def align_uv_rectify(obj: Object, uv_layer_name: str, keep_bounds: bool = False,
+                     delimit=frozenset({'UV'}), face_mask: np.ndarray | None = None) -> bool:
     """
-    Rectify logic as a wrapper for Blender's native 'follow_active_quads'.
+    Lay the selected quads out on a rectangular grid, all islands at once.
+    Islands are walked from their active (or first) face, rows and columns get the average 3D length
+    of their edges. With keep_bounds each island is stretched onto its previous UV bounds,
+    otherwise it keeps the 3D proportions and its previous bottom-left corner.
+    Islands are split at UV borders and/or seams depending on delimit ({'UV', 'SEAM'}).
 
     NOTE: Only processes Quads. Triangles and N-gons are explicitly excluded
     to prevent UV layout distortion during normalization.
     """
-    mesh_data = obj.data
-    uv_layer = bm.loops.layers.uv.get(uv_layer_name)
-    if uv_layer is None:
+    if uv_layer_name not in obj.data.uv_layers:
         print(f"Error: UV layer '{uv_layer_name}' not found.")
         return False
 
-    all_selected = [f for f in bm.faces if f.select]
-    target_faces = [f for f in all_selected if len(f.verts) == 4]
-
-    if not target_faces:
-        return False
-
-    orig_bounds = _get_uv_bounds(target_faces, uv_layer) if keep_bounds else None
-
-    active_face = bm.faces.active
-    if not active_face or active_face not in target_faces:
-        active_face = target_faces[0]
-        bm.faces.active = active_face
-
-    loops = active_face.loops
-    loops[0][uv_layer].uv = (0, 0)
-    loops[1][uv_layer].uv = (1, 0)
-    loops[2][uv_layer].uv = (1, 1)
-    loops[3][uv_layer].uv = (0, 1)
-
-    bmesh.update_edit_mesh(mesh_data)
+    arrays = uas.read_loop_arrays(obj, uv_layer_name)
+    if face_mask is None:
+        face_mask = arrays.face_select
+    quads = face_mask & ~arrays.face_hide & (arrays.face_size == 4)
 
-    try:
-        bpy.ops.uv.follow_active_quads(mode="EVEN")
-    except RuntimeError:
+    if not quads.any():
         return False
 
-    returned_bmesh: BMesh = bmesh.from_edit_mesh(mesh_data)
-    uv_layer = returned_bmesh.loops.layers.uv.get(uv_layer_name)
-    selected_faces = [f for f in returned_bmesh.faces if f.select and len(f.verts) == 4]
+    partner = uas.radial_partner(arrays)
+    links = partner >= 0
+    if 'UV' in delimit:
+        links &= uas.uv_connected(arrays, partner)
+    if 'SEAM' in delimit:
+        links &= ~uv_boundary_service.read_edge_flag(obj, 'use_seam')[arrays.edge]
+
+    labels = uas.island_labels(arrays, quads, partner, links)
+    starts = _start_faces(labels, obj.data.polygons.active)
+    grid = _grid_coordinates(arrays, quads, partner, links, starts)
+
+    co = np.empty(len(obj.data.vertices) * 3, dtype=np.float64)
+    obj.data.vertices.foreach_get('co', co)
+    co = co.reshape(-1, 3)
+
+    loops = np.flatnonzero(quads[arrays.face])
+    island = labels[arrays.face[loops]]
+    positions = _grid_positions(arrays, co, island, grid, loops)
+
+    n_islands = labels.max() + 1
+    orig_min, orig_max = _island_bounds(island, n_islands, arrays.uv[loops])
+    new_min, new_max = _island_bounds(island, n_islands, positions)
+
+    if keep_bounds:
+        size = new_max - new_min
+        size[size == 0] = 1
+        positions = (positions - new_min[island]) / size[island] * (orig_max - orig_min)[island] + orig_min[island]
+    else:
+        positions = positions - new_min[island] + orig_min[island]
 
-    if not selected_faces:
-        return True
+    arrays.uv[loops] = positions
+    uas.commit_uvs(obj, arrays, loops, uv_layer_name)
+    return True
 
-    current_bounds = _get_uv_bounds(selected_faces, uv_layer)
-    if current_bounds:
-        _apply_uv_remap(selected_faces, uv_layer, current_bounds, orig_bounds)
 
-    bmesh.update_edit_mesh(mesh_data)
-    return True
+def _start_faces(labels: np.ndarray, active_face: int) -> np.ndarray:
+    """The active face for its island, the lowest face index for the others."""
+    faces = np.flatnonzero(labels >= 0)
+    starts = np.full(labels.max() + 1, len(labels), dtype=np.int64)
+    np.minimum.at(starts, labels[faces], faces)
+    if 0 <= active_face < len(labels) and labels[active_face] >= 0:
+        starts[labels[active_face]] = active_face
+    return starts
 
 
-def _get_uv_bounds(faces, uv_layer):
-    min_x, max_x = float("inf"), float("-inf")
-    min_y, max_y = float("inf"), float("-inf")
-    has_verts = False
-    for face in faces:
-        for loop in face.loops:
-            u, v = loop[uv_layer].uv
-            if u < min_x:
-                min_x = u
-            if u > max_x:
-                max_x = u
-            if v < min_y:
-                min_y = v
-            if v > max_y:
-                max_y = v
-            has_verts = True
-    return (min_x, max_x, min_y, max_y) if has_verts else None
-
-
-def _apply_uv_remap(faces, uv_layer, src_bounds, dst_bounds=None):
-    s_min_x, s_max_x, s_min_y, s_max_y = src_bounds
-    width = s_max_x - s_min_x
-    height = s_max_y - s_min_y
-    if width == 0:
-        width = 1
-    if height == 0:
-        height = 1
-
-    if dst_bounds:
-        d_min_x, d_max_x, d_min_y, d_max_y = dst_bounds
-        d_width = d_max_x - d_min_x
-        d_height = d_max_y - d_min_y
-        for face in faces:
-            for loop in face.loops:
-                u, v = loop[uv_layer].uv
-                loop[uv_layer].uv = (
-                    ((u - s_min_x) / width) * d_width + d_min_x,
-                    ((v - s_min_y) / height) * d_height + d_min_y,
-                )
-    else:
-        for face in faces:
-            for loop in face.loops:
-                u, v = loop[uv_layer].uv
-                loop[uv_layer].uv = ((u - s_min_x) / width, (v - s_min_y) / height)
+def _grid_coordinates(arrays: uas.LoopArrays, quads: np.ndarray, partner: np.ndarray, links: np.ndarray,
+                      starts: np.ndarray) -> np.ndarray:
+    """
+    Integer grid corner of every quad loop, by a breadth-first walk across quad strips run
+    on all islands at once. A face entered through edge A-B of a face A-B-C-D gets the
+    shared corners and the opposite ones extruded: 2A - D and 2B - C.
+    """
+    nxt = arrays.next
+    grid = np.zeros((len(arrays.vert), 2), dtype=np.int64)
+    visited = np.zeros(len(quads), dtype=bool)
+    visited[starts] = True
+    grid[arrays.face_start[starts][:, None] + np.arange(4)] = QUAD_CORNERS
+    corner_a, corner_b = uas.partner_corners(arrays, partner)
+
+    frontier = starts
+    while len(frontier):
+        loops = (arrays.face_start[frontier][:, None] + np.arange(4)).ravel()
+        loops = loops[links[loops]]
+        targets = arrays.face[partner[loops]]
+        entering = quads[targets] & ~visited[targets]
+        targets, first = np.unique(targets[entering], return_index=True)
+        loops = loops[entering][first]
+
+        a, b = grid[loops], grid[nxt[loops]]
+        c, d = grid[nxt[nxt[loops]]], grid[nxt[nxt[nxt[loops]]]]
+        ga, gb = corner_a[loops], corner_b[loops]
+        grid[ga] = a
+        grid[gb] = b
+        grid[nxt[nxt[ga]]] = 2 * b - c
+        grid[nxt[nxt[gb]]] = 2 * a - d
+
+        visited[targets] = True
+        frontier = targets
+
+    return grid
+
+
+def _grid_positions(arrays: uas.LoopArrays, co: np.ndarray, island: np.ndarray, grid: np.ndarray,
+                    loops: np.ndarray) -> np.ndarray:
+    """UV position of every grid corner, with each row and column as wide as its mean 3D edge length."""
+    corner = grid[loops]
+    corner_next = grid[arrays.next[loops]]
+    length = np.linalg.norm(co[arrays.vert[arrays.next[loops]]] - co[arrays.vert[loops]], axis=1)
+
+    positions = np.empty((len(loops), 2), dtype=np.float64)
+    for axis in (0, 1):
+        other = 1 - axis
+        along = (np.abs(corner_next[:, axis] - corner[:, axis]) == 1) & (corner_next[:, other] == corner[:, other])
+        low = np.minimum(corner[:, axis], corner_next[:, axis])
+        positions[:, axis] = _axis_positions(island, corner[:, axis], along, low, length)
+    return positions
+
+
+def _axis_positions(island: np.ndarray, coord: np.ndarray, along: np.ndarray, low: np.ndarray,
+                    length: np.ndarray) -> np.ndarray:
+    """
+    Positions of the integer grid lines of one axis: each interval between two lines gets the mean
+    length of the edges spanning it, and lines are placed by the cumulative sum of the intervals.
+    """
+    n_islands = island.max() + 1
+    lo = np.full(n_islands, np.iinfo(np.int64).max, dtype=np.int64)
+    hi = np.full(n_islands, np.iinfo(np.int64).min, dtype=np.int64)
+    np.minimum.at(lo, island, coord)
+    np.maximum.at(hi, island, coord)
+    span = hi - lo + 1
+    base = np.cumsum(span) - span
+
+    interval = base[island[along]] + low[along] - lo[island[along]]
+    total = np.bincount(interval, weights=length[along], minlength=span.sum())
+    count = np.bincount(interval, minlength=span.sum())
+
+    width = np.divide(total, count, out=np.zeros_like(total), where=count > 0)
+    known = (count > 0) & (width > 0)
+    width[~known] = width[known].mean() if known.any() else 1.0
+
+    # Exclusive running sum, restarted at each island's first line
+    offsets = np.cumsum(width) - width
+    line = base[island] + coord - lo[island]
+    return offsets[line] - offsets[base[island]]
+
+
+def _island_bounds(island: np.ndarray, n_islands: int, points: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+    """Per-island (min, max) corners of a set of UV points."""
+    lo = np.full((n_islands, 2), np.inf)
+    hi = np.full((n_islands, 2), -np.inf)
+    for axis in (0, 1):
+        np.minimum.at(lo[:, axis], island, points[:, axis])
+        np.maximum.at(hi[:, axis], island, points[:, axis])
+    return lo, hi
@@ -0,0 +1,65 @@
+# SPDX-License-Identifier: GPL-3.0-or-later
+
+import hashlib
+from typing import Any, Callable
+
+import numpy as np
+from bpy.types import Object
+
+from . import uv_array_service as uas
+
+# owner -> key -> (fingerprint, value), only the latest state of each key is kept
+_entries: dict[str, dict[str, tuple[str, Any]]] = {}
+
+
+def fingerprint(*parts) -> str:
+    """
+    Digest of arrays and plain values describing a mesh state.
+    Redo undoes the operator before running it again, so a redo sees the same digest as the first run.
+    """
+    digest = hashlib.blake2b(digest_size=16)
+    for part in parts:
+        if isinstance(part, np.ndarray):
+            digest.update(repr((part.dtype.str, part.shape)).encode())
+            digest.update(np.ascontiguousarray(part).tobytes())
+        else:
+            digest.update(repr(part).encode())
+    return digest.hexdigest()
+
+
+def mesh_state(obj: Object, uv_layer_name: str | None = None, *extra, arrays: uas.LoopArrays | None = None) -> str:
+    """
+    Fingerprint of the mesh/UV state an operator analyses: the UV array hash plus topology counts,
+    vertex positions, face visibility and UV selection, and any extra operator inputs.
+    Loop arrays already read by the caller are reused instead of reading the mesh again.
+    """
+    if arrays is None:
+        arrays = uas.read_loop_arrays(obj, uv_layer_name)
+    me = obj.data
+    co = np.empty(len(me.vertices) * 3, dtype=np.float32)
+    me.vertices.foreach_get('co', co)
+    return fingerprint(
+        len(me.vertices), len(me.edges), len(me.loops), len(me.polygons),
+        arrays.uv, co, arrays.face_select, arrays.face_hide, arrays.uv_select, arrays.uv_select_edge, *extra)
+
+
+def fetch(owner: str, key: str, state: str, compute: Callable[[], Any]) -> Any:
+    """
+    The value cached for (owner, key) if it was computed for the same state, else compute() cached
+    in its place. Cached values are shared between runs and must not be modified by the caller.
+    """
+    entries = _entries.setdefault(owner, {})
+    entry = entries.get(key)
+    if entry is not None and entry[0] == state:
+        return entry[1]
+    value = compute()
+    entries[key] = (state, value)
+    return value
+
+
+def clear(owner: str | None = None):
+    """Drops the cached values of one owner, or of all of them."""
+    if owner is None:
+        _entries.clear()
+    else:
+        _entries.pop(owner, None)
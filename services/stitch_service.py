@@ -0,0 +1,131 @@
+# SPDX-License-Identifier: GPL-3.0-or-later
+
+import bmesh
+import numpy as np
+from bpy.types import Object
+
+from . import uv_array_service as uas
+
+
+def stitch_selected(obj: Object, uv_layer_name: str, clear_seams=True) -> bool:
+    """
+    Stitch the islands on the other side of the selected UV edges to the selected islands.
+    Every target island is moved rigidly onto the shared edges, then its coincident loops are merged.
+    The selected islands stay in place and the UV selection is left untouched.
+    """
+    arrays = uas.read_loop_arrays(obj, uv_layer_name)
+    if not len(arrays.uv):
+        return False
+
+    partner = uas.radial_partner(arrays)
+    keys = uas.quantize(arrays.uv)
+    connected = uas.uv_connected(arrays, partner, keys)
+
+    visible = ~arrays.face_hide
+    labels = uas.island_labels(arrays, visible, partner, connected)
+    loop_island = labels[arrays.face]
+    partner_island = np.where(partner >= 0, labels[arrays.face[np.maximum(partner, 0)]], -1)
+
+    # Selected UV border edges that touch another visible island
+    stitch = (
+        arrays.uv_select_edge & arrays.face_select[arrays.face] & visible[arrays.face] &
+        ~connected & (partner_island >= 0) & (partner_island != loop_island)
+    )
+    selected = np.flatnonzero(stitch)
+    if not len(selected):
+        return False
+
+    # Both sides of every stitched edge take part, so a selection made on the target side works too
+    seam_edges = np.unique(arrays.edge[selected])
+    border = np.zeros(len(stitch), dtype=bool)
+    border[selected] = True
+    border[partner[selected]] = True
+
+    # Islands are processed in the order they hold selected edges; each one absorbs its neighbours
+    sources = list(dict.fromkeys(loop_island[selected].tolist()))
+    island_order, island_offsets = uas.group_loops(loop_island)
+    group_of = np.arange(labels.max() + 1)
+    members = {i: [i] for i in range(len(group_of))}
+    moved = np.zeros(len(stitch), dtype=bool)
+
+    corner_a, corner_b = uas.partner_corners(arrays, partner)
+    border_loops = np.flatnonzero(border)
+
+    for island in sources:
+        source_group = group_of[island]
+        in_source = group_of[loop_island[border_loops]] == source_group
+        loops = border_loops[in_source]
+        target_groups = group_of[partner_island[loops]]
+        keep = target_groups != source_group
+        loops = loops[keep]
+        target_groups = target_groups[keep]
+
+        for target_group in dict.fromkeys(target_groups.tolist()):
+            pair = loops[target_groups == target_group]
+            # Matched corners: the source loop and next loop against their partner-face twins
+            src = np.concatenate((pair, arrays.next[pair]))
+            dst = np.concatenate((corner_a[pair], corner_b[pair]))
+
+            target_loops = np.concatenate(
+                [island_order[island_offsets[i]:island_offsets[i + 1]] for i in members[target_group]])
+            rotation, offset = _rigid_transform(arrays.uv[dst], arrays.uv[src])
+            _snap_coincident(arrays, keys, target_loops, src, dst, rotation, offset)
+            moved[target_loops] = True
+
+            for i in members.pop(target_group):
+                group_of[i] = source_group
+                members[source_group].append(i)
+
+    changed = np.flatnonzero(moved)
+    uas.commit_uvs(obj, arrays, changed, uv_layer_name)
+
+    if clear_seams and obj.mode == 'EDIT':
+        bm = bmesh.from_edit_mesh(obj.data)
+        bm.edges.ensure_lookup_table()
+        for e in seam_edges.tolist():
+            bm.edges[e].seam = False
+        bmesh.update_edit_mesh(obj.data, loop_triangles=False, destructive=False)
+
+    return bool(len(changed))
+
+
+def _rigid_transform(points: np.ndarray, anchors: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+    """
+    Least-squares rotation and offset moving points onto anchors (2D Kabsch, no scaling).
+    Falls back to a pure translation when the points are coincident.
+    """
+    points_center = points.mean(axis=0)
+    anchors_center = anchors.mean(axis=0)
+    p = points - points_center
+    q = anchors - anchors_center
+
+    angle = np.arctan2(np.sum(p[:, 0] * q[:, 1] - p[:, 1] * q[:, 0]), np.sum(p * q))
+    cos, sin = np.cos(angle), np.sin(angle)
+    rotation = np.array(((cos, -sin), (sin, cos)))
+    offset = anchors_center - rotation @ points_center
+    return rotation, offset
+
+
+def _snap_coincident(arrays: uas.LoopArrays, keys: np.ndarray, target_loops: np.ndarray,
+                     src: np.ndarray, dst: np.ndarray, rotation: np.ndarray, offset: np.ndarray):
+    """
+    Moves the target loops with the rigid transform, then merges every target loop that shared
+    a vertex and a UV with a matched corner onto the source UV of that corner.
+    """
+    # Key the target loops and the matched corners by vertex and pre-transform UV
+    target_keys = np.column_stack((arrays.vert[target_loops], keys[target_loops]))
+    corner_keys = np.column_stack((arrays.vert[dst], keys[dst]))
+
+    arrays.uv[target_loops] = arrays.uv[target_loops] @ rotation.T + offset
+
+    _, inverse = np.unique(np.concatenate((corner_keys, target_keys)), axis=0, return_inverse=True)
+    inverse = inverse.ravel()
+    corner_id = inverse[:len(dst)]
+    target_id = inverse[len(dst):]
+
+    snap_to = np.full(inverse.max() + 1, -1, dtype=np.int64)
+    snap_to[corner_id] = src
+    hits = snap_to[target_id]
+    merged = hits >= 0
+    arrays.uv[target_loops[merged]] = arrays.uv[hits[merged]]
+    keys[target_loops] = uas.quantize(arrays.uv[target_loops])
@@ -2,226 +2,208 @@
 
 from typing import NamedTuple
 
-from bmesh.types import BMLoop, BMesh
-from mathutils import Vector
+import numpy as np
+from bpy.types import Object
 
-UVKey = tuple[float, float, int]  # (x, y, vert_index)
-AdjacencyGraph = dict[UVKey, set[UVKey]]
+from . import uv_array_service as uas
 
 
-class UVNodeData(NamedTuple):
-    """Immutable data container for UV node information."""
+class UVNodes(NamedTuple):
+    """Selected UV vertices merged by (uv, vert_index), with their straight-edge graph."""
 
-    uv: Vector
-    vert_index: int
-    loops: list[BMLoop]
+    loop_node: np.ndarray  # (L,) loop -> node, -1 for unselected loops
+    uv: np.ndarray  # (N, 2) node UVs
+    vert: np.ndarray  # (N,) node vertex indices
+    edges: np.ndarray  # (E, 2) unique undirected node pairs
 
 
-def align_uv_straight_edge(bm: BMesh, uv_layer_name: str, mode="GEOMETRY", keep_length=True) -> bool:
+class Chains(NamedTuple):
+    """Ordered chains, flattened: chain i is nodes[offsets[i]:offsets[i + 1]]."""
+
+    nodes: np.ndarray
+    offsets: np.ndarray
+
+
+def align_uv_straight_edge(obj: Object, uv_layer_name: str, mode="GEOMETRY", keep_length=True) -> bool:
     """
     Straighten selected UV edges.
     """
-    uv_layer = bm.loops.layers.uv.get(uv_layer_name)
-    if not uv_layer:
+    if uv_layer_name not in obj.data.uv_layers:
         return False
 
-    node_data, graph = _build_uv_graph(bm, uv_layer)
+    arrays = uas.read_loop_arrays(obj, uv_layer_name)
+    nodes = _build_uv_nodes(arrays)
 
-    if not graph:
+    if not len(nodes.edges):
         return False
 
-    chains = _find_chains(graph)
-    if not chains:
+    chains = _find_chains(nodes)
+    if len(chains.offsets) < 2:
         return False
 
-    updates: dict[UVKey, Vector] = {}
-    for chain in chains:
-        chain_updates = _calculate_straight_chain(chain, node_data, mode, keep_length)
-        updates.update(chain_updates)
+    co = np.empty(len(obj.data.vertices) * 3, dtype=np.float64)
+    obj.data.vertices.foreach_get('co', co)
+    co = co.reshape(-1, 3)
 
-    _apply_updates(uv_layer, node_data, updates)
+    chain_nodes, new_uv = _calculate_straight_chains(chains, nodes, co, mode, keep_length)
+
+    _apply_updates(obj, arrays, nodes, chain_nodes, new_uv, uv_layer_name)
 
     return True
 
 
-def _build_uv_graph(bm, uv_layer) -> tuple[dict[UVKey, UVNodeData], AdjacencyGraph]:
+def _build_uv_nodes(arrays: uas.LoopArrays) -> UVNodes:
     """
-    Extracts UV selection into a graph representation and node data map.
-    Returns: (node_data, adjacency_graph)
+    Merges the UV selected loops into nodes keyed by quantized UV and vertex index,
+    and collects the selected UV edges between them.
     """
-    node_data: dict[UVKey, UVNodeData] = {}
-    graph: AdjacencyGraph = {}
-
-    for face in bm.faces:
-        for loop in face.loops:
-            if loop.uv_select_vert:
-                uv = loop[uv_layer].uv
-                key = (round(uv.x, 6), round(uv.y, 6), loop.vert.index)
+    selected = np.flatnonzero(arrays.uv_select & ~arrays.face_hide[arrays.face])
+    loop_node = np.full(len(arrays.vert), -1, dtype=np.int64)
+    if not len(selected):
+        empty = np.empty((0, 2), dtype=np.int64)
+        return UVNodes(loop_node, np.empty((0, 2)), np.empty(0, dtype=np.int64), empty)
 
-                if key not in node_data:
-                    node_data[key] = UVNodeData(uv=uv.copy(), vert_index=loop.vert.index, loops=[])
-                    graph[key] = set()
+    # Key column order (u, v, vert) keeps node ids in the sort order of the old tuple keys
+    keys = np.column_stack((uas.quantize(arrays.uv[selected]), arrays.vert[selected]))
+    _, first, inverse = np.unique(keys, axis=0, return_index=True, return_inverse=True)
+    loop_node[selected] = inverse.ravel()
 
-                node_data[key].loops.append(loop)
+    edge_loops = selected[arrays.uv_select_edge[selected]]
+    edge_loops = edge_loops[loop_node[arrays.next[edge_loops]] >= 0]
+    pairs = np.sort(np.column_stack((loop_node[edge_loops], loop_node[arrays.next[edge_loops]])), axis=1)
+    pairs = pairs[pairs[:, 0] != pairs[:, 1]]
+    edges = np.unique(pairs, axis=0) if len(pairs) else pairs
 
-    # Scan loops again to build edges
-    # iterate over the collected node_data to avoid re-scanning all faces
-    for key, data in node_data.items():
-        for loop in data.loops:
-            if not loop.uv_select_edge:
-                continue
+    return UVNodes(loop_node, arrays.uv[selected[first]], arrays.vert[selected[first]], edges)
 
-            next_loop = loop.link_loop_next
-            if next_loop.uv_select_vert:
-                next_uv = next_loop[uv_layer].uv
-                next_key = (round(next_uv.x, 6), round(next_uv.y, 6), next_loop.vert.index)
 
-                if next_key in graph:
-                    graph[key].add(next_key)
-                    graph[next_key].add(key)
-
-    return node_data, graph
-
-
-def _find_chains(graph: AdjacencyGraph) -> list[list[UVKey]]:
+def _find_chains(nodes: UVNodes) -> Chains:
     """
-    Traverses the graph to find connected components and orders them into chains.
+    Orders every connected component of the graph into a chain, all components at once.
+    Each chain starts at its lowest endpoint (or its lowest node for closed loops)
+    and always steps to the lowest unvisited neighbour.
     """
-    visited = set()
-    chains = []
-
-    sorted_keys = sorted(graph.keys())
-
-    for start_key in sorted_keys:
-        if start_key in visited:
-            continue
-
-        # DFS to find component
-        component = []
-        stack = [start_key]
-        visited.add(start_key)
-
-        while stack:
-            curr = stack.pop()
-            component.append(curr)
-            for neighbor in graph[curr]:
-                if neighbor not in visited:
-                    visited.add(neighbor)
-                    stack.append(neighbor)
-
-        if len(component) > 1:
-            ordered = _order_component(component, graph)
-            if ordered:
-                chains.append(ordered)
-
-    return chains
-
-
-def _order_component(component: list[UVKey], graph: AdjacencyGraph) -> list[UVKey]:
+    n_nodes = len(nodes.uv)
+    a, b = nodes.edges[:, 0], nodes.edges[:, 1]
+    degree = np.bincount(nodes.edges.ravel(), minlength=n_nodes)
+
+    # Padded neighbour table, neighbours sorted ascending per row
+    both = np.concatenate((nodes.edges, nodes.edges[:, ::-1]))
+    both = both[np.lexsort((both[:, 1], both[:, 0]))]
+    row_start = np.cumsum(degree) - degree
+    column = np.arange(len(both)) - row_start[both[:, 0]]
+    neighbours = np.full((n_nodes, max(degree.max(), 1)), -1, dtype=np.int64)
+    neighbours[both[:, 0], column] = both[:, 1]
+
+    component = uas.connected_components(n_nodes, a, b)
+    n_components = component.max() + 1
+    sizes = np.bincount(component, minlength=n_components)
+
+    starts = np.full(n_components, n_nodes, dtype=np.int64)
+    endpoints = np.flatnonzero(degree == 1)
+    np.minimum.at(starts, component[endpoints], endpoints)
+    closed = starts == n_nodes
+    lowest = np.full(n_components, n_nodes, dtype=np.int64)
+    np.minimum.at(lowest, component, np.arange(n_nodes))
+    starts[closed] = lowest[closed]
+    starts = starts[sizes > 1]
+
+    # Walk all chains in lockstep
+    visited = np.zeros(n_nodes, dtype=bool)
+    visited[starts] = True
+    chain_ids = [np.arange(len(starts))]
+    walked = [starts]
+    current = starts
+    active = np.arange(len(starts))
+    while len(active):
+        candidates = neighbours[current]
+        free = (candidates >= 0) & ~visited[np.maximum(candidates, 0)]
+        moving = free.any(axis=1)
+        step = candidates[moving, np.argmax(free[moving], axis=1)]
+        active = active[moving]
+        current = step
+        visited[step] = True
+        chain_ids.append(active)
+        walked.append(step)
+
+    chain_ids = np.concatenate(chain_ids)
+    walked = np.concatenate(walked)
+    order = np.argsort(chain_ids, kind='stable')
+    lengths = np.bincount(chain_ids, minlength=len(starts))
+    return Chains(walked[order], np.concatenate(([0], np.cumsum(lengths))))
+
+
+def _calculate_straight_chains(
+    chains: Chains, nodes: UVNodes, co: np.ndarray, mode: str, keep_length: bool
+) -> tuple[np.ndarray, np.ndarray]:
     """
-    Orders a set of connected keys into a linear chain.
+    Calculates new UV coordinates for every chain node.
+    Returns the chain nodes that move and their new UVs.
     """
-    endpoints = [k for k in component if len(graph[k]) == 1]
-
-    start_node = endpoints[0] if endpoints else min(component)
-
-    ordered = [start_node]
-    visited_in_chain = {start_node}
-    curr = start_node
-
-    # Traverse
-    for _ in range(len(component) - 1):
-        neighbors = sorted(list(graph[curr]))
-        next_node = None
-        for n in neighbors:
-            if n not in visited_in_chain:
-                next_node = n
-                break
-
-        if next_node:
-            ordered.append(next_node)
-            visited_in_chain.add(next_node)
-            curr = next_node
-        else:
-            break
-
-    return ordered
-
-
-def _calculate_straight_chain(
-    chain: list[UVKey], node_data: dict[UVKey, UVNodeData], mode: str, keep_length: bool
-) -> dict[UVKey, Vector]:
-    """
-    Calculates new UV coordinates for a chain.
-    """
-    if len(chain) <= 1:
-        return {}
-
-    start_uv = node_data[chain[0]].uv
-    end_uv = node_data[chain[-1]].uv
-    direction = end_uv - start_uv
-
-    if abs(direction.x) > abs(direction.y):
-        direction.y = 0  # Align Horizontal
-    else:
-        direction.x = 0  # Align Vertical
-
-    if direction.length < 1e-7:
-        return {}
-
-    # to access 3D coordinate
-    def get_co(the_key):
-        return node_data[the_key].loops[0].vert.co
-
-    dists = [0.0]
-    total_dist = 0.0
-
+    chain_nodes = chains.nodes
+    first = chains.offsets[:-1]
+    last = chains.offsets[1:] - 1
+    count = last - first + 1
+    chain_of = np.repeat(np.arange(len(first)), count)
+    step = np.arange(len(chain_nodes)) - first[chain_of]
+
+    uv = nodes.uv[chain_nodes]
+    direction = uv[last] - uv[first]
+    horizontal = np.abs(direction[:, 0]) > np.abs(direction[:, 1])
+    direction[horizontal, 1] = 0  # Align Horizontal
+    direction[~horizontal, 0] = 0  # Align Vertical
+    valid = np.linalg.norm(direction, axis=1) >= 1e-7
+
+    # Cumulative distance along each chain, restarted at every chain start
+    def chain_cumsum(segments):
+        segments = np.concatenate(([0.0], segments))
+        segments[first] = 0.0
+        total = np.cumsum(segments)
+        return total - total[first][chain_of]
+
+    even_dists = step.astype(np.float64)
+    even_total = (count - 1).astype(np.float64)
     if mode == "GEOMETRY":
-        for i in range(len(chain) - 1):
-            d = (get_co(chain[i + 1]) - get_co(chain[i])).length
-            total_dist += d
-            dists.append(total_dist)
-
-        if total_dist <= 0:
-            mode = "EVEN"
-
-    if mode == "EVEN":
-        dists = [float(i) for i in range(len(chain))]
-        total_dist = float(len(chain) - 1)
+        positions = co[nodes.vert[chain_nodes]]
+        dists = chain_cumsum(np.linalg.norm(positions[1:] - positions[:-1], axis=1))
+        total_dist = dists[last]
+        use_even = total_dist <= 0
+        dists = np.where(use_even[chain_of], even_dists, dists)
+        total_dist = np.where(use_even, even_total, total_dist)
+    else:
+        dists = even_dists
+        total_dist = even_total
 
     # Normalize distances (t values 0.0 to 1.0)
-    if total_dist > 0:
-        t_values = [d / total_dist for d in dists]
-    else:
-        t_values = [0.0] * len(chain)
+    safe_total = np.where(total_dist > 0, total_dist, 1.0)
+    t_values = np.where((total_dist > 0)[chain_of], dists / safe_total[chain_of], 0.0)
 
     final_direction = direction
     if keep_length:
-        orig_uv_len = sum(
-            (node_data[chain[i + 1]].uv - node_data[chain[i]].uv).length
-            for i in range(len(chain) - 1)
-        )
-        if orig_uv_len > 0:
-            final_direction = direction.normalized() * orig_uv_len
-
-    base_positions = [start_uv + final_direction * t for t in t_values]
+        orig_uv_len = chain_cumsum(np.linalg.norm(uv[1:] - uv[:-1], axis=1))[last]
+        scale = np.where(orig_uv_len > 0, orig_uv_len / np.where(valid, np.linalg.norm(direction, axis=1), 1.0), 1.0)
+        final_direction = direction * scale[:, None]
 
-    orig_center = sum((node_data[k].uv for k in chain), Vector((0, 0))) / len(chain)
-    new_center = sum(base_positions, Vector((0, 0))) / len(base_positions)
-    offset = orig_center - new_center
+    base_positions = uv[first][chain_of] + final_direction[chain_of] * t_values[:, None]
 
-    new_positions = {}
-    for i, key in enumerate(chain):
-        new_positions[key] = base_positions[i] + offset
+    orig_center = np.add.reduceat(uv, first) / count[:, None]
+    new_center = np.add.reduceat(base_positions, first) / count[:, None]
+    new_uv = base_positions + (orig_center - new_center)[chain_of]
 
-    return new_positions
+    moving = valid[chain_of]
+    return chain_nodes[moving], new_uv[moving]
 
 
-def _apply_updates(uv_layer, node_data: dict[UVKey, UVNodeData], updates: dict[UVKey, Vector]):
+def _apply_updates(obj: Object, arrays: uas.LoopArrays, nodes: UVNodes, chain_nodes: np.ndarray,
+                   new_uv: np.ndarray, uv_layer_name: str):
     """
-    Applies the calculated UV updates to the BMesh loops.
+    Moves every loop of the updated nodes and writes the touched loops back in one pass.
     """
-    for key, new_uv in updates.items():
-        if key in node_data:
-            for loop in node_data[key].loops:
-                loop[uv_layer].uv = new_uv
+    node_uv = np.full((len(nodes.uv), 2), np.nan)
+    node_uv[chain_nodes] = new_uv
+
+    loops = np.flatnonzero(nodes.loop_node >= 0)
+    loops = loops[~np.isnan(node_uv[nodes.loop_node[loops], 0])]
+    arrays.uv[loops] = node_uv[nodes.loop_node[loops]]
+
+    uas.commit_uvs(obj, arrays, loops, uv_layer_name)
@@ -0,0 +1,287 @@
+# SPDX-License-Identifier: GPL-3.0-or-later
+
+from typing import NamedTuple
+
+import bmesh
+import numpy as np
+from bpy.types import Object
+
+from .. import settings
+
+# Same tolerance the straighten service used for its rounded UV keys
+UV_EPSILON = 1e-6
+
+
+class LoopArrays(NamedTuple):
+    """
+    Flat per-loop / per-face views of a mesh, indexed like Mesh.loops and Mesh.polygons.
+    Face and loop indices match the BMesh iteration order of the edit mesh.
+    """
+
+    uv: np.ndarray  # (L, 2) float64
+    vert: np.ndarray  # (L,) loop -> vertex
+    edge: np.ndarray  # (L,) loop -> edge
+    face: np.ndarray  # (L,) loop -> face
+    next: np.ndarray  # (L,) loop -> next loop of the same face
+    face_start: np.ndarray  # (F,) first loop of each face
+    face_size: np.ndarray  # (F,) loop count of each face
+    face_select: np.ndarray  # (F,) bool
+    face_hide: np.ndarray  # (F,) bool
+    uv_select: np.ndarray  # (L,) bool, UV vertex selection
+    uv_select_edge: np.ndarray  # (L,) bool, UV edge selection
+
+
+def read_loop_arrays(obj: Object, uv_layer_name: str | None = None) -> LoopArrays:
+    """
+    Reads loop topology, UVs and selection of a mesh object in bulk.
+    In Edit Mode the edit-mesh is flushed to the mesh data first, without leaving the mode.
+    """
+    if obj.mode == 'EDIT':
+        obj.update_from_editmode()
+    me = obj.data
+    uv_layer = me.uv_layers[uv_layer_name] if uv_layer_name else me.uv_layers.active
+
+    n_loops = len(me.loops)
+    n_faces = len(me.polygons)
+
+    uv = np.empty(n_loops * 2, dtype=np.float32)
+    uv_layer.uv.foreach_get('vector', uv)
+
+    vert = np.empty(n_loops, dtype=np.int64)
+    me.loops.foreach_get('vertex_index', vert)
+    edge = np.empty(n_loops, dtype=np.int64)
+    me.loops.foreach_get('edge_index', edge)
+
+    face_start = np.empty(n_faces, dtype=np.int64)
+    me.polygons.foreach_get('loop_start', face_start)
+    face_size = np.empty(n_faces, dtype=np.int64)
+    me.polygons.foreach_get('loop_total', face_size)
+    face_select = np.empty(n_faces, dtype=bool)
+    me.polygons.foreach_get('select', face_select)
+    face_hide = np.empty(n_faces, dtype=bool)
+    me.polygons.foreach_get('hide', face_hide)
+
+    face = np.repeat(np.arange(n_faces, dtype=np.int64), face_size)
+    corner = np.arange(n_loops, dtype=np.int64) - face_start[face]
+    next_loop = face_start[face] + (corner + 1) % face_size[face]
+
+    return LoopArrays(
+        uv=uv.reshape(-1, 2).astype(np.float64),
+        vert=vert,
+        edge=edge,
+        face=face,
+        next=next_loop,
+        face_start=face_start,
+        face_size=face_size,
+        face_select=face_select,
+        face_hide=face_hide,
+        uv_select=read_uv_flag(me, uv_layer.name, 'vert'),
+        uv_select_edge=read_uv_flag(me, uv_layer.name, 'edge'),
+    )
+
+
+def uv_flag_attribute(uv_layer_name: str, flag: str) -> tuple[str | None, str]:
+    """
+    Name and domain of the attribute behind a UV flag: 'vert', 'edge' or 'face' selection, or 'pin'.
+    Blender 5.0 shares the UV selection between UV maps, older versions store it per UV map
+    and have no face flag (None).
+    """
+    if flag == 'pin':
+        return f'.pn.{uv_layer_name}', 'CORNER'
+    if settings.bversion >= 5.0:
+        return f'.uv_select_{flag}', 'FACE' if flag == 'face' else 'CORNER'
+    if flag == 'face':
+        return None, 'FACE'
+    return f'.{flag[0]}s.{uv_layer_name}', 'CORNER'
+
+
+def read_uv_flag(me, uv_layer_name: str, flag: str) -> np.ndarray:
+    """Reads a UV flag in bulk; a missing attribute reads as all False."""
+    name, domain = uv_flag_attribute(uv_layer_name, flag)
+    flags = np.zeros(len(me.polygons) if domain == 'FACE' else len(me.loops), dtype=bool)
+    attribute = me.attributes.get(name) if name else None
+    if attribute is not None and attribute.domain == domain:
+        attribute.data.foreach_get('value', flags)
+    return flags
+
+
+def write_uv_flag(me, uv_layer_name: str, flag: str, flags: np.ndarray):
+    """
+    Writes a UV flag in bulk (Object Mode only).
+    The attribute is only created when at least one element gets the flag.
+    """
+    name, domain = uv_flag_attribute(uv_layer_name, flag)
+    if name is None:
+        return
+    attribute = me.attributes.get(name)
+    if attribute is None:
+        if not flags.any():
+            return
+        attribute = me.attributes.new(name, 'BOOLEAN', domain)
+    attribute.data.foreach_set('value', flags)
+
+
+def selected_loop_mask(arrays: LoopArrays, sync: bool) -> np.ndarray:
+    """
+    Loops that count as selected for UV tools: any visible loop of a selected face in sync mode,
+    UV selected loops of selected faces otherwise.
+    """
+    face_mask = arrays.face_select & ~arrays.face_hide
+    if sync:
+        return face_mask[arrays.face]
+    return face_mask[arrays.face] & arrays.uv_select
+
+
+def quantize(uv: np.ndarray, epsilon: float = UV_EPSILON) -> np.ndarray:
+    """Integer keys of UV coordinates, equal for coordinates closer than epsilon on the grid."""
+    return np.round(uv / epsilon).astype(np.int64)
+
+
+def radial_partner(arrays: LoopArrays) -> np.ndarray:
+    """
+    The loop on the other side of each loop's edge, or -1 for boundary and non-manifold edges.
+    """
+    n_loops = len(arrays.edge)
+    partner = np.full(n_loops, -1, dtype=np.int64)
+    if not n_loops:
+        return partner
+
+    order = np.argsort(arrays.edge, kind='stable')
+    counts = np.bincount(arrays.edge)
+    starts = np.cumsum(counts) - counts
+    manifold = starts[counts == 2]
+
+    first = order[manifold]
+    second = order[manifold + 1]
+    partner[first] = second
+    partner[second] = first
+    return partner
+
+
+def partner_corners(arrays: LoopArrays, partner: np.ndarray,
+                    loops: np.ndarray | None = None) -> tuple[np.ndarray, np.ndarray]:
+    """
+    For every loop with a partner, the partner-face loops sitting on the same two vertices
+    as the loop and its next loop. Handles both consistent and flipped face winding.
+    With loops, only those loops are looked up and the corners follow their order.
+    """
+    if loops is None:
+        loops = np.arange(len(partner))
+    other = partner[loops]
+    has_partner = other >= 0
+    safe = np.where(has_partner, other, 0)
+    same_winding = arrays.vert[safe] == arrays.vert[loops]
+    corner_a = np.where(same_winding, safe, arrays.next[safe])
+    corner_b = np.where(same_winding, arrays.next[safe], safe)
+    corner_a[~has_partner] = -1
+    corner_b[~has_partner] = -1
+    return corner_a, corner_b
+
+
+def uv_connected(arrays: LoopArrays, partner: np.ndarray, keys: np.ndarray | None = None,
+                 loops: np.ndarray | None = None) -> np.ndarray:
+    """
+    Loops whose edge is shared with its partner face in UV space too (not a UV split).
+    With loops, only those loops are tested and all the others are left False.
+    """
+    if keys is None:
+        keys = quantize(arrays.uv)
+    connected = np.zeros(len(partner), dtype=bool)
+    loops = np.flatnonzero(partner >= 0) if loops is None else loops[partner[loops] >= 0]
+    corner_a, corner_b = partner_corners(arrays, partner, loops)
+    connected[loops] = (
+        (keys[loops] == keys[corner_a]).all(axis=1) &
+        (keys[arrays.next[loops]] == keys[corner_b]).all(axis=1)
+    )
+    return connected
+
+
+def connected_components(count: int, a: np.ndarray, b: np.ndarray) -> np.ndarray:
+    """
+    Labels the components of an undirected graph given as edge arrays, by hooking the larger
+    root onto the smaller one and pointer jumping until no edge joins two roots.
+    Labels are compacted to 0..n-1.
+    """
+    labels = np.arange(count, dtype=np.int64)
+    if len(a):
+        while True:
+            root_a = labels[a]
+            root_b = labels[b]
+            joins = root_a != root_b
+            if not joins.any():
+                break
+            low = np.minimum(root_a[joins], root_b[joins])
+            high = np.maximum(root_a[joins], root_b[joins])
+            np.minimum.at(labels, high, low)
+            while True:
+                jumped = labels[labels]
+                if np.array_equal(jumped, labels):
+                    break
+                labels = jumped
+    return np.unique(labels, return_inverse=True)[1].astype(np.int64)
+
+
+def island_labels(arrays: LoopArrays, face_mask: np.ndarray, partner: np.ndarray | None = None,
+                  connected: np.ndarray | None = None) -> np.ndarray:
+    """
+    UV island index of every face in face_mask, -1 for the other faces.
+    Islands are the faces connected through UV-continuous edges.
+    """
+    if partner is None:
+        partner = radial_partner(arrays)
+    if connected is None:
+        connected = uv_connected(arrays, partner)
+
+    links = np.flatnonzero(connected & face_mask[arrays.face])
+    links = links[face_mask[arrays.face[partner[links]]]]
+
+    faces = np.flatnonzero(face_mask)
+    local = np.full(len(face_mask), -1, dtype=np.int64)
+    local[faces] = np.arange(len(faces))
+
+    labels = np.full(len(face_mask), -1, dtype=np.int64)
+    labels[faces] = connected_components(
+        len(faces), local[arrays.face[links]], local[arrays.face[partner[links]]])
+    return labels
+
+
+def group_loops(labels: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+    """
+    Loop indices sorted by label (labels < 0 dropped) and the start offset of each label
+    in that order, with a trailing end offset, so that group i is order[offsets[i]:offsets[i + 1]].
+    """
+    valid = np.flatnonzero(labels >= 0)
+    order = valid[np.argsort(labels[valid], kind='stable')]
+    counts = np.bincount(labels[valid], minlength=labels.max() + 1 if len(valid) else 0)
+    offsets = np.concatenate(([0], np.cumsum(counts)))
+    return order, offsets
+
+
+def commit_uvs(obj: Object, arrays: LoopArrays, loops: np.ndarray, uv_layer_name: str | None = None):
+    """
+    Writes arrays.uv of the given loops back to the mesh: through the edit BMesh in Edit Mode,
+    so only the touched loops are visited, and in one foreach_set call otherwise.
+    """
+    me = obj.data
+    if uv_layer_name is None:
+        uv_layer_name = me.uv_layers.active.name
+
+    if obj.mode != 'EDIT':
+        me.uv_layers[uv_layer_name].uv.foreach_set('vector', arrays.uv.astype(np.float32).ravel())
+        me.update()
+        return
+
+    if not len(loops):
+        return
+
+    bm = bmesh.from_edit_mesh(me)
+    uv_layer = bm.loops.layers.uv[uv_layer_name]
+    faces = bm.faces
+    faces.ensure_lookup_table()
+
+    face_of = arrays.face[loops]
+    corner = loops - arrays.face_start[face_of]
+    for f, c, uv in zip(face_of.tolist(), corner.tolist(), arrays.uv[loops].tolist()):
+        faces[f].loops[c][uv_layer].uv = uv
+
+    bmesh.update_edit_mesh(me, loop_triangles=False, destructive=False)
@@ -0,0 +1,93 @@
+# SPDX-License-Identifier: GPL-3.0-or-later
+
+from typing import NamedTuple
+
+import bmesh
+import numpy as np
+from bmesh.types import BMesh
+from bpy.types import Object
+
+from .. import utilities_uv
+from . import uv_array_service as uas
+
+
+class UVBoundary(NamedTuple):
+    """Loops and edges that lie on a UV island border."""
+
+    loops: np.ndarray  # loop indices
+    edges: np.ndarray  # unique edge indices
+
+
+def find_uv_boundaries(arrays: uas.LoopArrays, loop_mask: np.ndarray | None = None,
+                       partner: np.ndarray | None = None, connected: np.ndarray | None = None) -> UVBoundary:
+    """
+    UV island borders: mesh boundary and non-manifold edges, and edges whose two radial loops
+    do not share quantized UVs. Same result as seams_from_islands, without touching the mesh.
+    """
+    if partner is None:
+        partner = uas.radial_partner(arrays)
+    if connected is None:
+        connected = uas.uv_connected(arrays, partner)
+
+    border = ~connected
+    if loop_mask is not None:
+        border &= loop_mask
+
+    loops = np.flatnonzero(border)
+    return UVBoundary(loops=loops, edges=np.unique(arrays.edge[loops]))
+
+
+def read_edge_flag(obj: Object, name: str) -> np.ndarray:
+    """Per-edge boolean mesh property (select, use_seam, use_edge_sharp...) read in bulk."""
+    if obj.mode == 'EDIT':
+        obj.update_from_editmode()
+    me = obj.data
+    flags = np.empty(len(me.edges), dtype=bool)
+    me.edges.foreach_get(name, flags)
+    return flags
+
+
+def write_seams(obj: Object, edges: np.ndarray, value: bool = True):
+    """Marks or clears seams on the given edges."""
+    _write_edge_flag(obj, edges, 'use_seam', value, 'seam', value)
+
+
+def write_sharp(obj: Object, edges: np.ndarray, value: bool = True):
+    """Marks or clears sharp edges on the given edges."""
+    _write_edge_flag(obj, edges, 'use_edge_sharp', value, 'smooth', not value)
+
+
+def _write_edge_flag(obj: Object, edges: np.ndarray, mesh_name: str, mesh_value: bool,
+                     bmesh_name: str, bmesh_value: bool):
+    me = obj.data
+    if obj.mode == 'EDIT':
+        bm = bmesh.from_edit_mesh(me)
+        bm.edges.ensure_lookup_table()
+        for e in edges.tolist():
+            setattr(bm.edges[e], bmesh_name, bmesh_value)
+        bmesh.update_edit_mesh(me, loop_triangles=False, destructive=False)
+    else:
+        flags = np.empty(len(me.edges), dtype=bool)
+        me.edges.foreach_get(mesh_name, flags)
+        flags[edges] = mesh_value
+        me.edges.foreach_set(mesh_name, flags)
+        me.update()
+
+
+def select_loops(bm: BMesh, uv_layer, arrays: uas.LoopArrays, loops: np.ndarray):
+    """Selects the given loops and their UV edges, on top of the current UV selection."""
+    faces = bm.faces
+    faces.ensure_lookup_table()
+    face_of = arrays.face[loops]
+    corner = loops - arrays.face_start[face_of]
+    for f, c in zip(face_of.tolist(), corner.tolist()):
+        loop = faces[f].loops[c]
+        utilities_uv.set_loop_selection(loop, uv_layer, True, bm)
+        utilities_uv.set_loop_edge_selection(loop, uv_layer, True)
+
+
+def select_edges(bm: BMesh, edges: np.ndarray):
+    """Selects the given mesh edges, on top of the current mesh selection."""
+    bm.edges.ensure_lookup_table()
+    for e in edges.tolist():
+        bm.edges[e].select_set(True)
@@ -0,0 +1,207 @@
+# SPDX-License-Identifier: GPL-3.0-or-later
+
+from typing import Iterable, NamedTuple
+
+import numpy as np
+from bpy.types import Object
+
+from . import island_tracker, orient_service
+from . import uv_array_service as uas
+
+
+class UVSelection(NamedTuple):
+    """The loops of one object a transform acts on."""
+
+    obj: Object
+    uv_layer_name: str
+    arrays: uas.LoopArrays
+    loops: np.ndarray  # loop indices
+
+
+def read_selections(objs: Iterable[Object], sync: bool, mode: str = 'SELECTED') -> list[UVSelection]:
+    """
+    Loops to transform for every object, without going through the UV editor:
+    'SELECTED' the UV selection, 'FACES' only the faces that are entirely UV selected,
+    'VISIBLE' every loop shown in the UV editor.
+    """
+    selections = []
+    for obj in objs:
+        uv_layer_name = obj.data.uv_layers.active.name
+        arrays = uas.read_loop_arrays(obj, uv_layer_name)
+        visible = ~arrays.face_hide if sync else arrays.face_select & ~arrays.face_hide
+        if mode == 'VISIBLE':
+            mask = visible[arrays.face]
+        elif mode == 'FACES' and not sync and len(arrays.face_start):
+            mask = (visible & np.logical_and.reduceat(arrays.uv_select, arrays.face_start))[arrays.face]
+        else:
+            mask = uas.selected_loop_mask(arrays, sync)
+        selections.append(UVSelection(obj, uv_layer_name, arrays, np.flatnonzero(mask)))
+    return selections
+
+
+def bounds(selections: list[UVSelection]) -> tuple[np.ndarray, np.ndarray] | None:
+    """(min, max) corners of all the selected loops, None without selected loops."""
+    points = [s.arrays.uv[s.loops] for s in selections if len(s.loops)]
+    if not points:
+        return None
+    points = np.concatenate(points)
+    return points.min(axis=0), points.max(axis=0)
+
+
+def pivots(selections: list[UVSelection], pivot: str = 'CENTER', cursor=(0.0, 0.0)) -> list[np.ndarray]:
+    """
+    Pivot of every selected loop for a UV editor pivot point mode:
+    'CENTER' bounds center, 'MEDIAN' mean of the loops, 'CURSOR' the 2D cursor,
+    'INDIVIDUAL_ORIGINS' mean of the selected loops of each island.
+    """
+    if pivot == 'CURSOR':
+        point = np.array(cursor[:2], dtype=np.float64)
+    elif pivot == 'MEDIAN':
+        points = [s.arrays.uv[s.loops] for s in selections if len(s.loops)]
+        point = np.concatenate(points).mean(axis=0) if points else np.zeros(2)
+    elif pivot == 'INDIVIDUAL_ORIGINS':
+        return [_island_medians(s) for s in selections]
+    else:
+        box = bounds(selections)
+        point = (box[0] + box[1]) / 2 if box else np.zeros(2)
+    return [np.broadcast_to(point, (len(s.loops), 2)) for s in selections]
+
+
+def _island_medians(selection: UVSelection) -> np.ndarray:
+    arrays, loops = selection.arrays, selection.loops
+    if not len(loops):
+        return np.empty((0, 2))
+    faces = np.zeros(len(arrays.face_start), dtype=bool)
+    faces[arrays.face[loops]] = True
+    island = island_tracker.island_labels(selection.obj, selection.uv_layer_name, arrays, faces)[arrays.face[loops]]
+    count = np.bincount(island)
+    center = np.column_stack([np.bincount(island, weights=arrays.uv[loops, i]) for i in (0, 1)]) / count[:, None]
+    return center[island]
+
+
+def transform(selections: list[UVSelection], matrix, offset=(0.0, 0.0), pivot=None):
+    """
+    Applies uv' = matrix @ (uv - pivot) + pivot + offset to every selected loop and writes them back.
+    pivot is one point for all loops, a list with per-loop pivots of every selection (see pivots), or None.
+    """
+    matrix = np.asarray(matrix, dtype=np.float64)
+    offset = np.asarray(offset, dtype=np.float64)
+    for i, selection in enumerate(selections):
+        if not len(selection.loops):
+            continue
+        uv = selection.arrays.uv[selection.loops]
+        if pivot is None:
+            center = np.zeros(2)
+        elif isinstance(pivot, list):
+            center = pivot[i]
+        else:
+            center = np.asarray(pivot, dtype=np.float64)
+        selection.arrays.uv[selection.loops] = (uv - center) @ matrix.T + center + offset
+        uas.commit_uvs(selection.obj, selection.arrays, selection.loops, selection.uv_layer_name)
+
+
+def rotation_matrix(angle: float) -> np.ndarray:
+    """Counter-clockwise rotation by angle, in radians."""
+    c, s = np.cos(angle), np.sin(angle)
+    return np.array(((c, -s), (s, c)))
+
+
+def crop(objs: Iterable[Object], sync: bool, padding: float, distort=False, tile=(0, 0),
+         selections: list[UVSelection] | None = None) -> bool:
+    """
+    Frames the entirely selected UV faces of all objects to the 0-1 area of the given UDIM tile
+    (column, row), keeping padding / 2 on every side. Returns False for a zero-area selection.
+    """
+    if selections is None:
+        selections = read_selections(objs, sync, 'FACES')
+    box = bounds(selections)
+    if box is None:
+        return False
+    size = box[1] - box[0]
+    if (size <= 0).any():
+        return False
+
+    scale = (1.0 - padding) / size
+    if not distort:
+        scale[:] = scale.min()
+    transform(selections, np.diag(scale), padding / 2 - scale * box[0] + np.asarray(tile, dtype=np.float64))
+    return True
+
+
+def fill(objs: Iterable[Object], sync: bool, padding: float, align=False, tile=(0, 0)) -> bool:
+    """
+    Stretches the entirely selected UV faces of all objects over the 0-1 area of the given UDIM tile,
+    first rotated to their minimal bounds when align is set. Returns False for a zero-area selection.
+    """
+    selections = read_selections(objs, sync, 'FACES')
+    points = [s.arrays.uv[s.loops] for s in selections if len(s.loops)]
+    if not points:
+        return False
+
+    if align:
+        points = np.concatenate(points)
+        angle = orient_service.min_box_angles(points, np.zeros(len(points), dtype=np.int64), 1)[0]
+        if abs(angle) > 0.00001:
+            transform(selections, rotation_matrix(angle), pivot=pivots(selections, 'CENTER'))
+
+    return crop(objs, sync, padding, distort=True, tile=tile, selections=selections)
+
+
+def resize_area(objs: Iterable[Object], sync: bool, corner: str, size_a, size_b):
+    """
+    Rescales every visible UV by size_a / size_b around a corner of the 0-1 area ('TL', 'TR', 'BL' or 'BR'),
+    so the UVs keep their texels when the texture is extended from size_a to size_b.
+    """
+    pivot = {'TL': (0, 1), 'TR': (1, 1), 'BL': (0, 0), 'BR': (1, 0)}[corner]
+    scale = np.array((size_a[0] / size_b[0], size_a[1] / size_b[1]))
+    transform(read_selections(objs, sync, 'VISIBLE'), np.diag(scale), pivot=pivot)
+
+
+def mirror(objs: Iterable[Object], sync: bool, axis: int, pivot: str = 'CENTER', cursor=(0.0, 0.0)):
+    """Mirrors the selected UVs along U (axis 0) or V (axis 1) around the pivot point."""
+    selections = read_selections(objs, sync)
+    matrix = np.identity(2)
+    matrix[axis, axis] = -1
+    transform(selections, matrix, pivot=pivots(selections, pivot, cursor))
+
+
+def rotate(objs: Iterable[Object], sync: bool, angle: float, pivot: str = 'CENTER', cursor=(0.0, 0.0)):
+    """Rotates the selected UVs counter-clockwise by angle around the pivot point."""
+    selections = read_selections(objs, sync)
+    transform(selections, rotation_matrix(angle), pivot=pivots(selections, pivot, cursor))
+
+
+def centralize(objs: Iterable[Object], tile=(0, 0)) -> bool:
+    """
+    Moves every selected island by whole UDIM tiles, as close as possible to the 0-1 area
+    of the given tile. Returns False when nothing moved.
+    """
+    changed = False
+    for obj in objs:
+        uv_layer_name = obj.data.uv_layers.active.name
+        arrays = uas.read_loop_arrays(obj, uv_layer_name)
+        labels = island_tracker.island_labels(obj, uv_layer_name, arrays, arrays.face_select & ~arrays.face_hide)
+        order, offsets = uas.group_loops(labels[arrays.face])
+        if not len(order):
+            continue
+
+        uv = arrays.uv[order]
+        center = (np.minimum.reduceat(uv, offsets[:-1], axis=0) + np.maximum.reduceat(uv, offsets[:-1], axis=0)) / 2
+        delta = np.round(0.5 - center) + np.asarray(tile, dtype=np.float64)
+        moving = (delta != 0).any(axis=1)
+        if not moving.any():
+            continue
+
+        group = np.repeat(np.arange(len(delta)), np.diff(offsets))
+        loops = order[moving[group]]
+        arrays.uv[loops] += delta[group[moving[group]]]
+        uas.commit_uvs(obj, arrays, loops, uv_layer_name)
+        changed = True
+    return changed
+
+
+def editor_pivot(space) -> tuple[str, tuple[float, float]]:
+    """Pivot point mode and 2D cursor of a UV editor space, the bounds center outside of one."""
+    if space is None or space.type != 'IMAGE_EDITOR':
+        return 'CENTER', (0.0, 0.0)
+    return space.pivot_point, tuple(space.cursor_location)
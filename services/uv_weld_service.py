@@ -0,0 +1,90 @@
+# SPDX-License-Identifier: GPL-3.0-or-later
+
+import numpy as np
+from bpy.types import Object
+
+from . import island_tracker
+from . import uv_array_service as uas
+
+# Cell offsets covering every neighbouring cell pair once
+NEIGHBOUR_CELLS = np.array(((0, 0), (1, -1), (1, 0), (1, 1), (0, 1)), dtype=np.int64)
+
+
+def weld_uvs(obj: Object, uv_layer_name: str, distance: float = 1e-4, sync: bool = False,
+             selected_only: bool = True, within_island: bool = False) -> int:
+    """
+    Merges the UVs of a mesh vertex that lie within distance of each other, by snapping every
+    group of close loops to its centroid. Only the selected UVs take part with selected_only,
+    and loops of different islands are kept apart with within_island.
+    Returns the number of loops that moved.
+    """
+    arrays = uas.read_loop_arrays(obj, uv_layer_name)
+    if selected_only:
+        loops = np.flatnonzero(uas.selected_loop_mask(arrays, sync))
+    else:
+        visible = ~arrays.face_hide if sync else arrays.face_select & ~arrays.face_hide
+        loops = np.flatnonzero(visible[arrays.face])
+    if len(loops) < 2:
+        return 0
+
+    if within_island:
+        face_mask = np.zeros(len(arrays.face_start), dtype=bool)
+        face_mask[arrays.face[loops]] = True
+        island = island_tracker.island_labels(obj, uv_layer_name, arrays, face_mask)[arrays.face[loops]]
+    else:
+        island = np.zeros(len(loops), dtype=np.int64)
+
+    uv = arrays.uv[loops]
+    a, b = _close_pairs(arrays.vert[loops], island, uv, distance)
+    if not len(a):
+        return 0
+
+    group = uas.connected_components(len(loops), a, b)
+    count = np.bincount(group)
+    welded = count[group] > 1
+    centroid = np.column_stack([np.bincount(group, weights=uv[:, i]) for i in (0, 1)]) / count[:, None]
+
+    moved = welded & (centroid[group] != uv).any(axis=1)
+    arrays.uv[loops[moved]] = centroid[group[moved]]
+    uas.commit_uvs(obj, arrays, loops[moved], uv_layer_name)
+    return int(np.count_nonzero(moved))
+
+
+def _close_pairs(vert: np.ndarray, island: np.ndarray, uv: np.ndarray,
+                 distance: float) -> tuple[np.ndarray, np.ndarray]:
+    """
+    Pairs of points of the same vertex and island at most distance apart. Points are hashed
+    into cells of the distance size, so only points of the same or a neighbouring cell are compared.
+    """
+    cell = np.floor(uv / max(distance, uas.UV_EPSILON)).astype(np.int64)
+    keys = np.column_stack((vert, island, cell))
+    cell_keys, cell_of, cell_size = np.unique(keys, axis=0, return_inverse=True, return_counts=True)
+    cell_of = cell_of.ravel()
+    order = np.argsort(cell_of, kind='stable')
+    cell_start = np.cumsum(cell_size) - cell_size
+
+    pairs_a = []
+    pairs_b = []
+    for offset in NEIGHBOUR_CELLS:
+        shifted = cell_keys.copy()
+        shifted[:, 2:] += offset
+        # Find which shifted cells exist, through one unique pass over both key sets
+        _, ids = np.unique(np.concatenate((cell_keys, shifted)), axis=0, return_inverse=True)
+        ids = ids.ravel()
+        lookup = np.full(ids.max() + 1, -1, dtype=np.int64)
+        lookup[ids[:len(cell_keys)]] = np.arange(len(cell_keys))
+        source = np.flatnonzero(lookup[ids[len(cell_keys):]] >= 0)
+        target = lookup[ids[len(cell_keys):]][source]
+
+        # Every point of the source cell against every point of the target cell
+        n_pairs = cell_size[source] * cell_size[target]
+        pair_of = np.repeat(np.arange(len(source)), n_pairs)
+        local = np.arange(n_pairs.sum()) - np.repeat(np.cumsum(n_pairs) - n_pairs, n_pairs)
+        a = order[cell_start[source][pair_of] + local // cell_size[target][pair_of]]
+        b = order[cell_start[target][pair_of] + local % cell_size[target][pair_of]]
+        keep = a < b if not offset.any() else np.ones(len(a), dtype=bool)
+        keep &= ((uv[a] - uv[b]) ** 2).sum(axis=1) <= distance ** 2
+        pairs_a.append(a[keep])
+        pairs_b.append(b[keep])
+
+    return np.concatenate(pairs_a), np.concatenate(pairs_b)
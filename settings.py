@@ -18,6 +18,7 @@ selection_face_indexies = set()
 seam_edges = set()
 
 bake_error = ''
+bake_save_status = ''
 bake_render_engine = ''
 bake_cycles_device = ''
 bake_cycles_samples = 1
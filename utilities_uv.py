@@ -564,6 +564,48 @@ def get_selected_islands(bm, uv_layers, selected=True, extend_selection_to_islan
     return islands
 
 
+def get_islands_from_seeds(bm, uv_layers, seed_faces):
+    """UV islands of the seed faces, flooded from the seeds only so the cost scales with the touched islands"""
+    sync = bpy.context.scene.tool_settings.use_uv_select_sync
+
+    def is_visible(face):
+        if sync:
+            return not face.hide
+        return not face.hide and face.select
+
+    islands = []
+    visited = set()
+    for seed in seed_faces:
+        if seed in visited or not is_visible(seed):
+            continue
+        visited.add(seed)
+
+        island = set()
+        parts_of_island = [seed]
+        while parts_of_island:
+            temp = []
+            for f in parts_of_island:
+                for l in f.loops:
+                    link_face = l.link_loop_radial_next.face
+                    if link_face in visited or not is_visible(link_face):
+                        continue
+
+                    for ll in link_face.loops:
+                        if ll[uv_layers].uv != l[uv_layers].uv:
+                            continue
+                        if (l.link_loop_next[uv_layers].uv == ll.link_loop_prev[uv_layers].uv) or \
+                                (ll.link_loop_next[uv_layers].uv == l.link_loop_prev[uv_layers].uv):
+                            temp.append(link_face)
+                            visited.add(link_face)
+                            break
+
+            island.update(parts_of_island)
+            parts_of_island = temp
+
+        islands.append(island)
+    return islands
+
+
 def get_uv_context_override():
     for area in bpy.context.screen.areas:
         if area.type == 'IMAGE_EDITOR':